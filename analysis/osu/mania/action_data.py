@@ -4,6 +4,7 @@ import pandas as pd
 
 from analysis.osu.mania.map_data import ManiaMapData
 from osu.local.hitobject.mania.mania import Mania
+from osu.local.replay.replay_frames import ReplayFrames
 from misc.numpy_utils import NumpyUtils
 
 
@@ -28,34 +29,29 @@ class ManiaActionData():
         hitobject_data = ManiaMapData.get_hitobject_data(hitobjects)
         num_columns = len(hitobject_data)
 
-        # Record data via dictionary to identify unique timings
-        action_data = {}
+        note_cols  = np.asarray([ col for col in range(num_columns) for _ in hitobject_data[col] ], dtype=np.int64)
+        note_times = np.asarray([ hitobject for col in range(num_columns) for hitobject in hitobject_data[col] ]).reshape(-1, 2)
 
-        for col in range(num_columns):
-            for hitobject in hitobject_data[col]:
-                # Extract note timings
-                note_start = hitobject[0]
-                note_end   = hitobject[1]
+        if len(note_times) == 0:
+            action_data = pd.DataFrame()
+            action_data.index.name = 'time'
+            return action_data
 
-                # Adjust note ending based on whether it is single or hold note (determined via min_press_duration)
-                note_end = note_end if (note_end - note_start >= min_press_duration) else (note_start + min_press_duration)
+        note_start = note_times[:, 0]
+        note_end   = note_times[:, 1]
 
-                # Record press state
-                try:             action_data[note_start]
-                except KeyError: action_data[note_start] = np.zeros(num_columns) 
-                action_data[note_start] += np.asarray([ ManiaActionData.PRESS if col==c else ManiaActionData.FREE for c in range(num_columns) ])
+        # Adjust note ending based on whether it is single or hold note (determined via min_press_duration)
+        note_end = np.where(note_end - note_start >= min_press_duration, note_end, note_start + min_press_duration)
 
-                # Record release state
-                try:             action_data[note_end]
-                except KeyError: action_data[note_end] = np.zeros(num_columns)
-                action_data[note_end] += np.asarray([ ManiaActionData.RELEASE if col==c else ManiaActionData.FREE for c in range(num_columns) ])
+        # Each unique timing gets a row. Press and release states are added in, same as they
+        # would add up if a press and a release of one column happened at the same time
+        times, time_idxs = np.unique(np.concatenate((note_start, note_end)), return_inverse=True)
+        states = np.concatenate((np.full(len(note_start), ManiaActionData.PRESS), np.full(len(note_end), ManiaActionData.RELEASE))).astype(np.int8)
 
-        # Sort data by timings
-        action_data = dict(sorted(action_data.items()))
+        data = np.zeros((len(times), num_columns), dtype=np.int8)
+        np.add.at(data, (time_idxs, np.concatenate((note_cols, note_cols))), states)
 
-        # Convert the dictionary of recorded timings and states into a pandas data
-        action_data = pd.DataFrame.from_dict(action_data, orient='index')
-        action_data.index.name = 'time'
+        action_data = pd.DataFrame(data.astype(np.float64), index=pd.Index(times, name='time'))
         
         # Fill in HOLD data
         ManiaActionData.fill_holds(action_data)
@@ -75,31 +71,39 @@ class ManiaActionData():
         """
         cols = int(cols)
 
-        # Record data via dictionary to identify unique timings
-        replay_data = {}
+        if isinstance(replay_events, ReplayFrames):
+            replay_t, replay_x = replay_events.t, replay_events.x
+        else:
+            replay_t = np.fromiter((replay_event.t for replay_event in replay_events), dtype=np.int64, count=len(replay_events))
+            replay_x = np.fromiter((replay_event.x for replay_event in replay_events), dtype=np.float64, count=len(replay_events))
 
-        # Previous state of whether finger is holding key down
-        hold_state = np.asarray([ False for _ in range(cols) ])
-
-        for replay_event in replay_events:
-            is_key_hold = np.asarray([ ((int(replay_event.x) & (1 << col)) > 0) for col in range(cols) ])
-            if np.equal(hold_state, is_key_hold).all():
-                continue
-
-            data = np.asarray([ ManiaActionData.FREE for _ in range(cols) ])
-            data[~hold_state &  is_key_hold] = ManiaActionData.PRESS
-            data[ hold_state &  is_key_hold] = ManiaActionData.HOLD
-            data[ hold_state & ~is_key_hold] = ManiaActionData.RELEASE
+        # Whether finger is holding key down, for each column. Keys are bit flags in the x position
+        is_key_hold = ((replay_x.astype(np.int64)[:, None] >> np.arange(cols)) & 1).astype(bool)
 
-            replay_data[replay_event.t] = data
-            hold_state = is_key_hold
-
-        # Sort data by timings
-        replay_data = dict(sorted(replay_data.items()))
-
-        # Convert the dictionary of recorded timings and states into a pandas data
-        replay_data = pd.DataFrame.from_dict(replay_data, orient='index')
-        replay_data.index.name = 'time'
+        # Previous state of whether finger is holding key down
+        hold_state = np.zeros_like(is_key_hold)
+        hold_state[1:] = is_key_hold[:-1]
+
+        # Only frames where some key changed state are recorded
+        changed = np.any(is_key_hold != hold_state, axis=1)
+        is_key_hold = is_key_hold[changed]
+        hold_state  = hold_state[changed]
+
+        data = np.full(is_key_hold.shape, ManiaActionData.FREE, dtype=np.int64)
+        data[~hold_state &  is_key_hold] = ManiaActionData.PRESS
+        data[ hold_state &  is_key_hold] = ManiaActionData.HOLD
+        data[ hold_state & ~is_key_hold] = ManiaActionData.RELEASE
+
+        if len(data) == 0:
+            replay_data = pd.DataFrame()
+            replay_data.index.name = 'time'
+            return replay_data
+
+        # Frames recorded at the same time as a later one get replaced by it
+        replay_t = replay_t[changed]
+        times, last_idxs = np.unique(replay_t[::-1], return_index=True)
+        
+        replay_data = pd.DataFrame(data[len(data) - 1 - last_idxs], index=pd.Index(times, name='time'))
         return replay_data
 
 
@@ -199,26 +203,25 @@ class ManiaActionData():
         numpy.array
         Filtered ``action_data``
         """
-        data = action_data.values.T
-
-        for col in range(len(data)):
-            hold_flag = False
-
-            for row in range(len(data[col])):
-                elem = data[col, row]
-                
-                if hold_flag:
-                    if elem == ManiaActionData.PRESS:
-                        raise ValueError(f'Two consequtive hold starts: ({col}, {row})')
-                    elif elem == ManiaActionData.RELEASE: 
-                        hold_flag = False
-                    elif elem == ManiaActionData.FREE: 
-                        data[col, row] = ManiaActionData.HOLD
-                else:
-                    if elem == ManiaActionData.PRESS:
-                        hold_flag = True
-                    elif elem == ManiaActionData.RELEASE: 
-                        raise ValueError(f'Hold ended before it started: ({col}, {row})')
+        data = action_data.values
+
+        # Number of holds each column is in the middle of after each row
+        is_press   = (data == ManiaActionData.PRESS)
+        is_release = (data == ManiaActionData.RELEASE)
+        hold_depth = np.cumsum(is_press, axis=0) - np.cumsum(is_release, axis=0)
+
+        for col in range(data.shape[1]):
+            errors = np.flatnonzero((hold_depth[:, col] < 0) | (hold_depth[:, col] > 1))
+            if len(errors) == 0:
+                continue
+
+            row = errors[0]
+            if is_press[row, col]:
+                raise ValueError(f'Two consequtive hold starts: ({col}, {row})')
+            else:
+                raise ValueError(f'Hold ended before it started: ({col}, {row})')
+
+        data[(hold_depth == 1) & (data == ManiaActionData.FREE)] = ManiaActionData.HOLD
 
 
     @staticmethod
@@ -15,6 +15,60 @@ class ManiaMapMetrics():
     """
     Raw metrics
     """
+    @staticmethod
+    def calc_window_counts(event_times, times, window_ms, weights=None):
+        """
+        Counts events that occur within ``window_ms`` of time up to each of ``times``, including the events 
+        at both ends of the window. Counts are taken as the difference of the cumulative sum of events at the 
+        ends of the window, which are found with ``searchsorted``, so it takes O(n log n) no matter the window size.
+
+        Parameters
+        ----------
+        event_times : numpy.array
+            Sorted timings of the events
+
+        times : numpy.array
+            Timings to count events up to
+
+        window_ms : int or list
+            Duration in milliseconds for which events are counted up. If a list, events are counted for each 
+            of the durations
+
+        weights : numpy.array
+            Number of events at each of ``event_times``. Can be 2D to count events of each column separately, 
+            like ``(action_data == ManiaActionData.PRESS).to_numpy()``. Each event counts as one if not specified
+
+        Returns
+        -------
+        numpy.array
+            Event counts. The first axis is ``times``, followed by an axis for the columns of ``weights`` if it's 2D 
+            and an axis for ``window_ms`` if it's a list
+        """
+        event_times = np.asarray(event_times)
+        times       = np.asarray(times)
+        window_ms   = np.asarray(window_ms)
+
+        if weights is None:
+            weights = np.ones(len(event_times), dtype=np.int64)
+        
+        weights = np.asarray(weights)
+        if weights.dtype == bool:
+            weights = weights.astype(np.int64)
+
+        # Number of events up to each event timing; index 0 is before the first event
+        cumsum = np.zeros((len(event_times) + 1, ) + weights.shape[1:], dtype=weights.dtype)
+        np.cumsum(weights, axis=0, out=cumsum[1:])
+
+        end_idxs   = np.searchsorted(event_times, times, side='right')
+        start_idxs = np.searchsorted(event_times, times[:, None] - window_ms if window_ms.ndim > 0 else times - window_ms, side='left')
+
+        if window_ms.ndim == 0:
+            return cumsum[end_idxs] - cumsum[start_idxs]
+
+        # Window axis goes last
+        return cumsum[end_idxs][..., None] - np.moveaxis(cumsum[start_idxs], 1, -1)
+
+
     @staticmethod
     def calc_press_rate(action_data, col=None, window_ms=1000):
         """
@@ -29,28 +83,27 @@ class ManiaMapMetrics():
         col : int
             Column to calculated presses per second for
 
-        window_ms : int
-            Duration in milliseconds for which actions are counted up
+        window_ms : int or list
+            Duration in milliseconds for which actions are counted up. If a list, presses per second are 
+            calculated for each of the durations
 
         Returns
         -------
         (numpy.array, numpy.array)
         Tuple of ``(times, aps)``. ``times`` are timings corresponding to recorded actions per second. 
-            ``aps`` are actions per second at indicated time.
+            ``aps`` are actions per second at indicated time. If ``window_ms`` is a list, ``aps`` has a column 
+            for each of the durations.
         """
-        times, aps = [], []
-
         if col != None:
             action_data = action_data[col]
 
-        for timing in action_data.index:
-            actions_in_range = action_data.loc[timing - window_ms : timing]
-            num_actions = (actions_in_range == ManiaActionData.PRESS).to_numpy().sum()
-            
-            times.append(timing)
-            aps.append(1000*num_actions/window_ms)
+        times   = action_data.index.to_numpy()
+        presses = (action_data == ManiaActionData.PRESS).to_numpy()
+        if presses.ndim > 1:
+            presses = presses.sum(axis=1)
 
-        return np.asarray(times), np.asarray(aps)
+        num_actions = ManiaMapMetrics.calc_window_counts(times, times, window_ms, presses)
+        return times, 1000*num_actions/np.asarray(window_ms)
 
 
     @staticmethod
@@ -89,30 +142,22 @@ class ManiaMapMetrics():
         action_data : numpy.array
             Action data from ``ManiaMapData.get_action_data``
 
-        window_ms : int
-            Duration in milliseconds for which actions are counted up
+        window_ms : int or list
+            Duration in milliseconds for which actions are counted up. If a list, presses per second are 
+            calculated for each of the durations
 
         Returns
         -------
         (numpy.array, numpy.array)
         Tuple of ``(times, max_aps_per_col)``. ``times`` are timings corresponding to recorded actions per second. 
-            ``max_aps_per_col`` are max actions per second at indicated time.
+            ``max_aps_per_col`` are max actions per second at indicated time. If ``window_ms`` is a list, 
+            ``max_aps_per_col`` has a column for each of the durations.
         """
-        times, aps = [], []
-
-        # iterate through timings
-        for timing in action_data.index:
-            aps_per_col = []
+        times   = action_data.index.to_numpy()
+        presses = (action_data == ManiaActionData.PRESS).to_numpy()
 
-            # iterate through columns
-            for _, data in action_data.loc[timing - window_ms : timing].iteritems():
-                num_actions = (data == ManiaActionData.PRESS).to_numpy().sum()
-                aps_per_col.append(1000*num_actions/window_ms)
-            
-            times.append(timing)
-            aps.append(max(aps_per_col))
-
-        return np.asarray(times), np.asarray(aps) 
+        num_actions = ManiaMapMetrics.calc_window_counts(times, times, window_ms, presses)
+        return times, 1000*num_actions.max(axis=1)/np.asarray(window_ms)
 
 
     @staticmethod
@@ -568,24 +613,27 @@ class ManiaMapMetrics():
         hitobject_data : numpy.array
             Hitobject data from ``ManiaMapData.get_hitobject_data``
 
-        time: int
-            Time to calculate notes per second for
+        time: int or numpy.array
+            Time to calculate notes per second for. Can be an array of times
 
-        ms_window: int
-            Milliseconds back in time to take account
+        ms_window: int or list
+            Milliseconds back in time to take account. If a list, notes per second are calculated
+            for each of the durations
 
         column : int
             Which column number to get average note rate for
 
         Returns
         -------
-        float
-            Average notes per second for specified column
+        float or numpy.array
+            Average notes per second for specified column. An array with an axis for each of 
+            ``time`` and ``ms_window`` that are arrays
         """
-        start_times = ManiaMapData.start_times(hitobject_data, column)
-        start_times = start_times[time - ms_window <= start_times <= time]
-        intervals   = np.diff(start_times)/1000
-        return np.mean(intervals)
+        start_times = np.sort(ManiaMapData.start_times(hitobject_data, column))
+        num_notes   = ManiaMapMetrics.calc_window_counts(start_times, np.atleast_1d(time), ms_window)
+
+        nps = 1000*num_notes/np.asarray(ms_window)
+        return nps if np.ndim(time) > 0 else nps[0]
 
 
     @staticmethod
@@ -598,19 +646,25 @@ class ManiaMapMetrics():
         hitobject_data : numpy.array
             Hitobject data from ``ManiaMapData.get_hitobject_data``
 
-        time: int
-            Time to calculate notes per second for
+        time: int or numpy.array
+            Time to calculate notes per second for. Can be an array of times
 
-        ms_window: int
-            Milliseconds back in time to take account
+        ms_window: int or list
+            Milliseconds back in time to take account. If a list, notes per second are calculated
+            for each of the durations
 
         Returns
         -------
-        float
-            Average notes per second
+        float or numpy.array
+            Average notes per second. An array with an axis for each of ``time`` and ``ms_window`` 
+            that are arrays
         """
-        avg_nps = np.asarray([ ManiaMapMetrics.calc_avg_nps_col(hitobject_data, time, ms_window, column) for column in len(hitobject_data) ])
-        return np.mean(avg_nps)
+        # The average of the columns' notes per second is the notes per second of all columns divided up among them
+        start_times = ManiaMapData.start_times(hitobject_data)
+        num_notes   = ManiaMapMetrics.calc_window_counts(start_times, np.atleast_1d(time), ms_window)
+
+        nps = 1000*num_notes/np.asarray(ms_window)/len(hitobject_data)
+        return nps if np.ndim(time) > 0 else nps[0]
 
 
     @staticmethod
@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 import scipy.stats
 import math
+import bisect
+import concurrent.futures
 
 from analysis.osu.mania.action_data import ManiaActionData
 from osu.local.hitobject.mania.mania import Mania
@@ -75,6 +77,19 @@ class ManiaScoreData():
     # processed for each individual key event.
     overlap_hit_handling  = False
 
+    # Names of the above settings
+    SETTINGS = [
+        'pos_hit_range', 'neg_hit_range', 'pos_hit_miss_range', 'neg_hit_miss_range',
+        'pos_rel_range', 'neg_rel_range', 'pos_rel_miss_range', 'neg_rel_miss_range',
+        'notelock', 'dynamic_window', 'blank_miss', 'lazy_sliders', 'overlap_miss_handling', 'overlap_hit_handling'
+    ]
+
+    # Hit windows (ms) of the MAX, 300, 200, 100, and 50 judgements used by the models. Set for OD8
+    model_judgement_offsets = np.asarray([ 16.5, 40.5, 73.5, 103.5, 127.5 ])
+
+    # Score points of the MAX, 300, 200, 100, and 50 judgements used by the models
+    model_judgement_points  = np.asarray([ 300, 300, 200, 100, 50 ])
+
 
     @staticmethod
     def __process_press(column_data, replay_time, map_times, map_idx):
@@ -197,7 +212,7 @@ class ManiaScoreData():
 
 
     @staticmethod
-    def get_score_data(map_data, replay_data):
+    def get_score_data(map_data, replay_data, num_workers=1):
         """
         [
             [
@@ -212,79 +227,160 @@ class ManiaScoreData():
             ],
             ... N cols
         ]
+
+        Each column is scored on its own with ``ManiaScoreData.get_column_score_data``
+
+        Parameters
+        ----------
+        map_data : pandas.DataFrame
+            Map data from ``ManiaActionData.get_map_data``
+
+        replay_data : pandas.DataFrame
+            Replay data from ``ManiaActionData.get_replay_data``
+
+        num_workers : int
+            Number of processes to score columns with. None uses one per CPU, 1 scores them in this process
+
+        Returns
+        -------
+        pandas.DataFrame
+            Score data of all columns, indexed by column and then by the order of the scoring events
         """
-        score_data = []
+        replay_times = replay_data.index.values
+        columns = []
 
-        # Go through each column
         for map_col_idx, replay_col_idx in zip(map_data, replay_data):
             free_filter = map_data[map_col_idx] != ManiaActionData.FREE
+            columns.append((map_data.index[free_filter].values, map_data[map_col_idx][free_filter].values, replay_times, replay_data[replay_col_idx].values))
+
+        if num_workers == 1 or len(columns) < 2:
+            score_data = [ ManiaScoreData.get_column_score_data(*column) for column in columns ]
+        else:
+            # Scoring settings are class attributes, so worker processes need to be given the ones set in this process
+            settings = { name : getattr(ManiaScoreData, name) for name in ManiaScoreData.SETTINGS }
+            with concurrent.futures.ProcessPoolExecutor(num_workers, initializer=ManiaScoreData.set_settings, initargs=(settings, )) as executor:
+                score_data = list(executor.map(ManiaScoreData.get_column_score_data, *zip(*columns)))
 
-            map_col    = map_data[map_col_idx][free_filter].values
-            map_times  = map_data.index[free_filter].values
-            replay_col = replay_data[replay_col_idx]
+        # This turns out to be 3 dimensional data (indexed by columns, timings, and attributes)
+        return pd.concat(score_data, axis=0, keys=range(len(score_data)))
 
-            column_data = {}
-            replay_idx = 0
 
-            map_idx   = 0
-            map_time  = map_times[map_idx]
-            note_type = map_col[map_idx]
+    @staticmethod
+    def get_column_score_data(map_times, map_types, replay_times, replay_keys):
+        """
+        Scores one column. Instead of going through every replay timing, this jumps to where the
+        next thing happens to the current note: the first of the column's press or release events 
+        that can be scored on it, or the first replay timing past its miss window, whichever comes 
+        first. Those timings are found with ``searchsorted`` for all notes beforehand. Notes missed 
+        for not being hit are recorded at that replay timing, same as when going through every 
+        replay timing.
+
+        Parameters
+        ----------
+        map_times : numpy.array
+            Timings of the column's non-FREE map states
+
+        map_types : numpy.array
+            The column's non-FREE map states
+
+        replay_times : numpy.array
+            Timings of all replay states
+
+        replay_keys : numpy.array
+            The column's replay states at ``replay_times``
+
+        Returns
+        -------
+        pandas.DataFrame
+            Score data of the column with ``replay_t``, ``map_t``, ``type``, and ``map_idx`` columns
+        """
+        column_data = {}
 
-            # Number of things to loop through
-            num_replay_events = len(replay_data)
-            
-            # Go through replay events
-            while True:
-                # Condition check whether all player actions in the column have been processed
-                # It's possible that the player never pressed any keys, so this may hit more
-                # often than one may expect
-                if replay_idx >= num_replay_events: break
-
-                # Time at which press or release occurs
-                replay_time = replay_col.index[replay_idx]
-                replay_key  = replay_col.iloc[replay_idx]
-
-                # Go through map notes
-                while True:
-                    # Check for any skipped notes (if replay has event gaps)
-                    adv = ManiaScoreData.__process_free(column_data, note_type, replay_time, map_times, map_idx)
-                    if adv == 0: break
-
-                    map_idx += adv
-                    map_time = map_times[map_idx] if map_idx < len(map_col) else map_times[-1] + 1
-                    note_type = map_col[map_idx] if map_idx < len(map_col) else ManiaActionData.FREE
-
-                # If a press occurs at this time and we expect it
-                if replay_key == ManiaActionData.PRESS and note_type == ManiaActionData.PRESS:
-                    map_idx += ManiaScoreData.__process_press(column_data, replay_time, map_times, map_idx)
-                    map_time = map_times[map_idx] if map_idx < len(map_col) else map_times[-1] + 1
-                    note_type = map_col[map_idx] if map_idx < len(map_col) else ManiaActionData.FREE
-
-                    replay_idx += 1
-                    continue
-
-                # If a release occurs at this time and we expect it
-                if replay_key == ManiaActionData.RELEASE and note_type == ManiaActionData.RELEASE:
-                    map_idx += ManiaScoreData.__process_release(column_data, replay_time, map_times, map_idx)
-                    map_time = map_times[map_idx] if map_idx < len(map_col) else map_times[-1] + 1
-                    note_type = map_col[map_idx] if map_idx < len(map_col) else ManiaActionData.FREE
-
-                    replay_idx += 1
-                    continue                        
-
-                # If we are here then it's a HOLD or FREE. Ignore.
-                replay_idx += 1
+        is_press   = (map_types == ManiaActionData.PRESS)
+        is_release = (map_types == ManiaActionData.RELEASE)
+
+        # Replay timing index at which each note is past its miss window
+        miss_times = np.where(is_press, map_times + ManiaScoreData.pos_hit_miss_range, map_times + ManiaScoreData.pos_rel_miss_range)
+        miss_idxs  = np.searchsorted(replay_times, miss_times, side='right').tolist()
+
+        # Way early presses and releases are ignored unless blank miss is on, so they can be skipped over.
+        # Releases are never way early if release timings don't matter or the note is a single note
+        is_single_note = np.zeros(len(map_times), dtype=bool)
+        is_single_note[1:] = (np.diff(map_times) <= 1)
+
+        skip_early  = np.zeros(len(map_times), dtype=bool)
+        early_times = np.where(is_press, map_times - ManiaScoreData.neg_hit_miss_range, map_times - ManiaScoreData.neg_rel_miss_range)
+
+        if not ManiaScoreData.blank_miss:
+            skip_early = is_press | (is_release & ~is_single_note & (not ManiaScoreData.lazy_sliders))
+
+        early_idxs = np.where(skip_early, np.searchsorted(replay_times, early_times, side='right'), 0).tolist()
+
+        # Replay timing indices of the events that can be scored, by the type of note they can be scored on
+        event_idxs = {
+            ManiaActionData.PRESS   : np.flatnonzero(replay_keys == ManiaActionData.PRESS).tolist(),
+            ManiaActionData.RELEASE : np.flatnonzero(replay_keys == ManiaActionData.RELEASE).tolist(),
+        }
+
+        map_types  = map_types.tolist()
+        num_notes  = len(map_types)
+        num_events = len(replay_times)
+
+        map_idx    = 0
+        replay_idx = 0
+
+        while True:
+            # Holds have nothing to score
+            while map_idx < num_notes and map_types[map_idx] not in event_idxs:
+                map_idx += 1
+
+            if map_idx >= num_notes: break
+            note_type = map_types[map_idx]
+
+            # First replay timing at which the note is past its miss window
+            miss_idx = max(replay_idx, miss_idxs[map_idx])
+
+            # First key event that gets scored on the note
+            events    = event_idxs[note_type]
+            event_idx = bisect.bisect_left(events, max(replay_idx, early_idxs[map_idx]))
+            event_idx = events[event_idx] if event_idx < len(events) else num_events
+
+            if min(miss_idx, event_idx) >= num_events: break
+
+            # Misses are processed before key events at the same timing
+            if miss_idx <= event_idx:
+                map_idx += ManiaScoreData.__process_free(column_data, note_type, replay_times[miss_idx], map_times, map_idx)
+                replay_idx = miss_idx
                 continue
 
-            # Sort data by timings
-            column_data = dict(sorted(column_data.items()))
+            if note_type == ManiaActionData.PRESS:
+                map_idx += ManiaScoreData.__process_press(column_data, replay_times[event_idx], map_times, map_idx)
+            else:
+                map_idx += ManiaScoreData.__process_release(column_data, replay_times[event_idx], map_times, map_idx)
 
-            # Convert the dictionary of recorded timings and states into a pandas data
-            column_data = pd.DataFrame.from_dict(column_data, orient='index', columns=['replay_t', 'map_t', 'type', 'map_idx'])
-            score_data.append(column_data)
+            replay_idx = event_idx + 1
 
-        # This turns out to be 3 dimensional data (indexed by columns, timings, and attributes)
-        return pd.concat(score_data, axis=0, keys=range(len(map_data)))
+        # Convert the dictionary of recorded timings and states into a pandas data. Blank misses have
+        # no map timing or index, so those need pandas to work out the type of each column
+        records = list(column_data.values())
+        if len(records) == 0 or any(record.dtype == object for record in records):
+            return pd.DataFrame.from_dict(column_data, orient='index', columns=['replay_t', 'map_t', 'type', 'map_idx'])
+
+        return pd.DataFrame(np.vstack(records), columns=['replay_t', 'map_t', 'type', 'map_idx'])
+
+
+    @staticmethod
+    def set_settings(settings):
+        """
+        Sets scoring settings
+
+        Parameters
+        ----------
+        settings : dict
+            Values of settings in ``ManiaScoreData.SETTINGS`` by name
+        """
+        for name, value in settings.items():
+            setattr(ManiaScoreData, name, value)
 
 
     @staticmethod
@@ -330,17 +426,62 @@ class ManiaScoreData():
 
     @staticmethod
     def model_offset_prob(mean, stdev, offset):
-        prob_less_than_neg = scipy.stats.norm.cdf(-offset, loc=mean, scale=stdev)
-        prob_less_than_pos = scipy.stats.norm.cdf(offset, loc=mean, scale=stdev)
+        """
+        Probability of a hit landing within ``-offset <= X <= offset`` if hit offsets
+        follow a gaussian distribution
+
+        Parameters
+        ----------
+        mean : float or numpy.array
+            Mean of the hit offsets
 
-        return prob_less_than_pos - prob_less_than_neg
+        stdev : float or numpy.array
+            Standard deviation of the hit offsets
+
+        offset : float or numpy.array
+            Offsets (ms) to determine odds for. Broadcasts with ``mean`` and ``stdev``
+
+        Returns
+        -------
+        float or numpy.array
+        """
+        offset, mean, stdev = np.broadcast_arrays(np.asarray(offset, dtype=np.float64), mean, stdev)
+        probs = scipy.stats.norm.cdf(np.stack((-offset, offset)), loc=mean, scale=stdev)
+
+        return probs[1] - probs[0]
+
+
+    @staticmethod
+    def model_judgement_probs(mean, stdev):
+        """
+        Probabilities of a hit getting each judgement if hit offsets follow a gaussian distribution. 
+        All of the judgement windows in ``ManiaScoreData.model_judgement_offsets`` are evaluated at once.
+
+        Parameters
+        ----------
+        mean : float or numpy.array
+            Mean of the hit offsets
+
+        stdev : float or numpy.array
+            Standard deviation of the hit offsets. Broadcasts with ``mean``
+
+        Returns
+        -------
+        numpy.array
+            Probabilities of MAX, 300, 200, 100, 50, and miss along the last axis
+        """
+        mean  = np.asarray(mean, dtype=np.float64)[..., None]
+        stdev = np.asarray(stdev, dtype=np.float64)[..., None]
+
+        probs_within = ManiaScoreData.model_offset_prob(mean, stdev, ManiaScoreData.model_judgement_offsets)
+        return np.diff(probs_within, prepend=0, append=1, axis=-1)
 
 
     @staticmethod
     def odds_some_tap_within(score_data, offset):
         """
         Creates a gaussian distribution model using avg and var of tap offsets and calculates the odds that some hit
-        is within the specified offset
+        is within the specified offset. ``offset`` can be an array of offsets
 
         Returns: probability one random value [X] is between -offset <= X <= offset
                  TL;DR: look at all the hits for scores; What are the odds of you picking 
@@ -356,7 +497,7 @@ class ManiaScoreData():
     def odds_all_tap_within(score_data, offset):    
         """
         Creates a gaussian distribution model using avg and var of tap offsets and calculates the odds that all hits
-        are within the specified offset
+        are within the specified offset. ``offset`` can be an array of offsets
 
         Returns: probability all random values [X] are between -offset <= X <= offset
                 TL;DR: look at all the hits for scores; What are the odds all of them are between -offset and offset?
@@ -381,23 +522,15 @@ class ManiaScoreData():
     @staticmethod
     def model_ideal_acc(mean, stdev, num_notes, score_point_judgements=None):
         """
-        Set for OD8
-        """
-        prob_less_than_max  = ManiaScoreData.model_offset_prob(mean, stdev, 16.5)
-        prob_less_than_300  = ManiaScoreData.model_offset_prob(mean, stdev, 40.5)
-        prob_less_than_200  = ManiaScoreData.model_offset_prob(mean, stdev, 73.5)
-        prob_less_than_100  = ManiaScoreData.model_offset_prob(mean, stdev, 103.5)
-        prob_less_than_50   = ManiaScoreData.model_offset_prob(mean, stdev, 127.5)
+        Accuracy a player would get if their hit offsets followed a gaussian distribution.
+        ``mean`` and ``stdev`` can be arrays, in which case an accuracy is returned for each.
 
-        prob_max  = prob_less_than_max
-        prob_300  = prob_less_than_300 - prob_max
-        prob_200  = prob_less_than_200 - prob_less_than_300
-        prob_100  = prob_less_than_100 - prob_less_than_200
-        prob_50   = prob_less_than_50 - prob_less_than_100
-        prob_miss = 1 - prob_less_than_50
-
-        total_points_of_hits = (prob_50*50 + prob_100*100 + prob_200*200 + prob_300*300 + prob_max*300)*(num_notes - num_notes*prob_miss)
+        Set for OD8, see ``ManiaScoreData.model_judgement_offsets``
+        """
+        probs = ManiaScoreData.model_judgement_probs(mean, stdev)
+        prob_miss = probs[..., -1]
 
+        total_points_of_hits = (probs[..., :-1] @ ManiaScoreData.model_judgement_points)*(num_notes - num_notes*prob_miss)
         return total_points_of_hits / (num_notes * 300)
 
 
@@ -408,72 +541,102 @@ class ManiaScoreData():
         """
         mean      = ManiaScoreData.tap_offset_mean(score_data)
         stdev     = ManiaScoreData.tap_offset_stdev(score_data)
-        num_taps  = len(score_data[ManiaScoreData.DATA_OFFSET])
+        num_taps  = len(ManiaScoreData.filter_by_hit_type(score_data, [ManiaScoreData.TYPE_EMPTY], invert=True))
 
         return ManiaScoreData.model_ideal_acc(mean, stdev, num_taps, score_point_judgements)
 
 
     @staticmethod
     def model_num_hits(mean, stdev, num_notes):
-        # Calculate probabilities of hits being within offset of the resultant gaussian distribution
-        prob_less_than_max  = ManiaScoreData.model_offset_prob(mean, stdev, 16.5)
-        prob_less_than_300  = ManiaScoreData.model_offset_prob(mean, stdev, 40.5)
-        prob_less_than_200  = ManiaScoreData.model_offset_prob(mean, stdev, 73.5)
-        prob_less_than_100  = ManiaScoreData.model_offset_prob(mean, stdev, 103.5)
-        prob_less_than_50   = ManiaScoreData.model_offset_prob(mean, stdev, 127.5)
-
-        prob_max  = prob_less_than_max
-        prob_300  = prob_less_than_300 - prob_max
-        prob_200  = prob_less_than_200 - prob_less_than_300
-        prob_100  = prob_less_than_100 - prob_less_than_200
-        prob_50   = prob_less_than_50 - prob_less_than_100
-        prob_miss = 1 - prob_less_than_50
+        """
+        Number of each judgement a player would get if their hit offsets followed a gaussian distribution. 
+        ``mean`` and ``stdev`` can be arrays, in which case each returned count is an array as well.
 
+        Returns
+        -------
+        tuple
+            Number of MAX, 300, 200, 100, 50, and miss judgements
+        """
         # Get num of hitobjects that ideally would occur based on the gaussian distribution
-        num_max  = prob_max*num_notes
-        num_300  = prob_300*num_notes
-        num_200  = prob_200*num_notes
-        num_100  = prob_100*num_notes
-        num_50   = prob_50*num_notes
-        num_miss = prob_miss*num_notes
-
-        return num_max, num_300, num_200, num_100, num_50, num_miss
+        num_hits = ManiaScoreData.model_judgement_probs(mean, stdev)*num_notes
+        return tuple(np.moveaxis(num_hits, -1, 0))
 
 
     @staticmethod
-    def odds_acc(score_data, target_acc):
-        num_notes = len(np.vstack(score_data))
-        mean      = ManiaScoreData.tap_offset_mean(score_data)
+    def model_stdev_from_acc(mean, num_notes, target_acc, min_stdev=1e-3, max_stdev=1e6, iterations=64):
+        """
+        Finds the standard deviation of hit offsets for which ``ManiaScoreData.model_ideal_acc`` gives ``target_acc``.
+
+        The standard deviation is bisected in log space within ``[ min_stdev, max_stdev ]``, so the 
+        search always takes ``iterations`` steps. All targets are bisected together. Targets outside of 
+        the accuracies at the two ends of the bracket can't be fit and give ``nan``.
+
+        The fit is only meaningful if ``mean`` is within the 300 hit window (40.5 ms). Accuracy only goes 
+        down as the spread of hits goes up then. A mean outside of that window puts all hits of a small 
+        spread into a worse judgement, and widening the spread first raises accuracy. The standard deviation 
+        found is then one of possibly two that give ``target_acc``.
+
+        Parameters
+        ----------
+        mean : float
+            Mean of the hit offsets
+
+        num_notes : int
+            Number of notes
+
+        target_acc : float or numpy.array
+            Accuracies to fit the standard deviation to, from 0.0 to 1.0
+
+        Returns
+        -------
+        float or numpy.array
+            Standard deviation for each of ``target_acc``, ``nan`` for the ones that can't be reached
+        """
+        target_acc = np.asarray(target_acc, dtype=np.float64)
 
-        def get_stdev_from_acc(acc):
-            stdev    = ManiaScoreData.tap_offset_stdev(score_data)
-            curr_acc = ManiaScoreData.model_ideal_acc_data(score_data)
+        lo = np.full(target_acc.shape, np.log(min_stdev))
+        hi = np.full(target_acc.shape, np.log(max_stdev))
 
-            cost = round(acc, 3) - round(curr_acc, 3)
-            rate = 1
+        # Bisecting keeps the accuracy above the target at ``lo`` and at or below it at ``hi``,
+        # which only holds from the start for targets between the accuracies at the ends
+        max_acc, min_acc = ManiaScoreData.model_ideal_acc(mean, np.asarray([ min_stdev, max_stdev ]), num_notes)
+        is_reachable = (min_acc <= target_acc) & (target_acc <= max_acc)
 
-            while cost != 0:
-                stdev -= cost*rate
+        for _ in range(iterations):
+            mid = (lo + hi)/2
+            too_accurate = ManiaScoreData.model_ideal_acc(mean, np.exp(mid), num_notes) > target_acc
 
-                curr_acc = ManiaScoreData.model_ideal_acc(mean, stdev, num_notes)
-                cost = round(acc, 3) - round(curr_acc, 3)
+            lo = np.where(too_accurate, mid, lo)
+            hi = np.where(too_accurate, hi, mid)
 
-            return stdev
+        return np.where(is_reachable, np.exp((lo + hi)/2), np.nan)[()]
+
+
+    @staticmethod
+    def odds_acc(score_data, target_acc):
+        """
+        Odds of the player getting at least ``target_acc`` based on the distribution of their hit offsets. 
+        ``target_acc`` can be an array of accuracies. Accuracies no distribution of hits with the player's
+        mean offset can get give ``nan``, see ``ManiaScoreData.model_stdev_from_acc``
+
+        Returns
+        -------
+        float or numpy.array
+        """
+        score_data = ManiaScoreData.filter_by_hit_type(score_data, [ManiaScoreData.TYPE_EMPTY], invert=True)
+        num_notes  = len(score_data)
+        mean       = ManiaScoreData.tap_offset_mean(score_data)
 
         # Fit a normal distribution to the desired acc
-        stdev = get_stdev_from_acc(target_acc)
+        stdev = ManiaScoreData.model_stdev_from_acc(mean, num_notes, target_acc)
 
-        # Get the number of resultant hits from that distribution
-        num_max, num_300, num_200, num_100, num_50, num_miss = ManiaScoreData.model_num_hits(mean, stdev, num_notes)
+        # Get the number of resultant hits from that distribution; Number of hits within each judgement's window
+        num_hits = ManiaScoreData.model_judgement_probs(mean, stdev)[..., :-1]*num_notes
+        num_hits = np.cumsum(num_hits, axis=-1)
 
         # Get the stdev of of the replay data
         stdev = ManiaScoreData.tap_offset_stdev(score_data)
 
         # Get probabilites the number of score points are within hit window based on replay
-        prob_less_than_max = scipy.stats.binom.sf(num_max - 1, num_notes, ManiaScoreData.model_offset_prob(mean, stdev, 16.5))
-        prob_less_than_300 = scipy.stats.binom.sf(num_max + num_300 - 1, num_notes, ManiaScoreData.model_offset_prob(mean, stdev, 40.5))
-        prob_less_than_200 = scipy.stats.binom.sf(num_max + num_300 + num_200 - 1, num_notes, ManiaScoreData.model_offset_prob(mean, stdev, 73.5))
-        prob_less_than_100 = scipy.stats.binom.sf(num_max + num_300 + num_200 + num_100 - 1, num_notes, ManiaScoreData.model_offset_prob(mean, stdev, 103.5))
-        prob_less_than_50  = scipy.stats.binom.sf(num_max + num_300 + num_200 + num_100 + num_50 - 1, num_notes, ManiaScoreData.model_offset_prob(mean, stdev, 127.5))
-
-        return prob_less_than_max*prob_less_than_300*prob_less_than_200*prob_less_than_100*prob_less_than_50
\ No newline at end of file
+        probs = scipy.stats.binom.sf(num_hits - 1, num_notes, ManiaScoreData.model_offset_prob(mean, stdev, ManiaScoreData.model_judgement_offsets))
+        return np.prod(probs, axis=-1)
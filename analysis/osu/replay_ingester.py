@@ -0,0 +1,450 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import pandas as pd
+from collections import OrderedDict
+from contextlib import closing
+
+from osu.local.beatmap.beatmap import Beatmap
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.replay.replayIO import ReplayIO
+
+from analysis.osu.std.map_data import StdMapData
+from analysis.osu.std.replay_data import StdReplayData
+from analysis.osu.std.score_data import StdScoreData
+from analysis.osu.mania.action_data import ManiaActionData
+from analysis.osu.mania.score_data import ManiaScoreData
+
+
+class ReplayIngester():
+    """
+    Class used for scoring replays as they get saved, and keeping the results per player.
+
+    Replays reported by ``Monitor.create_replay_monitor`` are held until the file stops
+    changing for ``ReplayIngester.debounce`` seconds. Each one is then matched to its beatmap
+    by ``beatmap_hash`` through a ``BeatmapLibrary``, scored like ``ScorePool`` does, and
+    its score data is appended to ``<store_dir>/<player>.db``. Replays are identified by the
+    MD5 of the *.osr file, and replays that are already in the store are never scored again.
+
+    Replays whose beatmap is not in the library are kept as unmatched and can be scored
+    later with ``ReplayIngester.retry_unmatched``.
+
+    Example
+    ::
+        library = BeatmapLibrary('C:/osu!/Songs', 'cache/library.db')
+        ingester = ReplayIngester(library, 'data/players')
+
+        monitor = Monitor('C:/osu!')
+        ingester.watch(monitor)
+        ...
+        score_data = ingester.get_score_data('abraker', Beatmap.GAMEMODE_OSU)
+    """
+
+    STATUS_SCORED    = 'scored'
+    STATUS_EXISTS    = 'exists'
+    STATUS_UNMATCHED = 'unmatched'
+    STATUS_ERROR     = 'error'
+
+    """
+    Seconds a replay file needs to go without changing before it's read
+    """
+    debounce = 2.0
+
+    """
+    Seconds between checks for replays that are ready to be read
+    """
+    poll_interval = 0.5
+
+    """
+    Number of beatmaps whose map data is kept in memory
+    """
+    map_cache_size = 32
+
+    def __init__(self, library, store_dir):
+        os.makedirs(store_dir, exist_ok=True)
+
+        self.library   = library
+        self.store_dir = store_dir
+
+        self.pending   = {}     # filepath -> (time to read at, file size)
+        self.ingesting = set()  # filepaths taken from pending that are being ingested
+        self.map_cache = OrderedDict()
+        self.lock      = threading.Lock()
+
+        self.monitor = None
+        self.thread  = None
+        self.running = False
+
+
+    def watch(self, monitor, name='replay_ingester'):
+        """
+        Starts ingesting replays saved to the monitored osu! folder
+
+        Parameters
+        ----------
+        monitor : Monitor
+            Monitor of the osu! folder
+
+        name : str
+            Name to register the replay monitor under
+        """
+        self.monitor = (monitor, name)
+        monitor.create_replay_monitor(name, self.add_replay)
+
+        self.running = True
+        self.thread  = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        """
+        Stops ingesting replays. Replays still waiting out their debounce are read before this returns.
+        """
+        if self.monitor is not None:
+            monitor, name = self.monitor
+            monitor.unschedule(monitor.monitors.pop(name))
+            self.monitor = None
+
+        if self.thread is not None:
+            self.running = False
+            self.thread.join()
+            self.thread = None
+
+        self.process_pending(now=float('inf'))
+
+
+    def add_replay(self, filepath, now=None):
+        """
+        Queues up a replay file to be read once it stops changing. Files that are queued
+        up again before then restart their wait.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the *.osr file
+
+        now : float
+            Current time, ``time.monotonic()`` by default
+        """
+        if not filepath.endswith('.osr'):
+            return
+
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.pending[filepath] = (now + self.debounce, self.__get_size(filepath))
+
+
+    def process_pending(self, now=None):
+        """
+        Ingests queued up replays that haven't changed in the last ``ReplayIngester.debounce`` seconds
+
+        Parameters
+        ----------
+        now : float
+            Current time, ``time.monotonic()`` by default
+
+        Returns
+        -------
+        list
+            (filepath, status) of each replay ingested
+
+        Raises
+        ------
+        Exception
+            The first error a replay failed to get handled with, like the beatmap library being
+            unavailable. The other ready replays are still ingested, and the ones that failed are
+            kept queued up to be tried again after ``ReplayIngester.debounce`` seconds.
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+
+        with self.lock:
+            for filepath, (read_time, size) in list(self.pending.items()):
+                if read_time > now or filepath in self.ingesting:
+                    continue
+
+                # Still being written to; wait some more
+                new_size = self.__get_size(filepath)
+                if new_size != size and now != float('inf'):
+                    self.pending[filepath] = (now + self.debounce, new_size)
+                    continue
+
+                ready.append((filepath, self.pending[filepath]))
+                self.ingesting.add(filepath)
+
+        results = []
+        error   = None
+
+        for filepath, entry in ready:
+            # Replays that fail to get handled stay queued up and are tried again later
+            try: status = self.ingest(filepath)
+            except Exception as e:
+                error = e if error is None else error
+                with self.lock:
+                    self.ingesting.discard(filepath)
+                    if self.pending.get(filepath) == entry:
+                        self.pending[filepath] = (now + self.debounce, entry[1])
+                continue
+
+            # Unless the file changed again while it was being read
+            with self.lock:
+                self.ingesting.discard(filepath)
+                if self.pending.get(filepath) == entry:
+                    del self.pending[filepath]
+
+            results.append((filepath, status))
+
+        if error is not None:
+            raise error
+
+        return results
+
+
+    def ingest(self, filepath):
+        """
+        Scores a replay and stores the results, unless the replay is already in the store
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the *.osr file
+
+        Returns
+        -------
+        str
+            One of ``STATUS_SCORED``, ``STATUS_EXISTS``, ``STATUS_UNMATCHED``, ``STATUS_ERROR``
+        """
+        try:
+            with open(filepath, 'rb') as replay_file:
+                replay_data = replay_file.read()
+
+            # Only the header is needed to tell whether the replay was seen before
+            replay = ReplayIO.load_replay(replay_data, lazy=True)
+        except Exception:
+            return ReplayIngester.STATUS_ERROR
+
+        replay_id = hashlib.md5(replay_data).hexdigest()
+
+        with closing(self.__connect(replay.player_name)) as db:
+            row = db.execute('SELECT status FROM replays WHERE replay_id = ?', (replay_id, )).fetchone()
+            if row is not None and row[0] != ReplayIngester.STATUS_UNMATCHED:
+                return ReplayIngester.STATUS_EXISTS
+
+            return self.__score(db, replay, replay_id, filepath)
+
+
+    def retry_unmatched(self):
+        """
+        Tries scoring replays again whose beatmap was not in the library when they were ingested
+
+        Returns
+        -------
+        list
+            (filepath, status) of each replay retried
+        """
+        self.library.update()
+        results = []
+
+        for player in self.get_players():
+            with closing(self.__connect(player)) as db:
+                rows = db.execute('SELECT path FROM replays WHERE status = ?', (ReplayIngester.STATUS_UNMATCHED, )).fetchall()
+
+            results += [ (filepath, self.ingest(filepath)) for filepath, in rows ]
+
+        return results
+
+
+    def get_players(self):
+        """
+        Returns
+        -------
+        list
+            Names of players that have replays in the store
+        """
+        players = []
+        for filename in sorted(os.listdir(self.store_dir)):
+            if not filename.endswith('.db'): continue
+
+            with closing(sqlite3.connect(os.path.join(self.store_dir, filename))) as db:
+                players.append(db.execute('SELECT value FROM info WHERE name = ?', ('player', )).fetchone()[0])
+
+        return players
+
+
+    def get_replays(self, player):
+        """
+        Parameters
+        ----------
+        player : str
+            Name of the player
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per replay ingested for the player
+        """
+        with closing(self.__connect(player)) as db:
+            return pd.read_sql('SELECT * FROM replays ORDER BY timestamp', db)
+
+
+    def get_score_data(self, player, gamemode, beatmap_hash=None):
+        """
+        Gets the stored score data of the player's replays
+
+        Parameters
+        ----------
+        player : str
+            Name of the player
+
+        gamemode : int
+            ``Beatmap.GAMEMODE_OSU`` or ``Beatmap.GAMEMODE_MANIA``
+
+        beatmap_hash : str
+            Only get score data of replays on this beatmap. All beatmaps by default
+
+        Returns
+        -------
+        pandas.DataFrame
+            Score data from ``StdScoreData.get_score_data`` or ``ManiaScoreData.get_score_data``,
+            with a ``replay_id`` column saying which replay each row is from. Mania score data
+            has its key column as a ``column`` column rather than as part of the index.
+        """
+        table = ReplayIngester.__get_table(gamemode)
+
+        query  = f'SELECT {table}.* FROM {table} JOIN replays USING (replay_id)'
+        params = ()
+
+        if beatmap_hash is not None:
+            query += ' WHERE replays.beatmap_hash = ?'
+            params = (beatmap_hash, )
+
+        with closing(self.__connect(player)) as db:
+            if db.execute('SELECT name FROM sqlite_master WHERE name = ?', (table, )).fetchone() is None:
+                return pd.DataFrame()
+
+            return pd.read_sql(query + f' ORDER BY replays.timestamp, {table}.rowid', db, params=params)
+
+
+    def __run(self):
+        while self.running:
+            # Keep watching even if some replay can't be handled right now
+            try: self.process_pending()
+            except Exception:
+                logging.getLogger(__class__.__name__).exception('Failed to ingest replays')
+
+            time.sleep(self.poll_interval)
+
+
+    def __score(self, db, replay, replay_id, filepath):
+        entry = {
+            'replay_id'    : replay_id,
+            'path'         : filepath,
+            'beatmap_hash' : replay.beatmap_hash,
+            'gamemode'     : replay.game_mode.value,
+            'timestamp'    : replay.timestamp.isoformat(),
+            'mods'         : replay.get_mods_name(),
+            'score'        : replay.score,
+        }
+
+        map_info = self.__get_map_info(replay.beatmap_hash)
+        if map_info is None:
+            self.__store(db, entry, ReplayIngester.STATUS_UNMATCHED)
+            return ReplayIngester.STATUS_UNMATCHED
+
+        gamemode, map_data, ar, cs = map_info
+
+        try:
+            if gamemode == Beatmap.GAMEMODE_OSU:
+                replay_data = StdReplayData.get_replay_data(replay.play_data)
+                score_data  = StdScoreData.get_score_data(replay_data, map_data, ar, cs)
+            else:
+                replay_data = ManiaActionData.get_replay_data(replay.play_data, int(cs))
+                score_data  = ManiaScoreData.get_score_data(map_data, replay_data)
+
+                score_data = score_data.reset_index(level=0).rename(columns={ 'level_0' : 'column' })
+        except Exception:
+            self.__store(db, entry, ReplayIngester.STATUS_ERROR)
+            return ReplayIngester.STATUS_ERROR
+
+        score_data = score_data.reset_index(drop=True)
+        score_data.insert(0, 'replay_id', replay_id)
+
+        self.__store(db, entry, ReplayIngester.STATUS_SCORED, ReplayIngester.__get_table(gamemode), score_data)
+        return ReplayIngester.STATUS_SCORED
+
+
+    def __get_map_info(self, beatmap_hash):
+        if beatmap_hash in self.map_cache:
+            self.map_cache.move_to_end(beatmap_hash)
+            return self.map_cache[beatmap_hash]
+
+        filepath = self.library.get_path(beatmap_hash)
+
+        # Might be a map that was just downloaded
+        if filepath is None:
+            self.library.update()
+            filepath = self.library.get_path(beatmap_hash)
+
+        if filepath is None:
+            return None
+
+        beatmap = BeatmapIO.open_beatmap(filepath)
+
+        if beatmap.gamemode == Beatmap.GAMEMODE_OSU:
+            map_info = (beatmap.gamemode, StdMapData.get_map_data(beatmap.hitobjects), beatmap.difficulty.ar, beatmap.difficulty.cs)
+        elif beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
+            map_info = (beatmap.gamemode, ManiaActionData.get_map_data(beatmap.hitobjects), beatmap.difficulty.ar, beatmap.difficulty.cs)
+        else:
+            return None
+
+        self.map_cache[beatmap_hash] = map_info
+        if len(self.map_cache) > self.map_cache_size:
+            self.map_cache.popitem(last=False)
+
+        return map_info
+
+
+    def __store(self, db, entry, status, table=None, score_data=None):
+        entry = dict(entry, status=status)
+
+        # Replay entry and its score data go in together, so a replay is never left half stored
+        with db:
+            if score_data is not None:
+                columns = list(score_data.columns)
+                db.execute(f'CREATE TABLE IF NOT EXISTS {table} ({", ".join(columns)})')
+                db.execute(f'CREATE INDEX IF NOT EXISTS {table}_replay_id ON {table} (replay_id)')
+
+                rows = zip(*[ score_data[column].tolist() for column in columns ])
+                db.executemany(f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?"*len(columns))})', rows)
+
+            db.execute(f'INSERT OR REPLACE INTO replays ({", ".join(entry)}) VALUES ({", ".join("?"*len(entry))})', tuple(entry.values()))
+
+
+    def __connect(self, player):
+        # Keep player names usable as file names
+        filename = re.sub(r'[^\w\-\[\] ]', '_', player) + '.db'
+        db = sqlite3.connect(os.path.join(self.store_dir, filename))
+
+        db.execute('CREATE TABLE IF NOT EXISTS info (name PRIMARY KEY, value)')
+        db.execute('INSERT OR IGNORE INTO info VALUES (?, ?)', ('player', player))
+        db.execute('CREATE TABLE IF NOT EXISTS replays (replay_id PRIMARY KEY, path, beatmap_hash, gamemode, timestamp, mods, score, status)')
+        db.commit()
+
+        return db
+
+
+    @staticmethod
+    def __get_table(gamemode):
+        if gamemode == Beatmap.GAMEMODE_OSU:   return 'std_score_data'
+        if gamemode == Beatmap.GAMEMODE_MANIA: return 'mania_score_data'
+        raise NotImplementedError(f'Unsupported gamemode: {gamemode}')
+
+
+    @staticmethod
+    def __get_size(filepath):
+        try: return os.path.getsize(filepath)
+        except OSError: return None
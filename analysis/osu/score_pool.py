@@ -0,0 +1,200 @@
+import os
+import multiprocessing
+
+from osu.local.beatmap.beatmap import Beatmap
+from osu.local.replay.replayIO import ReplayIO
+
+from analysis.osu.std.map_data import StdMapData
+from analysis.osu.std.replay_data import StdReplayData
+from analysis.osu.std.score_data import StdScoreData
+from analysis.osu.mania.action_data import ManiaActionData
+from analysis.osu.mania.score_data import ManiaScoreData
+
+
+class ScorePool():
+    """
+    Class used for scoring many replays of one map across multiple processes.
+
+    The map data and the scoring settings are sent to each worker process once when the
+    pool starts. Each worker then opens, parses, and scores the replay filepaths it is
+    handed. Results are yielded back in the same order as the filepaths as soon as they
+    are ready, so they can be processed while the rest of the replays are still being scored.
+
+    Example
+    ::
+        beatmap = BeatmapIO.open_beatmap('download/osu/maps/map.osu')
+        for filepath, score_data in ScorePool.score_dir('download/osu/replays/map', beatmap, workers=32):
+            ...
+    """
+
+    """
+    Number of replay filepaths that are handed to a worker at a time. Larger values
+    reduce inter-process overhead, smaller values help keep all workers busy.
+    """
+    chunksize = 4
+
+    # Per worker process state. Filled in once by ScorePool._init_worker when the pool starts.
+    __state = {}
+
+    @staticmethod
+    def score_std(replay_filepaths, map_data, ar=8, cs=4, workers=None):
+        """
+        Scores std replays in parallel. Each replay goes through ``ReplayIO.open_replay``,
+        ``StdReplayData.get_replay_data``, and ``StdScoreData.get_score_data`` using
+        the ``StdScoreData`` settings that are active at the time this is called.
+
+        Parameters
+        ----------
+        replay_filepaths : list
+            Filepaths of the replays to score
+
+        map_data : pandas.DataFrame
+            Map data from ``StdMapData.get_map_data``
+
+        ar : float
+            AR of the map
+
+        cs : float
+            CS of the map
+
+        workers : int
+            Number of worker processes. Defaults to the number of CPUs
+
+        Yields
+        ------
+        (str, pandas.DataFrame)
+            Replay filepath and its score data, in the order of ``replay_filepaths``
+        """
+        state = {
+            'map_data' : map_data,
+            'ar'       : ar,
+            'cs'       : cs,
+            'settings' : ScorePool.__get_settings(StdScoreData),
+        }
+
+        yield from ScorePool.__run(ScorePool._score_std, replay_filepaths, state, workers)
+
+
+    @staticmethod
+    def score_mania(replay_filepaths, map_data, keys, workers=None):
+        """
+        Scores mania replays in parallel. Each replay goes through ``ReplayIO.open_replay``,
+        ``ManiaActionData.get_replay_data``, and ``ManiaScoreData.get_score_data`` using
+        the ``ManiaScoreData`` settings that are active at the time this is called.
+
+        Parameters
+        ----------
+        replay_filepaths : list
+            Filepaths of the replays to score
+
+        map_data : pandas.DataFrame
+            Action data from ``ManiaActionData.get_map_data``
+
+        keys : int
+            Number of key columns the map has
+
+        workers : int
+            Number of worker processes. Defaults to the number of CPUs
+
+        Yields
+        ------
+        (str, pandas.DataFrame)
+            Replay filepath and its score data, in the order of ``replay_filepaths``
+        """
+        state = {
+            'map_data' : map_data,
+            'keys'     : keys,
+            'settings' : ScorePool.__get_settings(ManiaScoreData),
+        }
+
+        yield from ScorePool.__run(ScorePool._score_mania, replay_filepaths, state, workers)
+
+
+    @staticmethod
+    def score_dir(replay_dir, beatmap, workers=None):
+        """
+        Scores all replays in a directory, such as the ones ``scripts/download_replays.py``
+        saves under ``download/osu/replays/<beatmap>``. Replays are scored in filename order.
+
+        Parameters
+        ----------
+        replay_dir : str
+            Directory containing *.osr files
+
+        beatmap : Beatmap
+            Beatmap the replays were played on. Supports std and mania
+
+        workers : int
+            Number of worker processes. Defaults to the number of CPUs
+
+        Yields
+        ------
+        (str, pandas.DataFrame)
+            Replay filepath and its score data
+        """
+        replay_filenames = sorted([ f for f in os.listdir(replay_dir) if f.endswith('.osr') ])
+        replay_filepaths = [ os.path.join(replay_dir, replay_filename) for replay_filename in replay_filenames ]
+
+        if beatmap.gamemode == Beatmap.GAMEMODE_OSU:
+            map_data = StdMapData.get_map_data(beatmap.hitobjects)
+            yield from ScorePool.score_std(replay_filepaths, map_data, beatmap.difficulty.ar, beatmap.difficulty.cs, workers)
+            return
+
+        if beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
+            map_data = ManiaActionData.get_map_data(beatmap.hitobjects)
+            yield from ScorePool.score_mania(replay_filepaths, map_data, int(beatmap.difficulty.cs), workers)
+            return
+
+        raise NotImplementedError(f'Unsupported gamemode: {beatmap.gamemode}')
+
+
+    @staticmethod
+    def __run(func, replay_filepaths, state, workers):
+        if workers is None:
+            workers = os.cpu_count()
+
+        # Not worth starting up processes for
+        if workers <= 1 or len(replay_filepaths) <= 1:
+            ScorePool._init_worker(state)
+            for replay_filepath in replay_filepaths:
+                yield func(replay_filepath)
+            return
+
+        workers = min(workers, len(replay_filepaths))
+        with multiprocessing.Pool(workers, initializer=ScorePool._init_worker, initargs=(state,)) as pool:
+            yield from pool.imap(func, replay_filepaths, chunksize=ScorePool.chunksize)
+
+
+    @staticmethod
+    def __get_settings(cls):
+        # Scoring settings are plain class attributes. Processes that are spawned rather than
+        # forked don't see changes made to them, so they are copied over explicitly.
+        return { name : value for name, value in vars(cls).items() if not name.startswith('_') and type(value) in [ bool, int, float ] }
+
+
+    # The following are run in worker processes. They are looked up by name when
+    # unpickled there, so they can't have name mangled private names.
+
+    @staticmethod
+    def _init_worker(state):
+        ScorePool.__state = state
+
+        cls = StdScoreData if 'ar' in state else ManiaScoreData
+        for name, value in state['settings'].items():
+            setattr(cls, name, value)
+
+
+    @staticmethod
+    def _score_std(replay_filepath):
+        replay      = ReplayIO.open_replay(replay_filepath)
+        replay_data = StdReplayData.get_replay_data(replay.play_data)
+        score_data  = StdScoreData.get_score_data(replay_data, ScorePool.__state['map_data'], ScorePool.__state['ar'], ScorePool.__state['cs'])
+        return replay_filepath, score_data
+
+
+    @staticmethod
+    def _score_mania(replay_filepath):
+        replay      = ReplayIO.open_replay(replay_filepath)
+        replay_data = ManiaActionData.get_replay_data(replay.play_data, ScorePool.__state['keys'])
+        score_data  = ManiaScoreData.get_score_data(ScorePool.__state['map_data'], replay_data)
+        return replay_filepath, score_data
@@ -3,6 +3,7 @@ import pandas as pd
 import math
 import itertools
 
+from osu.local.beatmap.beatmap_cache import BeatmapCache
 from osu.local.hitobject.hitobject import Hitobject
 from osu.local.hitobject.std.std import Std
 from misc.numpy_utils import NumpyUtils
@@ -38,6 +39,7 @@ class StdMapData():
     IDX_Y      = 2
     IDX_TYPE   = 3
     IDX_OBJECT = 4
+    IDX_HITOBJECT = 5  # Only present in map arrays from StdMapData.get_map_array
 
     @staticmethod 
     def std_hitobject_to_aimpoints(std_hitobject, min_press_duration=1):
@@ -69,7 +71,12 @@ class StdMapData():
             more than one. This format is reflected in the groups of 
             [ time, pos ] in the map data
         """
-        # Record data via dictionary to identify unique timings
+        aimpoint_data = StdMapData.__get_aimpoints(std_hitobject, min_press_duration)
+        return pd.DataFrame(aimpoint_data, columns=['time', 'x', 'y', 'type', 'object'])
+
+
+    @staticmethod
+    def __get_aimpoints(std_hitobject, min_press_duration=1):
         aimpoint_data = []
 
         # Hit circle recording
@@ -81,21 +88,107 @@ class StdMapData():
             # Adjust note ending based on whether it is single or hold note (determined via min_press_duration)
             note_end = note_end if (note_end - note_start >= min_press_duration) else (note_start + min_press_duration)
 
-            aimpoint_data.append(np.asarray([ note_start, std_hitobject.pos.x, std_hitobject.pos.y, StdMapData.TYPE_PRESS, StdMapData.TYPE_CIRCLE ]))
-            aimpoint_data.append(np.asarray([ note_end, std_hitobject.pos.x, std_hitobject.pos.y, StdMapData.TYPE_RELEASE, StdMapData.TYPE_CIRCLE ]))
+            aimpoint_data.append([ note_start, std_hitobject.pos.x, std_hitobject.pos.y, StdMapData.TYPE_PRESS, StdMapData.TYPE_CIRCLE ])
+            aimpoint_data.append([ note_end, std_hitobject.pos.x, std_hitobject.pos.y, StdMapData.TYPE_RELEASE, StdMapData.TYPE_CIRCLE ])
         
         # Slider recording
         elif std_hitobject.is_hitobject_type(Hitobject.SLIDER):
             aimpoint_times = std_hitobject.get_aimpoint_times()
+            aimpoint_types = [ StdMapData.TYPE_PRESS ] + [ StdMapData.TYPE_HOLD ]*(len(aimpoint_times) - 2) + [ StdMapData.TYPE_RELEASE ]
 
-            aimpoint_data.append(np.asarray([ aimpoint_times[0], std_hitobject.time_to_pos(aimpoint_times[0]).x, std_hitobject.time_to_pos(aimpoint_times[0]).y, StdMapData.TYPE_PRESS, StdMapData.TYPE_SLIDER ]))
-            if len(aimpoint_times) > 2:
-                for aimpoint_time in aimpoint_times[1:-1]:
-                    aimpoint_data.append(np.asarray([ aimpoint_time, std_hitobject.time_to_pos(aimpoint_time).x, std_hitobject.time_to_pos(aimpoint_time).y, StdMapData.TYPE_HOLD, StdMapData.TYPE_SLIDER ]))
-            aimpoint_data.append(np.asarray([ aimpoint_times[-1], std_hitobject.time_to_pos(aimpoint_times[-1]).x, std_hitobject.time_to_pos(aimpoint_times[-1]).y, StdMapData.TYPE_RELEASE, StdMapData.TYPE_SLIDER ]))
+            aimpoint_positions = std_hitobject.times_to_pos(aimpoint_times).tolist()
 
-        # Convert the dictionary of recorded timings and states into a pandas data
-        return pd.DataFrame(aimpoint_data, columns=['time', 'x', 'y', 'type', 'object'])
+            for aimpoint_time, aimpoint_pos, aimpoint_type in zip(aimpoint_times, aimpoint_positions, aimpoint_types):
+                aimpoint_data.append([ aimpoint_time, aimpoint_pos[0], aimpoint_pos[1], aimpoint_type, StdMapData.TYPE_SLIDER ])
+
+        return aimpoint_data
+
+
+    @staticmethod
+    def get_map_array(std_hitobjects):
+        """
+        .. note::
+            This function is intended to be used directly
+
+        Converts a list of ``Hitobject`` types into a plain numpy array in a single pass.
+        This holds the same data as ``StdMapData.get_map_data``, but the hitobject index is
+        stored as a column instead of being part of a pandas MultiIndex. Aimpoints of a 
+        hitobject are stored next to each other, in hitobject order. All ``StdMapData``
+        accessors accept this array in place of the map data DataFrame.
+
+        Parameters
+        ----------
+        std_hitobjects : Hitobject
+            List of hitobjects to convert
+
+        Returns
+        -------
+        numpy.array
+            Map array representing the following format:
+            ::
+                [
+                    [ time, aimpoint_x, aimpoint_y, type, object, hitobject_idx ],
+                    [ time, aimpoint_x, aimpoint_y, type, object, hitobject_idx ],
+                    ... N aimpoints
+                ]
+        """
+        map_array = []
+        for hitobject_idx, hitobject in enumerate(std_hitobjects):
+            for aimpoint in StdMapData.__get_aimpoints(hitobject):
+                map_array.append(aimpoint + [ hitobject_idx ])
+
+        if len(map_array) == 0:
+            return np.empty((0, 6))
+
+        return np.asarray(map_array, dtype=np.float64)
+
+
+    @staticmethod
+    def get_hitobject_offsets(map_data):
+        """
+        Gets where the aimpoints of each hitobject start in the map data. Aimpoints of the i-th
+        hitobject present in the map data are rows ``offsets[i]`` to ``offsets[i + 1]``.
+
+        Parameters
+        ----------
+        map_data : numpy.array
+            Map data to operate on
+
+        Returns
+        -------
+        numpy.array
+            Row offsets, one more than the number of hitobjects present in the map data
+            ::
+                [ 0, 2, 5, 7, ... N aimpoints ]
+        """
+        hitobject_idxs = StdMapData.hitobject_idxs(map_data)
+        if len(hitobject_idxs) == 0:
+            return np.zeros(1, dtype=np.int64)
+
+        offsets = np.flatnonzero(np.diff(hitobject_idxs)) + 1
+        return np.concatenate(([ 0 ], offsets, [ len(hitobject_idxs) ])).astype(np.int64)
+
+
+    @staticmethod
+    def hitobject_idxs(map_data):
+        """
+        Gets the hitobject index of each aimpoint in the map data
+
+        Parameters
+        ----------
+        map_data : numpy.array
+            Map data to operate on
+
+        Returns
+        -------
+        numpy.array
+            Hitobject indices
+            ::
+                [ idx, idx, idx, ... ]
+        """
+        if isinstance(map_data, np.ndarray):
+            return map_data[:, StdMapData.IDX_HITOBJECT]
+        return map_data.index.get_level_values(0).values
 
 
     @staticmethod
@@ -138,11 +231,55 @@ class StdMapData():
 
                 [109 rows x 3 columns]
         """
-        map_data = []
-        for hitobject in std_hitobjects:
-            map_data.append(StdMapData.std_hitobject_to_aimpoints(hitobject))
+        return StdMapData.array_to_map_data(StdMapData.get_map_array(std_hitobjects))
+
+
+    @staticmethod
+    def array_to_map_data(map_array):
+        """
+        Converts a map array from ``StdMapData.get_map_array`` into the map data DataFrame 
+        returned by ``StdMapData.get_map_data``
+
+        Parameters
+        ----------
+        map_array : numpy.array
+            Map array to convert
+
+        Returns
+        -------
+        pandas.DataFrame
+            Map data
+        """
+        hitobject_idxs = map_array[:, StdMapData.IDX_HITOBJECT].astype(np.int64)
+        offsets = StdMapData.get_hitobject_offsets(map_array)
 
-        return pd.concat(map_data, axis=0, keys=range(len(map_data)), names=[ 'hitobject', 'aimpoint' ])
+        # Position of each aimpoint within its hitobject
+        aimpoint_idxs = np.arange(len(map_array)) - np.repeat(offsets[:-1], np.diff(offsets))
+
+        index = pd.MultiIndex.from_arrays([ hitobject_idxs, aimpoint_idxs ], names=[ 'hitobject', 'aimpoint' ])
+        return pd.DataFrame(map_array[:, :StdMapData.IDX_HITOBJECT], index=index, columns=['time', 'x', 'y', 'type', 'object'])
+
+
+    @staticmethod
+    def get_cached_map_data(beatmap):
+        """
+        Same as ``StdMapData.get_map_data(beatmap.hitobjects)``, but the map array is kept
+        in ``BeatmapCache`` so it's only built once per beatmap.
+
+        Parameters
+        ----------
+        beatmap : Beatmap
+            Beatmap opened with ``BeatmapIO.open_beatmap``
+
+        Returns
+        -------
+        pandas.DataFrame
+            Map data
+        """
+        map_array = BeatmapCache.get_array(beatmap, 'std_map_array', lambda: StdMapData.get_map_array(beatmap.hitobjects))
+
+        # Cached arrays are read only
+        return StdMapData.array_to_map_data(np.array(map_array))
 
 
     @staticmethod
@@ -160,7 +297,15 @@ class StdMapData():
         int
         number of hitobjects in the map
         """
-        return len(np.bincount(map_data.index.get_level_values('hitobject').values.astype(np.int32)))
+        return len(np.bincount(StdMapData.hitobject_idxs(map_data).astype(np.int32)))
+
+
+    @staticmethod
+    def __values(map_data):
+        # Map arrays are already plain numpy arrays
+        if isinstance(map_data, np.ndarray):
+            return map_data
+        return map_data.values
 
 
     @staticmethod
@@ -184,7 +329,7 @@ class StdMapData():
                     ... N aimpoints
                 ]
         """
-        return map_data[map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS]
+        return map_data[StdMapData.__values(map_data)[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS]
 
 
     @staticmethod
@@ -208,7 +353,7 @@ class StdMapData():
                     ... N aimpoints
                 ]
         """
-        return map_data[map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_RELEASE]
+        return map_data[StdMapData.__values(map_data)[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_RELEASE]
 
 
 
@@ -231,11 +376,92 @@ class StdMapData():
                     ... N hitobjects
                 ]
         """
-        return map_data.values[:, StdMapData.IDX_OBJECT][map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS]
+        map_values = StdMapData.__values(map_data)
+        return map_values[:, StdMapData.IDX_OBJECT][map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS]
 
 
     @staticmethod
-    def get_visible_at(map_data, time, ar_ms):
+    def get_time_index(map_data):
+        """
+        Builds a time index for the map data. Time based lookups, like ``get_scorepoint_after``
+        and ``time_slice``, that are given the index find their results by binary search. This
+        makes the cost of the lookup independent of map length, which matters when lookups are
+        done once per replay frame.
+
+        The index needs to be rebuilt if the map data changes.
+
+        Parameters
+        ----------
+        map_data : numpy.array
+            Map data to index
+
+        Returns
+        -------
+        dict
+            ``times`` and ``rows`` hold aimpoint times in sorted order and the map data rows they 
+            come from. ``first_after[i]`` and ``last_before[i]`` are the lowest row among 
+            ``rows[i:]`` and the highest row among ``rows[:i]``, which lets lookups return the same 
+            rows a scan in map data order would. The ``press_`` entries are the same for press
+            aimpoints only. ``press_ordinals`` gives the n-th press of each entry in ``press_times``, 
+            ``release_times`` the release time of the n-th hitobject, and ``max_duration`` the 
+            longest time between a press and its release.
+        """
+        map_values = StdMapData.__values(map_data)
+
+        def build(rows):
+            times = map_values[rows, StdMapData.IDX_TIME]
+            order = np.argsort(times, kind='stable')
+            rows  = rows[order]
+
+            first_after = np.append(np.minimum.accumulate(rows[::-1])[::-1], len(map_values))
+            last_before = np.insert(np.maximum.accumulate(rows), 0, -1) if len(rows) > 0 else np.asarray([ -1 ])
+
+            return times[order], rows, first_after, last_before, order
+
+        times, rows, first_after, last_before, _ = build(np.arange(len(map_values)))
+
+        press_rows   = np.flatnonzero(map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS)
+        release_rows = np.flatnonzero(map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_RELEASE)
+        press_times, press_rows, press_first_after, press_last_before, press_ordinals = build(press_rows)
+
+        release_times = map_values[release_rows, StdMapData.IDX_TIME]
+        durations     = release_times - map_values[np.sort(press_rows), StdMapData.IDX_TIME]
+
+        return {
+            'times'             : times,
+            'rows'              : rows,
+            'first_after'       : first_after,
+            'last_before'       : last_before,
+            'press_times'       : press_times,
+            'press_rows'        : press_rows,
+            'press_first_after' : press_first_after,
+            'press_last_before' : press_last_before,
+            'press_ordinals'    : press_ordinals,
+            'release_times'     : release_times,
+            'max_duration'      : np.max(durations) if len(durations) > 0 else 0,
+        }
+
+
+    @staticmethod
+    def __rows(map_data, rows):
+        # Selects map data rows by position. Consecutive rows are returned as a slice, which is a view for map arrays
+        if len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows):
+            rows = slice(rows[0], rows[-1] + 1)
+
+        if isinstance(map_data, np.ndarray):
+            return map_data[rows]
+        return map_data.iloc[rows]
+
+
+    @staticmethod
+    def __row(map_data, row):
+        if isinstance(map_data, np.ndarray):
+            return map_data[row]
+        return map_data.iloc[row]
+
+
+    @staticmethod
+    def get_visible_at(map_data, time, ar_ms, time_index=None):
         """
         Gets number of hitobjects visible at time `time` given `ar_ms`
 
@@ -250,22 +476,43 @@ class StdMapData():
         ar_ms : int
             AR of map in milliseconds
 
+        time_index : dict
+            Optional time index from ``StdMapData.get_time_index``. If given, the lookup is
+            done by binary search instead of going through the whole map
+
         Returns
         -------
         int
         number of hitobjects in the map
         """
-        releases = StdMapData.get_releases(map_data).values
-        presses  = StdMapData.get_presses(map_data).values
+        if time_index is not None:
+            # Only hitobjects pressed within the longest hitobject duration before the visibility cutoff can still be visible
+            lo = np.searchsorted(time_index['press_times'], time - ar_ms - time_index['max_duration'], side='right')
+            hi = np.searchsorted(time_index['press_times'], time, side='right')
 
-        visible = ((time - ar_ms) < releases[:, StdMapData.IDX_TIME]) & (presses[:, StdMapData.IDX_TIME] <= time)
-        visible = np.arange(len(presses))[visible]
+            visible = time_index['press_ordinals'][lo:hi]
+            visible = np.sort(visible[(time - ar_ms) < time_index['release_times'][visible]])
+        else:
+            releases = StdMapData.__values(StdMapData.get_releases(map_data))
+            presses  = StdMapData.__values(StdMapData.get_presses(map_data))
+
+            visible = ((time - ar_ms) < releases[:, StdMapData.IDX_TIME]) & (presses[:, StdMapData.IDX_TIME] <= time)
+            visible = np.arange(len(presses))[visible]
+
+        if isinstance(map_data, np.ndarray):
+            if time_index is None:
+                return map_data[np.isin(map_data[:, StdMapData.IDX_HITOBJECT], visible)]
+
+            starts = np.searchsorted(map_data[:, StdMapData.IDX_HITOBJECT], visible, side='left')
+            ends   = np.searchsorted(map_data[:, StdMapData.IDX_HITOBJECT], visible, side='right')
+            rows   = np.concatenate([ np.arange(0) ] + [ np.arange(start, end) for start, end in zip(starts, ends) ])
+            return StdMapData.__rows(map_data, rows)
         
         return map_data.loc[visible]
 
 
     @staticmethod
-    def get_scorepoint_before(map_data, time):
+    def get_scorepoint_before(map_data, time, time_index=None):
         """
         Get the closest scorepoint right before the desired point in time
 
@@ -277,6 +524,10 @@ class StdMapData():
         time : int
             Desired point in time
 
+        time_index : dict
+            Optional time index from ``StdMapData.get_time_index``. If given, the lookup is
+            done by binary search instead of going through the whole map
+
         Returns
         -------
         numpy.array
@@ -287,12 +538,23 @@ class StdMapData():
                 type      3.000000
                 Name: (8, 11994.0), dtype: float64
         """
-        try: return map_data[map_data['time'] < time].iloc[-1]
-        except IndexError: return None
+        if time_index is not None:
+            row = time_index['last_before'][np.searchsorted(time_index['times'], time, side='left')]
+            if row < 0 or row >= len(map_data):
+                return None
+            return StdMapData.__row(map_data, row)
+
+        scorepoints = map_data[StdMapData.all_times(map_data) < time]
+        if len(scorepoints) == 0:
+            return None
+
+        if isinstance(map_data, np.ndarray):
+            return scorepoints[-1]
+        return scorepoints.iloc[-1]
 
 
     @staticmethod
-    def get_scorepoint_after(map_data, time):
+    def get_scorepoint_after(map_data, time, time_index=None):
         """
         Get the closest scorepoint right after the desired point in time
 
@@ -304,6 +566,10 @@ class StdMapData():
         time : int
             Desired point in time
 
+        time_index : dict
+            Optional time index from ``StdMapData.get_time_index``. If given, the lookup is
+            done by binary search instead of going through the whole map
+
         Returns
         -------
         numpy.array
@@ -314,8 +580,19 @@ class StdMapData():
                 type      3.000000
                 Name: (8, 11994.0), dtype: float64
         """
-        try: return map_data[map_data['time'] > time].iloc[0]
-        except IndexError: return None
+        if time_index is not None:
+            row = time_index['first_after'][np.searchsorted(time_index['times'], time, side='right')]
+            if row < 0 or row >= len(map_data):
+                return None
+            return StdMapData.__row(map_data, row)
+
+        scorepoints = map_data[StdMapData.all_times(map_data) > time]
+        if len(scorepoints) == 0:
+            return None
+
+        if isinstance(map_data, np.ndarray):
+            return scorepoints[0]
+        return scorepoints.iloc[0]
 
 
     @staticmethod
@@ -337,6 +614,13 @@ class StdMapData():
         int
         Hitobject index following ``idx``, or number of hitobject there are, which ever is smaller
         """
+        if isinstance(map_data, np.ndarray):
+            hitobject_idxs = map_data[:, StdMapData.IDX_HITOBJECT]
+            next_idx = np.searchsorted(hitobject_idxs, idx, side='right')
+            if next_idx >= len(hitobject_idxs):
+                return len(map_data)
+            return min(int(hitobject_idxs[next_idx]), len(map_data))
+
         while True:
             idx += 1
             if idx >= len(map_data): 
@@ -350,7 +634,7 @@ class StdMapData():
         
 
     @staticmethod
-    def get_note_before(map_data, time):
+    def get_note_before(map_data, time, time_index=None):
         """
         Get the closest note right before the desired point in time
 
@@ -362,6 +646,10 @@ class StdMapData():
         time : int
             Desired point in time
 
+        time_index : dict
+            Optional time index from ``StdMapData.get_time_index``. If given, the lookup is
+            done by binary search instead of going through the whole map
+
         Returns
         -------
         numpy.array
@@ -372,17 +660,27 @@ class StdMapData():
                 1494.0  256.0  192.0   1.0
                 1495.0  256.0  192.0   3.0
         """
-        try:
-            # Type == Press is needed to handle overlapping sliders
-            before_filter = map_data['time'] < time
-            press_filter  = map_data['type'] == StdMapData.TYPE_PRESS
-            idx = map_data[before_filter & press_filter].index[-1][0]
-            return map_data.loc[idx]
-        except IndexError: return None
+        if time_index is not None:
+            row = time_index['press_last_before'][np.searchsorted(time_index['press_times'], time, side='left')]
+            if row < 0:
+                return None
+            return StdMapData.get_hitobject(map_data, StdMapData.hitobject_idxs(map_data)[row])
+
+        map_values = StdMapData.__values(map_data)
+
+        # Type == Press is needed to handle overlapping sliders
+        before_filter = map_values[:, StdMapData.IDX_TIME] < time
+        press_filter  = map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS
+
+        idxs = StdMapData.hitobject_idxs(map_data)[before_filter & press_filter]
+        if len(idxs) == 0:
+            return None
+
+        return StdMapData.get_hitobject(map_data, idxs[-1])
 
 
     @staticmethod
-    def get_note_after(map_data, time):
+    def get_note_after(map_data, time, time_index=None):
         """
         Get the closest note right after the desired point in time
 
@@ -394,6 +692,10 @@ class StdMapData():
         time : int
             Desired point in time
 
+        time_index : dict
+            Optional time index from ``StdMapData.get_time_index``. If given, the lookup is
+            done by binary search instead of going through the whole map
+
         Returns
         -------
         numpy.array
@@ -404,13 +706,51 @@ class StdMapData():
                 1494.0  256.0  192.0   1.0
                 1495.0  256.0  192.0   3.0
         """
-        try:
-            # Type == Press is needed to handle overlapping sliders
-            after_filter = map_data['time'] > time
-            press_filter = map_data['type'] == StdMapData.TYPE_PRESS
-            idx = map_data[after_filter & press_filter].index[0][0]
-            return map_data.loc[idx]
-        except IndexError: return None
+        if time_index is not None:
+            row = time_index['press_first_after'][np.searchsorted(time_index['press_times'], time, side='right')]
+            if row >= len(map_data):
+                return None
+            return StdMapData.get_hitobject(map_data, StdMapData.hitobject_idxs(map_data)[row])
+
+        map_values = StdMapData.__values(map_data)
+
+        # Type == Press is needed to handle overlapping sliders
+        after_filter = map_values[:, StdMapData.IDX_TIME] > time
+        press_filter = map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS
+
+        idxs = StdMapData.hitobject_idxs(map_data)[after_filter & press_filter]
+        if len(idxs) == 0:
+            return None
+
+        return StdMapData.get_hitobject(map_data, idxs[0])
+
+
+    @staticmethod
+    def get_hitobject(map_data, idx):
+        """
+        Gets the aimpoints of the hitobject at index ``idx``
+
+        Parameters
+        ----------
+        map_data : numpy.array
+            Map data to operate on
+
+        idx : int
+            Hitobject index
+
+        Returns
+        -------
+        numpy.array
+            Aimpoints of the hitobject. For map arrays this is a view into ``map_data``
+        """
+        if isinstance(map_data, np.ndarray):
+            # Hitobject indices are in ascending order, so the aimpoints can be found by binary search
+            hitobject_idxs = map_data[:, StdMapData.IDX_HITOBJECT]
+            start = np.searchsorted(hitobject_idxs, idx, side='left')
+            end   = np.searchsorted(hitobject_idxs, idx, side='right')
+            return map_data[start:end]
+
+        return map_data.loc[idx]
 
 
     @staticmethod
@@ -431,7 +771,8 @@ class StdMapData():
                 [ time, time, time, ... ]
             
         """
-        return map_data.values[map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS][:, StdMapData.IDX_TIME]
+        map_values = StdMapData.__values(map_data)
+        return map_values[map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS][:, StdMapData.IDX_TIME]
 
 
     @staticmethod
@@ -455,7 +796,8 @@ class StdMapData():
                 [ time, time, time, ... ]
             
         """
-        return map_data.values[map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_RELEASE][:, StdMapData.IDX_TIME]
+        map_values = StdMapData.__values(map_data)
+        return map_values[map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_RELEASE][:, StdMapData.IDX_TIME]
 
 
     @staticmethod
@@ -476,11 +818,11 @@ class StdMapData():
                 [ time, time, time, ... ]
             
         """
-        return map_data.values[:, StdMapData.IDX_TIME]
+        return StdMapData.__values(map_data)[:, StdMapData.IDX_TIME]
 
 
     @staticmethod
-    def time_slice(map_data, start_time, end_time, exclusive=True):
+    def time_slice(map_data, start_time, end_time, exclusive=True, time_index=None):
         """
         Gets a list of hitobjects data that occurs between ``start_time`` and ``end_time``
 
@@ -495,6 +837,13 @@ class StdMapData():
         end_time : int
             Ending time for the slice of data
 
+        exclusive : bool
+            Whether scorepoints at ``start_time`` and ``end_time`` are left out
+
+        time_index : dict
+            Optional time index from ``StdMapData.get_time_index``. If given, the lookup is
+            done by binary search instead of going through the whole map
+
         Returns
         -------
         numpy.array
@@ -507,6 +856,11 @@ class StdMapData():
                 ]
             
         """
+        if time_index is not None:
+            lo = np.searchsorted(time_index['times'], start_time, side='right' if exclusive else 'left')
+            hi = np.searchsorted(time_index['times'], end_time, side='left' if exclusive else 'right')
+            return StdMapData.__rows(map_data, np.sort(time_index['rows'][lo:max(lo, hi)]))
+
         all_times = StdMapData.all_times(map_data)
         if exclusive:
             time_slice = (start_time < all_times) & (all_times < end_time)
@@ -538,7 +892,8 @@ class StdMapData():
                 ]
             
         """
-        presses = map_data.values[map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS]
+        map_values = StdMapData.__values(map_data)
+        presses = map_values[map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS]
         return presses[:, StdMapData.IDX_X], presses[:, StdMapData.IDX_Y]
 
     
@@ -567,7 +922,8 @@ class StdMapData():
                 ]
             
         """
-        releases = map_data.values[map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_RELEASE]
+        map_values = StdMapData.__values(map_data)
+        releases = map_values[map_values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_RELEASE]
         return releases[:, StdMapData.IDX_X], releases[:, StdMapData.IDX_Y]
 
 
@@ -592,4 +948,5 @@ class StdMapData():
                     ... 
                 ]
         """
-        return map_data.values[:, StdMapData.IDX_X], map_data.values[:, StdMapData.IDX_Y]
\ No newline at end of file
+        map_values = StdMapData.__values(map_data)
+        return map_values[:, StdMapData.IDX_X], map_values[:, StdMapData.IDX_Y]
\ No newline at end of file
@@ -431,29 +431,57 @@ class StdMapMetrics():
     Advanced metrics
     '''
     @staticmethod
-    def calc_rhythmic_complexity(map_data=[]):
-        def calc_harmonic(prev_note_interval, curr_note_interval, target_time, v_scale):
-            if prev_note_interval == 0: print('WARNING: 0 note interval detected at ', target_time, ' ms')
+    def calc_rhythmic_complexity(map_data=[], speed_factor=600.0, v_factor=10.0, decay_factor=0.005):
+        """
+        Gets how complex the rhythm is up to each note. Each note adds a harmonic based on how its 
+        interval compares to the previous note's interval, weakened the longer its interval is. The
+        harmonics are summed up to each note and scaled by how fast that note is.
 
-            return -(v_scale/2)*math.cos((2*math.pi)/prev_note_interval*curr_note_interval) + (v_scale/2)
+        Any of the factors can be arrays to calculate the complexity for many factor values at once.
 
-        def decay(interval, decay_factor):
-            return math.exp(-decay_factor*interval)
+        Parameters
+        ----------
+        map_data : numpy.array
+            Hitobject data from ``StdMapData.get_aimpoint_data``
 
-        def speed(interval, speed_factor):
-            return speed_factor/interval
+        speed_factor : float or numpy.array
+            Scale of the note speed (1/interval) the summed harmonics are multiplied by
 
-        def calc_note(time, curr_interval, prev_interval, decay_factor, v_scale):
-            return decay(curr_interval, decay_factor) * calc_harmonic(prev_interval, curr_interval, time, v_scale)
+        v_factor : float or numpy.array
+            Max value of a harmonic
 
-        speed_factor = 600.0
-        v_factor     = 10.0
-        decay_factor = 0.005
+        decay_factor : float or numpy.array
+            How fast harmonics weaken with longer intervals
+
+        Returns
+        -------
+        (numpy.array, numpy.array)
+            Tuple of ``(times, complexity)``. ``times`` are hitobject timings. ``complexity`` is the rhythmic 
+            complexity at those times. If any of the factors are arrays, ``complexity`` has trailing axes 
+            of their broadcasted shape.
+        """
+        speed_factor, v_factor, decay_factor = np.broadcast_arrays(speed_factor, v_factor, decay_factor)
 
         time, intervals = StdMapMetrics.calc_tapping_intervals(map_data)
-        harmonics = [ calc_note(time[i], intervals[i], intervals[i - 1], decay_factor, v_factor) for i in range(1, len(intervals)) ]
 
-        return time, [ sum(harmonics[:i])*speed(intervals[i], speed_factor) for i in range(0, len(intervals)) ]
+        for target_time in time[1:][intervals[:-1] == 0]:
+            print('WARNING: 0 note interval detected at ', target_time, ' ms')
+
+        # Factors are along trailing axes
+        intervals = np.asarray(intervals, dtype=np.float64).reshape((-1, ) + (1, )*speed_factor.ndim)
+
+        prev_intervals = intervals[:-1]
+        curr_intervals = intervals[1:]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            harmonics = -(v_factor/2)*np.cos((2*np.pi)/prev_intervals*curr_intervals) + (v_factor/2)
+            harmonics = np.exp(-decay_factor*curr_intervals)*harmonics
+
+            # Sum of the harmonics before each note
+            harmonic_sums = np.zeros(np.broadcast(intervals, speed_factor).shape)
+            np.cumsum(harmonics[:len(intervals) - 1], axis=0, out=harmonic_sums[1:])
+
+            return time, harmonic_sums*(speed_factor/intervals)
 
 
     @staticmethod
@@ -5,6 +5,7 @@ import time
 
 from osu.local.hitobject.hitobject import Hitobject
 from osu.local.hitobject.std.std import Std
+from osu.local.replay.replay_frames import ReplayFrames
 from misc.numpy_utils import NumpyUtils
 
 
@@ -25,6 +26,11 @@ class StdReplayData():
     HOLD    = 2  # Finger must keep imparting force to keep key down
     RELEASE = 3  # Finger must depart force to unpress key
 
+    # Indices of the fields of resampled replay data
+    IDX_X = 0
+    IDX_Y = 1
+    IDX_K = 2
+
     @staticmethod 
     def get_replay_data(replay_events):
         """
@@ -48,41 +54,73 @@ class StdReplayData():
                     ...  N events
                 ]
         """
-        replay_data = {}
+        if isinstance(replay_events, ReplayFrames):
+            return StdReplayData.get_replay_data_from_arrays(replay_events.t, replay_events.x, replay_events.y, replay_events.keys)
 
-        # Previous state of whether finger is holding key down
-        hold_state = np.asarray([ False for _ in range(5) ])
+        num_events = len(replay_events)
+
+        replay_t    = np.fromiter((replay_event.t for replay_event in replay_events), dtype=np.int64, count=num_events)
+        replay_x    = np.fromiter((replay_event.x for replay_event in replay_events), dtype=np.float64, count=num_events)
+        replay_y    = np.fromiter((replay_event.y for replay_event in replay_events), dtype=np.float64, count=num_events)
+        replay_keys = np.fromiter((replay_event.keys_pressed for replay_event in replay_events), dtype=np.int64, count=num_events)
+
+        return StdReplayData.get_replay_data_from_arrays(replay_t, replay_x, replay_y, replay_keys)
+
+
+    @staticmethod
+    def get_replay_data_from_arrays(replay_t, replay_x, replay_y, replay_keys):
+        """
+        Gets replay data from replay events that are already split into arrays. 
+        Same as ``StdReplayData.get_replay_data``, but skips going through each ``ReplayEvent``.
+
+        Parameters
+        ----------
+        replay_t : numpy.array
+            Time of each replay event
 
-        m1_mask    = (1 << 0)
-        m2_mask    = (1 << 1)
-        k1_mask    = (1 << 2)
-        k2_mask    = (1 << 3)
-        smoke_mask = (1 << 4)
+        replay_x : numpy.array
+            Cursor x position of each replay event
 
-        for replay_event in replay_events:
-            k1_pressed    = ((replay_event.keys_pressed & k1_mask) > 0)
-            k2_pressed    = ((replay_event.keys_pressed & k2_mask) > 0) 
-            m1_pressed    = ((replay_event.keys_pressed & m1_mask) > 0)
-            m2_pressed    = ((replay_event.keys_pressed & m2_mask) > 0)
-            smoke_pressed = (replay_event.keys_pressed & smoke_mask) > 0
+        replay_y : numpy.array
+            Cursor y position of each replay event
 
-            is_key_hold = np.asarray([ m1_pressed, m2_pressed, k1_pressed, k2_pressed, smoke_pressed ])
+        replay_keys : numpy.array
+            Key press bit flags of each replay event (m1, m2, k1, k2, smoke)
+        
+        Returns
+        -------
+        pandas.DataFrame
+            Replay data in the same format as ``StdReplayData.get_replay_data``
+        """
+        replay_t    = np.asarray(replay_t, dtype=np.int64)
+        replay_keys = np.asarray(replay_keys, dtype=np.int64)
+
+        # Whether finger is holding key down for m1, m2, k1, k2, smoke (bits 0 through 4)
+        is_key_hold = ((replay_keys[:, None] >> np.arange(5)) & 1).astype(bool)
 
-            data = np.asarray([ StdReplayData.FREE for _ in range(5) ])
-            data[~hold_state &  is_key_hold] = StdReplayData.PRESS
-            data[ hold_state &  is_key_hold] = StdReplayData.HOLD
-            data[ hold_state & ~is_key_hold] = StdReplayData.RELEASE
+        # Previous state of whether finger is holding key down
+        hold_state = np.zeros_like(is_key_hold)
+        hold_state[1:] = is_key_hold[:-1]
 
-            # Handles autoplay key press & release occuring at same time
-            replay_time = replay_event.t
-            while replay_time in replay_data: replay_time +=1
+        data = np.full(is_key_hold.shape, StdReplayData.FREE, dtype=np.int64)
+        data[~hold_state &  is_key_hold] = StdReplayData.PRESS
+        data[ hold_state &  is_key_hold] = StdReplayData.HOLD
+        data[ hold_state & ~is_key_hold] = StdReplayData.RELEASE
 
-            replay_data[replay_time] = [ replay_time, replay_event.x, replay_event.y ] + list(data)
-            hold_state = is_key_hold
+        # Handles autoplay key press & release occuring at same time
+        replay_t = NumpyUtils.bump_duplicates(replay_t)
+        order    = np.argsort(replay_t, kind='stable')
 
-        replay_data = list(replay_data.values())
-        replay_data.sort(key=lambda x: x[0])
-        return pd.DataFrame(replay_data, columns=[ 'time', 'x', 'y', 'm1', 'm2', 'k1', 'k2', 'smoke' ])
+        replay_data = pd.DataFrame({
+            'time' : replay_t[order],
+            'x'    : np.asarray(replay_x, dtype=np.float64)[order],
+            'y'    : np.asarray(replay_y, dtype=np.float64)[order],
+        })
+
+        for i, key in enumerate([ 'm1', 'm2', 'k1', 'k2', 'smoke' ]):
+            replay_data[key] = data[order, i]
+
+        return replay_data
 
 
     @staticmethod
@@ -155,51 +193,50 @@ class StdReplayData():
         numpy.array
         Reduced replay data
         """
-        # Score data that will be filled in and returned
-        new_data = {}
+        replay_data = StdReplayData.__reduce_replay_data(replay_data).values.astype(np.float64)
+        replay_keys = replay_data[:, 3:7].astype(np.int64)
 
-        # Number of things to loop through
-        replay_data = StdReplayData.__reduce_replay_data(replay_data).values
-        num_replay_events = len(replay_data)
+        # The merged key state only depends on the previous merged state and on the 4 key states, so
+        # work out the transitions for each distinct combination of key states there is in the replay
+        states = np.asarray([ StdReplayData.FREE, StdReplayData.PRESS, StdReplayData.HOLD, StdReplayData.RELEASE ])
 
-        # replay pointer
-        replay_idx = 0
+        # Each key is in one of 4 states, so a combination of key states fits in a base 4 number
+        key_codes  = replay_keys @ (len(states)**np.arange(4))
+        key_combos = np.nonzero(np.bincount(key_codes, minlength=len(states)**4))[0]
 
-        # Key state
-        key_state = StdReplayData.FREE
+        transitions = np.zeros((len(states)**4, len(states)), dtype=np.int64)
+        for key_code in key_combos:
+            keys = (key_code // len(states)**np.arange(4)) % len(states)
+            transitions[key_code] = [ StdReplayData.__get_key_state(key_state, keys, press_block, release_block) for key_state in states ]
 
-        # Go through replay events
-        while True:
-            # Condition check whether all replay frames processed
-            if replay_idx >= num_replay_events: break
+        new_key_states = transitions[key_codes]
 
-            # Data for this event frame
-            replay_time = replay_data[replay_idx][0]    # time
-            replay_xpos = replay_data[replay_idx][1]    # x
-            replay_ypos = replay_data[replay_idx][2]    # y
-            replay_keys = replay_data[replay_idx][3:7]  # keys
+        # It's possible to trigger two PRESSES/RELEASES in a row if left/right keys happen to press/release one frame after another
+        # If we get two presses in a row, then it's effectively a HOLD
+        next_key_states = new_key_states.copy()
+        from_press      = next_key_states[:, StdReplayData.PRESS]
+        from_press[from_press == StdReplayData.PRESS] = StdReplayData.HOLD
 
-            new_key_state = StdReplayData.__get_key_state(key_state, replay_keys, press_block, release_block)
+        # Key state going into each replay frame
+        key_states = NumpyUtils.scan_states(next_key_states, StdReplayData.FREE)
 
-            # Got all info at current index, now advance it
-            replay_idx += 1
+        frame_idxs = np.arange(len(replay_data))
+        new_key_state = new_key_states[frame_idxs, key_states]
+        out_key_state = next_key_states[frame_idxs, key_states]
 
-            if key_state != new_key_state:
-                if key_state == StdReplayData.HOLD and new_key_state == StdReplayData.PRESS:
-                    new_data[len(new_data)] = np.asarray([ replay_time - 1, replay_xpos, replay_ypos, StdReplayData.RELEASE ])
+        # Going from a HOLD straight into a PRESS needs a RELEASE right before the PRESS
+        is_rehold = (key_states == StdReplayData.HOLD) & (new_key_state == StdReplayData.PRESS)
+        out_idxs  = frame_idxs + np.cumsum(is_rehold)
 
-            # It's possible to trigger two PRESSES/RELEASES in a row if left/right keys happen to press/release one frame after another
-            if key_state == StdReplayData.PRESS and new_key_state == StdReplayData.PRESS:
-                # If we get two presses in a row, then it's effectively a HOLD
-                key_state = StdReplayData.HOLD
-                new_key_state = StdReplayData.HOLD
-            else:
-                key_state = new_key_state
+        new_data = np.empty((len(replay_data) + np.count_nonzero(is_rehold), 4), dtype=np.float64)
+        new_data[out_idxs, :3] = replay_data[:, :3]
+        new_data[out_idxs,  3] = out_key_state
 
-            new_data[len(new_data)] = np.asarray([ replay_time, replay_xpos, replay_ypos, new_key_state ])
+        new_data[out_idxs[is_rehold] - 1, :3] = replay_data[is_rehold, :3]
+        new_data[out_idxs[is_rehold] - 1,  0] -= 1
+        new_data[out_idxs[is_rehold] - 1,  3] = StdReplayData.RELEASE
 
         # Convert recorded timings and states into a pandas data
-        new_data = list(new_data.values())
         return pd.DataFrame(new_data, columns=[ 'time', 'x', 'y', 'k' ])
 
 
@@ -246,4 +283,75 @@ class StdReplayData():
         Release timings
         """
         btn_data = replay_data[btn]
-        return replay_data['time'][np.any(btn_data == StdReplayData.RELEASE, 1)]
\ No newline at end of file
+        return replay_data['time'][np.any(btn_data == StdReplayData.RELEASE, 1)]
+
+
+    @staticmethod
+    def get_resampled_data(replay_data_list, dt=1, start_time=None, end_time=None, filepath=None):
+        """
+        Projects replays onto a shared time grid of uniform steps, so the replays can be compared to
+        each other timestep by timestep. Cursor positions are linearly interpolated between frames, 
+        and the key state is the one of the latest frame at or before each timestep.
+
+        Parameters
+        ----------
+        replay_data_list : list
+            List of replay data from ``StdReplayData.get_replay_data``
+
+        dt : float
+            Time (ms) between timesteps
+
+        start_time : float
+            Time of the first timestep. Defaults to the time of the earliest frame of all replays
+
+        end_time : float
+            Time past which there are no timesteps. Defaults to the time of the latest frame of all replays
+
+        filepath : str
+            If given, the array is memory-mapped to this *.npy file instead of held in memory. Use this for
+            arrays that don't fit in memory. It can be opened again later with ``np.load(filepath, mmap_mode='r')``
+
+        Returns
+        -------
+        tuple
+            Times of the timesteps and ``(replays, timesteps, fields)`` float32 array. Fields are indexed by 
+            ``StdReplayData.IDX_X``, ``StdReplayData.IDX_Y``, and ``StdReplayData.IDX_K``. The key field is 1 if
+            any of m1, m2, k1, k2 is held down and 0 otherwise. Timesteps outside of a replay's frames are ``nan``.
+            The i-th replay is at index i, and replays with no frames are all ``nan``
+            ::
+                ( times, data )
+        """
+        # Empty replays have no times to go by, but still get their row
+        nonempty_list = [ replay_data for replay_data in replay_data_list if len(replay_data) > 0 ]
+
+        if start_time is None:
+            start_time = min((replay_data['time'].values[0] for replay_data in nonempty_list), default=0)
+        if end_time is None:
+            end_time = max((replay_data['time'].values[-1] for replay_data in nonempty_list), default=start_time - dt)
+
+        num_timesteps = max(int(np.floor((end_time - start_time)/dt)) + 1, 0)
+        times = start_time + dt*np.arange(num_timesteps)
+
+        shape = (len(replay_data_list), num_timesteps, 3)
+        if filepath is None:
+            resampled_data = np.empty(shape, dtype=np.float32)
+        else:
+            resampled_data = np.lib.format.open_memmap(filepath, mode='w+', dtype=np.float32, shape=shape)
+
+        for i, replay_data in enumerate(replay_data_list):
+            if len(replay_data) == 0:
+                resampled_data[i] = np.nan
+                continue
+
+            replay_times = replay_data['time'].values
+            is_held = np.any(np.isin(replay_data[[ 'm1', 'm2', 'k1', 'k2' ]].values, [ StdReplayData.PRESS, StdReplayData.HOLD ]), 1)
+
+            # Latest frame at or before each timestep
+            frame_idxs = np.searchsorted(replay_times, times, side='right') - 1
+            is_outside = (frame_idxs < 0) | (times > replay_times[-1])
+
+            resampled_data[i, :, StdReplayData.IDX_X] = np.interp(times, replay_times, replay_data['x'].values, left=np.nan, right=np.nan)
+            resampled_data[i, :, StdReplayData.IDX_Y] = np.interp(times, replay_times, replay_data['y'].values, left=np.nan, right=np.nan)
+            resampled_data[i, :, StdReplayData.IDX_K] = np.where(is_outside, np.nan, is_held[np.maximum(frame_idxs, 0)])
+
+        return times, resampled_data
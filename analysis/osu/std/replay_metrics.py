@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 
 from misc.geometry import *
 from misc.numpy_utils import NumpyUtils
@@ -185,6 +186,75 @@ class StdReplayMetrics():
         return times[1:], dax/dt, day/dt
 
 
+    @staticmethod
+    def resampled_cursor_vel(times, resampled_data):
+        """
+        Parametric cursor velocity of all replays at once
+
+        Parameters
+        ----------
+        times : numpy.array
+            Times of the timesteps
+
+        resampled_data : numpy.array
+            Replay data from ``StdReplayData.get_resampled_data``
+
+        Returns
+        -------
+        tuple
+            A pair of time and ``(replays, timesteps - 1, [ vel_x, vel_y ])`` velocity data
+            ::
+                ( times, vel )
+        """
+        return StdReplayMetrics.__resampled_cursor_diff(times, resampled_data, 1)
+
+
+    @staticmethod
+    def resampled_cursor_accel(times, resampled_data):
+        """
+        Parametric cursor acceleration of all replays at once
+
+        Parameters
+        ----------
+        times : numpy.array
+            Times of the timesteps
+
+        resampled_data : numpy.array
+            Replay data from ``StdReplayData.get_resampled_data``
+
+        Returns
+        -------
+        tuple
+            A pair of time and ``(replays, timesteps - 2, [ accel_x, accel_y ])`` acceleration data
+            ::
+                ( times, accel )
+        """
+        return StdReplayMetrics.__resampled_cursor_diff(times, resampled_data, 2)
+
+
+    @staticmethod
+    def resampled_cursor_jerk(times, resampled_data):
+        """
+        Parametric cursor jerk of all replays at once
+
+        Parameters
+        ----------
+        times : numpy.array
+            Times of the timesteps
+
+        resampled_data : numpy.array
+            Replay data from ``StdReplayData.get_resampled_data``
+
+        Returns
+        -------
+        tuple
+            A pair of time and ``(replays, timesteps - 3, [ jerk_x, jerk_y ])`` jerk data
+            ::
+                ( times, jerk )
+        """
+        return StdReplayMetrics.__resampled_cursor_diff(times, resampled_data, 3)
+
+
     @staticmethod
     def press_intervals(replay_data):
         """
@@ -210,53 +280,103 @@ class StdReplayMetrics():
 
 
     @staticmethod
-    def avg_cursor_pos(replay_data_list):
+    def avg_cursor_pos(replay_data_list, bucket_width=16, window=16):
         """
         Takes all replays and determines average cursor position throughout all points in time
-        Cursor positions are averaged across a moving average of 16 ms
+        Cursor positions are averaged across a moving window that ends at each bucket's time
+
+        Frames of all replays are binned by ms and the sums of positions within each window are 
+        taken from cumulative sums of the bins, so frames are only gone through once regardless 
+        of the number of buckets or replays. Frame times are taken at 1 ms resolution.
 
         Parameters
         ----------
-        replay_data_list : numpy.array
+        replay_data_list : list
             List of replay datas
 
+        bucket_width : int
+            Time (ms) between the buckets to average cursor positions at
+
+        window : int
+            Duration (ms) of frames leading up to each bucket's time to average
+
         Returns
         -------
-        tuple
-            Averaged cursor position data
+        numpy.array
+            Averaged cursor position data and the variance of cursor positions of each bucket. 
+            Buckets that have no frames are NaN
             ::
                 [
-                    ( times, pos_x, pos_y ),
-                    ( times, pos_x, pos_y ),
+                    [ time, avg_x, avg_y, var_x, var_y ],
+                    [ time, avg_x, avg_y, var_x, var_y ],
                     ...
                 ]
         """
-        #print('Flattening arrays')
+        # Flatten all the replays into arrays of frame times and positions
+        replay_times, pos_x, pos_y = [], [], []
+        for replay_data in replay_data_list:
+            replay_data = replay_data.iloc[:, :3] if isinstance(replay_data, pd.DataFrame) else pd.DataFrame(np.asarray(replay_data)[:, :3])
+
+            replay_times.append(replay_data.iloc[:, 0].values)
+            pos_x.append(replay_data.iloc[:, 1].values)
+            pos_y.append(replay_data.iloc[:, 2].values)
+
+        if sum(len(times) for times in replay_times) == 0:
+            return np.empty((0, 5))
+
+        replay_times = np.concatenate(replay_times)
+        pos_x = np.concatenate(pos_x).astype(np.float64)
+        pos_y = np.concatenate(pos_y).astype(np.float64)
+
+        times = np.arange(window, int(np.amax(replay_times)), bucket_width)
+        if len(times) == 0:
+            return np.empty((0, 5))
 
-        # Flatten all the replays into a list of frames
-        replay_numpy_list = []
-        for replay in replay_data_list:
-            replay_numpy_list += replay
-        replay_numpy_list = np.asarray(replay_numpy_list)
+        # Frames are binned by ms from the start of the first window up to the last bucket's time.
+        # Frames outside of that go in an extra bin on either side, which are dropped.
+        first_time = times[0] - window
+        num_bins   = times[-1] - first_time + 1
 
-        replay_times = replay_numpy_list[:, StdReplayData.TIME]
-        data = []
+        frame_idxs = np.floor(replay_times).astype(np.int64) if replay_times.dtype.kind == 'f' else replay_times.astype(np.int64)
+        frame_idxs = np.clip(frame_idxs - first_time, -1, num_bins) + 1
 
-        #print('Flattened arrays')
+        def bin_sums(weights=None):
+            return np.bincount(frame_idxs, weights=weights, minlength=num_bins + 2)[1:-1]
 
-        # Moving average with 16 ms window
-        AVG_WINDOW = 16
+        def window_sums(bin_sums):
+            cumsum = np.concatenate(([ 0 ], np.cumsum(bin_sums)))
 
-        # Iterate through time
-        for t in range(AVG_WINDOW, int(np.amax(replay_times)), 16):
-            # Get the duration window of replay frames to average
-            filtered_range = np.where(np.logical_and(t - AVG_WINDOW <= replay_times, replay_times <= t))
+            # Frames within t - window <= time <= t for each bucket time t
+            return cumsum[times - first_time + 1] - cumsum[times - window - first_time]
 
-            # Average the cursor positions in the duration window
-            avg_x = np.mean(replay_numpy_list[filtered_range][:, StdReplayData.XPOS])
-            avg_y = np.mean(replay_numpy_list[filtered_range][:, StdReplayData.YPOS])
+        bin_counts = bin_sums()
+        bin_sums_x = bin_sums(pos_x)
+        bin_sums_y = bin_sums(pos_y)
+
+        # Squares are taken relative to the overall average to keep them precise
+        center_x = np.sum(bin_sums_x)/max(np.sum(bin_counts), 1)
+        center_y = np.sum(bin_sums_y)/max(np.sum(bin_counts), 1)
+
+        bin_sq_sums_x = bin_sums((pos_x - center_x)**2)
+        bin_sq_sums_y = bin_sums((pos_y - center_y)**2)
+
+        counts = window_sums(bin_counts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_x = window_sums(bin_sums_x)/counts
+            avg_y = window_sums(bin_sums_y)/counts
+            var_x = np.maximum(window_sums(bin_sq_sums_x)/counts - (avg_x - center_x)**2, 0)
+            var_y = np.maximum(window_sums(bin_sq_sums_y)/counts - (avg_y - center_y)**2, 0)
+
+        return np.column_stack((times, avg_x, avg_y, var_x, var_y))
+
+
+    @staticmethod
+    def __resampled_cursor_diff(times, resampled_data, order):
+        if len(times) <= order: 
+            return times[:0], np.empty((len(resampled_data), 0, 2), dtype=np.float32)
 
-            data.append([t, avg_x, avg_y])
-            #print(data[-1])
+        # Timesteps are uniform, so each derivative is the difference between timesteps over the step
+        dt  = float(times[1] - times[0])
+        pos = resampled_data[:, :, [ StdReplayData.IDX_X, StdReplayData.IDX_Y ]]
 
-        return np.asarray(data)
+        return times[order:], np.diff(pos, n=order, axis=1)/dt**order
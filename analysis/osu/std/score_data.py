@@ -38,10 +38,25 @@ class StdScoreData():
     TYPE_MISS  = 3  # A miss has a hitobject associated with it, but not offset
     TYPE_EMPTY = 4  # An empty has neither hitobject nor offset associated with it
 
-    DATA_OFFSET  = 0 
+    DATA_OFFSET  = 0
     DATA_TYPE    = 1
     DATA_MAP_IDX = 2
 
+    ENGINE_FRAME = 0  # Scoring processor walks through the replay frame by frame
+    ENGINE_ARRAY = 1  # Scoring processor resolves judgements note by note using numpy arrays
+
+    IDX_REPLAY_T = 0
+    IDX_MAP_T    = 1
+    IDX_REPLAY_X = 2
+    IDX_REPLAY_Y = 3
+    IDX_MAP_X    = 4
+    IDX_MAP_Y    = 5
+    IDX_TYPE     = 6
+    IDX_ACTION   = 7
+    IDX_MAP_IDX  = 8
+
+    COLUMNS = [ 'replay_t', 'map_t', 'replay_x', 'replay_y', 'map_x', 'map_y', 'type', 'action', 'map_idx' ]
+
     '''
     The following must be true:
         0 < pos_hit_range < pos_hit_miss_range < inf
@@ -166,21 +181,28 @@ class StdScoreData():
     """
     release_block = False
 
+    """
+    Scoring engine used by get_score_data. ENGINE_FRAME is the reference implementation. ENGINE_ARRAY
+    produces the same judgements for hitobjects that don't overlap in time, but does it without going
+    through each replay frame. See get_score_data_array for where the two differ.
+    """
+    engine = ENGINE_FRAME
+
 
     @staticmethod
-    def __adv(map_data, map_time, adv):
+    def __adv(map_data, map_time, adv, time_index=None):
         if adv == StdScoreData.__ADV_NOP:
             return map_time
 
         if adv == StdScoreData.__ADV_AIMP:
-            aimpoint = StdMapData.get_scorepoint_after(map_data, map_time)
+            aimpoint = StdMapData.get_scorepoint_after(map_data, map_time, time_index)
             if type(aimpoint) == type(None): 
                 return StdMapData.all_times(map_data)[-1] + 1
             
             return aimpoint['time']
 
         if adv == StdScoreData.__ADV_NOTE:
-            note = StdMapData.get_note_after(map_data, map_time)
+            note = StdMapData.get_note_after(map_data, map_time, time_index)
             if type(note) == type(None):
                 return StdMapData.all_times(map_data)[-1] + 1
             return note['time'][0]
@@ -443,6 +465,9 @@ class StdScoreData():
 
     @staticmethod
     def get_score_data(replay_data, map_data, ar=8, cs=4):
+        if StdScoreData.engine == StdScoreData.ENGINE_ARRAY:
+            return StdScoreData.get_score_data_array(replay_data, map_data, ar, cs)
+
         # Score data that will be filled in and returned
         score_data = {}
 
@@ -452,6 +477,9 @@ class StdScoreData():
         # map_time is the time at which hitobject processing logic is at
         map_time = StdMapData.all_times(map_data)[0]
 
+        # Map lookups are done every replay frame
+        time_index = StdMapData.get_time_index(map_data)
+
         # Number of things to loop through
         replay_data = StdReplayData.get_reduced_replay_data(replay_data, press_block=StdScoreData.press_block, release_block=StdScoreData.release_block).values
         num_replay_events = len(replay_data)
@@ -480,7 +508,7 @@ class StdScoreData():
                 end_time   = max(map_time, replay_time + Std.ar_to_ms(ar))
 
                 # Get visible notes at current time
-                visible_notes = StdMapData.time_slice(map_data, start_time, end_time)
+                visible_notes = StdMapData.time_slice(map_data, start_time, end_time, time_index=time_index)
 
                 if len(visible_notes) == 0: break
                 if replay_time <= map_time: break
@@ -488,22 +516,356 @@ class StdScoreData():
                 # Check for any skipped notes (if replay has event gaps)
                 adv = StdScoreData.__process_free(score_data, visible_notes, replay_time, replay_xpos, replay_ypos)
                 if adv == StdScoreData.__ADV_NOP: break
-                map_time = StdScoreData.__adv(map_data, map_time, adv)
+                map_time = StdScoreData.__adv(map_data, map_time, adv, time_index)
 
             # Nothing to process if no notes are visible
             if len(visible_notes) == 0: continue
 
             # Process player actions
-            if replay_key == StdReplayData.FREE:    map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_free(score_data, visible_notes, replay_time, replay_xpos, replay_ypos))
-            if replay_key == StdReplayData.PRESS:   map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_press(score_data, visible_notes, replay_time, replay_xpos, replay_ypos))
-            if replay_key == StdReplayData.HOLD:    map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_hold(score_data, visible_notes, replay_time, replay_xpos, replay_ypos))
-            if replay_key == StdReplayData.RELEASE: map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_release(score_data, visible_notes, replay_time, replay_xpos, replay_ypos))
+            if replay_key == StdReplayData.FREE:    map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_free(score_data, visible_notes, replay_time, replay_xpos, replay_ypos), time_index)
+            if replay_key == StdReplayData.PRESS:   map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_press(score_data, visible_notes, replay_time, replay_xpos, replay_ypos), time_index)
+            if replay_key == StdReplayData.HOLD:    map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_hold(score_data, visible_notes, replay_time, replay_xpos, replay_ypos), time_index)
+            if replay_key == StdReplayData.RELEASE: map_time = StdScoreData.__adv(map_data, map_time, StdScoreData.__process_release(score_data, visible_notes, replay_time, replay_xpos, replay_ypos), time_index)
 
         # Convert recorded timings and states into a pandas data
         score_data = list(score_data.values())
         return pd.DataFrame(score_data, columns=['replay_t', 'map_t', 'replay_x', 'replay_y', 'map_x', 'map_y', 'type', 'action', 'map_idx'])
 
 
+    @staticmethod
+    def get_score_data_array(replay_data, map_data, ar=8, cs=4):
+        """
+        Array based equivalent of the frame by frame scoring processor in ``get_score_data``.
+
+        Instead of going through every replay frame, each hitobject is resolved in order by looking
+        up the press, hold, and release frames that fall in its hit windows with ``np.searchsorted``
+        and applying the distance and timing checks as masks over those frames. The Python loop
+        runs once per scorepoint rather than once per replay frame.
+
+        All scoring settings used by the frame processor are honoured. Judgements are identical to
+        ``get_score_data`` as long as hitobjects don't overlap in time, with one exception: once a
+        hitobject is judged, the array processor never returns to it. The frame processor may score
+        remaining aimpoints of an already missed slider again if they are still visible when the
+        next note is not. Overlapping hitobjects are processed one after another in hitobject order.
+
+        Parameters
+        ----------
+        replay_data : pandas.DataFrame
+            Replay data from ``StdReplayData.get_replay_data``
+
+        map_data : pandas.DataFrame
+            Map data from ``StdMapData.get_map_data`` or map array from ``StdMapData.get_map_array``
+
+        ar : float
+            AR of the map. Scorepoints are not processed before they become visible
+
+        Returns
+        -------
+        pandas.DataFrame
+            Score data with the same columns as ``get_score_data``
+        """
+        replay_data = StdReplayData.get_reduced_replay_data(replay_data, press_block=StdScoreData.press_block, release_block=StdScoreData.release_block).values
+        map_arrays  = StdScoreData.get_map_arrays(map_data)
+
+        score_data = StdScoreData.score_arrays(map_arrays, replay_data, Std.ar_to_ms(ar))
+        return pd.DataFrame(score_data, columns=StdScoreData.COLUMNS)
+
+
+    @staticmethod
+    def get_score_data_batch(replay_data, map_data, ar=8, cs=4, replay_ids=None):
+        """
+        Scores many replays played on the same map.
+
+        The map is split into arrays once with ``get_map_arrays`` and each replay is then
+        scored with the array scoring processor, so the cost is one map setup plus one pass
+        per replay. Replays may produce different number of scorepoints.
+
+        Parameters
+        ----------
+        replay_data : list
+            List of replay data from ``StdReplayData.get_replay_data``
+
+        map_data : pandas.DataFrame
+            Map data from ``StdMapData.get_map_data``
+
+        ar : float
+            AR of the map
+
+        replay_ids : list
+            Ids to label each replay's score data with. Defaults to the position of
+            the replay in ``replay_data``
+
+        Returns
+        -------
+        pandas.DataFrame
+            Score data of all replays, with the same columns as ``get_score_data``, indexed by
+            ``(replay_id, map_idx)``. Score data of a single replay can be retrieved with
+            ``score_data.loc[replay_id]``.
+        """
+        if replay_ids is None:
+            replay_ids = range(len(replay_data))
+
+        replay_ids = list(replay_ids)
+        if len(replay_ids) != len(replay_data):
+            raise ValueError(f'Got {len(replay_ids)} replay ids for {len(replay_data)} replays')
+
+        map_arrays = StdScoreData.get_map_arrays(map_data)
+        ar_ms      = Std.ar_to_ms(ar)
+
+        score_data = []
+        for data in replay_data:
+            data = StdReplayData.get_reduced_replay_data(data, press_block=StdScoreData.press_block, release_block=StdScoreData.release_block).values
+            score_data.append(StdScoreData.score_arrays(map_arrays, data, ar_ms))
+
+        ids = np.repeat(replay_ids, [ len(data) for data in score_data ])
+        score_data = np.concatenate(score_data) if len(score_data) > 0 else np.empty((0, len(StdScoreData.COLUMNS)))
+
+        index = pd.MultiIndex.from_arrays([ ids, score_data[:, StdScoreData.IDX_MAP_IDX] ], names=[ 'replay_id', 'map_idx' ])
+        return pd.DataFrame(score_data, index=index, columns=StdScoreData.COLUMNS)
+
+
+    @staticmethod
+    def get_map_arrays(map_data):
+        """
+        Splits map data into the contiguous arrays used by the array scoring processor.
+        This only needs to be done once per map.
+
+        Parameters
+        ----------
+        map_data : pandas.DataFrame
+            Map data from ``StdMapData.get_map_data`` or map array from ``StdMapData.get_map_array``
+
+        Returns
+        -------
+        tuple
+            ``(aimpoints, bounds)``. ``aimpoints`` is a ``(N, 6)`` float array of
+            ``[ time, x, y, type, object, hitobject_idx ]`` rows and ``bounds`` is a
+            ``(M, 2)`` int array of ``[ start, end )`` aimpoint rows for each hitobject.
+        """
+        if isinstance(map_data, np.ndarray):
+            aimpoints = map_data
+        else:
+            aimpoints = np.empty((len(map_data), 6))
+            aimpoints[:, :StdMapData.IDX_HITOBJECT] = map_data.values[:, :StdMapData.IDX_HITOBJECT]
+            aimpoints[:, StdMapData.IDX_HITOBJECT]  = StdMapData.hitobject_idxs(map_data)
+
+        offsets = StdMapData.get_hitobject_offsets(aimpoints)
+        return aimpoints, np.column_stack((offsets[:-1], offsets[1:]))
+
+
+    @staticmethod
+    def score_arrays(map_arrays, replay_data, ar_ms):
+        """
+        .. warning::
+            This function is not intended to be used directly
+
+        Runs the array scoring processor on map arrays from ``get_map_arrays`` and a reduced
+        replay from ``StdReplayData.get_reduced_replay_data`` in numpy form.
+
+        Returns
+        -------
+        numpy.array
+            ``(N, 9)`` array of score data rows ordered by replay time
+        """
+        aimpoints, bounds = map_arrays
+
+        replay_data = np.asarray(replay_data, dtype=np.float64)
+        frame_t = replay_data[:, 0]
+        frame_x = replay_data[:, 1]
+        frame_y = replay_data[:, 2]
+        frame_k = replay_data[:, 3]
+
+        # Frame indices for each key state. Since frames are sorted by time, so are these.
+        press_i   = np.flatnonzero(frame_k == StdReplayData.PRESS)
+        hold_i    = np.flatnonzero(frame_k == StdReplayData.HOLD)
+        release_i = np.flatnonzero(frame_k == StdReplayData.RELEASE)
+
+        press_t   = frame_t[press_i]
+        hold_t    = frame_t[hold_i]
+        release_t = frame_t[release_i]
+
+        num_frames = len(frame_t)
+        no_frame   = num_frames  # Used as "never happens" frame index
+
+        # Index of the last frame that has been used up. Only frames after this one may be used for the next scorepoint.
+        lock = -1
+
+        score_data = []
+
+        def first_frame_after(time):
+            # First frame past ``lock`` that occurs after ``time``
+            return max(lock + 1, np.searchsorted(frame_t, time, side='right'))
+
+        def candidates(event_i, event_t, time_lo, time_hi=None):
+            # Slice of events that are past ``lock``, after ``time_lo``, and no later than ``time_hi``
+            lo = max(np.searchsorted(event_i, lock, side='right'), np.searchsorted(event_t, time_lo, side='right'))
+            hi = len(event_i) if time_hi is None else np.searchsorted(event_t, time_hi, side='right')
+            return lo, max(lo, hi)
+
+        def first_true(mask):
+            idx = np.flatnonzero(mask)
+            return idx[0] if len(idx) > 0 else None
+
+        def dists(frames, aimpoint):
+            return np.sqrt((frame_x[frames] - aimpoint[1])**2 + (frame_y[frames] - aimpoint[2])**2)
+
+        def record(frame, aimpoint, score_type, action, free=False):
+            if free: replay_x, replay_y = np.nan, np.nan
+            else:    replay_x, replay_y = frame_x[frame], frame_y[frame]
+            score_data.append([ frame_t[frame], aimpoint[0], replay_x, replay_y, aimpoint[1], aimpoint[2], score_type, action, aimpoint[5] ])
+
+        def record_empty(frames):
+            for frame in frames:
+                score_data.append([ frame_t[frame], np.nan, frame_x[frame], frame_y[frame], np.nan, np.nan, StdScoreData.TYPE_EMPTY, StdReplayData.PRESS, np.nan ])
+
+        for start, end in bounds:
+            # ---- Press aimpoint ----
+            aimpoint = aimpoints[start]
+
+            lo, hi = candidates(press_i, press_t, aimpoint[0] - ar_ms, aimpoint[0] + StdScoreData.pos_hit_miss_range)
+            offsets = press_t[lo:hi] - aimpoint[0]
+            in_circle = dists(press_i[lo:hi], aimpoint) <= StdScoreData.hitobject_radius
+            in_window = offsets > -StdScoreData.neg_hit_miss_range
+
+            hit = first_true(in_circle & in_window)
+            expired = first_frame_after(aimpoint[0] + StdScoreData.pos_hit_miss_range)
+
+            if StdScoreData.blank_miss:
+                # Presses in blank space while this note awaits a press
+                blank_end = hi if hit is None else lo + hit
+                blank_frames = press_i[lo:blank_end]
+                if hit is None: blank_frames = blank_frames[blank_frames < expired]
+                record_empty(blank_frames)
+
+            if hit is None:
+                # Never pressed. Missed once the replay goes past the miss window
+                if expired >= num_frames: break
+                record(expired, aimpoint, StdScoreData.TYPE_MISS, StdReplayData.FREE, free=True)
+                lock = expired - 1
+                continue
+
+            frame  = press_i[lo + hit]
+            offset = offsets[hit]
+            lock   = frame
+
+            if not (-StdScoreData.neg_hit_range < offset <= StdScoreData.pos_hit_range):
+                record(frame, aimpoint, StdScoreData.TYPE_MISS, StdReplayData.PRESS)
+                continue
+
+            record(frame, aimpoint, StdScoreData.TYPE_HITP, StdReplayData.PRESS)
+            if aimpoint[4] != StdMapData.TYPE_SLIDER:
+                continue
+
+            # ---- Hold aimpoints ----
+            hold_late = StdScoreData.pos_hld_range if StdScoreData.recoverable_release else 0
+            missed = False
+
+            for aimpoint in aimpoints[start + 1 : end - 1]:
+                if lock + 1 >= num_frames: break
+
+                # Miss due to not holding until past the hold window (free processing)
+                free_frame = first_frame_after(aimpoint[0] + hold_late)
+                free_type  = StdReplayData.FREE
+
+                # Miss due to cursor wandering off the slider once the aimpoint is reached
+                if not StdScoreData.recoverable_missaim:
+                    frames = np.arange(first_frame_after(aimpoint[0]), free_frame)
+                    idx = first_true(dists(frames, aimpoint) > StdScoreData.follow_radius)
+                    if idx is not None: free_frame = frames[idx]
+
+                action_frame = no_frame
+                action_type  = None
+
+                # Holds that complete the aimpoint, or miss it when out of range
+                lo, hi = candidates(hold_i, hold_t, aimpoint[0] - ar_ms, frame_t[free_frame] if free_frame < num_frames else None)
+                frames = hold_i[lo:hi]
+                frames = frames[frames < free_frame]
+                in_window = frame_t[frames] > aimpoint[0] - StdScoreData.neg_hld_range
+
+                if StdScoreData.hold_range_window:
+                    in_range = dists(frames, aimpoint) <= StdScoreData.follow_radius
+                    if StdScoreData.hold_range_miss:
+                        idx = first_true(~in_range)
+                        if idx is not None: action_frame, action_type = frames[idx], StdScoreData.TYPE_MISS
+                    in_window &= in_range
+
+                idx = first_true(in_window)
+                if idx is not None and frames[idx] < action_frame:
+                    action_frame, action_type = frames[idx], StdScoreData.TYPE_AIMH
+
+                # Releasing while the slider expects a hold
+                if not StdScoreData.recoverable_release:
+                    lo, hi = candidates(release_i, release_t, aimpoint[0] - ar_ms)
+                    frames = release_i[lo:hi]
+                    idx = first_true(frame_t[frames] < aimpoint[0])
+                    if idx is not None and frames[idx] < action_frame:
+                        action_frame, action_type = frames[idx], StdScoreData.TYPE_MISS
+
+                # Free processing happens before key actions on the same frame
+                if free_frame <= action_frame:
+                    if free_frame >= num_frames:
+                        lock = num_frames
+                        break
+
+                    record(free_frame, aimpoint, StdScoreData.TYPE_MISS, free_type, free=True)
+                    lock = free_frame - 1
+                    missed = True
+                    break
+
+                lock = action_frame
+                record(action_frame, aimpoint, action_type, StdReplayData.HOLD)
+
+                if action_type == StdScoreData.TYPE_MISS:
+                    missed = True
+                    break
+
+            if missed or lock + 1 >= num_frames:
+                continue
+
+            # ---- Release aimpoint ----
+            aimpoint = aimpoints[end - 1]
+
+            if StdScoreData.release_window:
+                lo, hi = candidates(release_i, release_t, max(aimpoint[0] - ar_ms, aimpoint[0] - StdScoreData.neg_rel_miss_range), aimpoint[0] + StdScoreData.pos_rel_miss_range)
+            else:
+                lo, hi = candidates(release_i, release_t, aimpoint[0] - ar_ms)
+
+            frames  = release_i[lo:hi]
+            offsets = frame_t[frames] - aimpoint[0]
+            valid   = np.full(len(frames), True)
+
+            if StdScoreData.release_range:
+                valid &= dists(frames, aimpoint) <= StdScoreData.release_radius
+
+            if StdScoreData.release_window and not StdScoreData.release_miss:
+                valid &= (-StdScoreData.neg_rel_range < offsets) & (offsets <= StdScoreData.pos_rel_range)
+
+            idx = first_true(valid)
+            expired = first_frame_after(aimpoint[0] + StdScoreData.pos_rel_miss_range) if StdScoreData.release_window else no_frame
+
+            if idx is None:
+                # Never released. Without a release window the processor waits on this aimpoint indefinitely
+                if expired >= num_frames: break
+                record(expired, aimpoint, StdScoreData.TYPE_MISS, StdReplayData.FREE, free=True)
+                lock = expired - 1
+                continue
+
+            frame = frames[idx]
+            lock  = frame
+
+            if StdScoreData.release_window and not (-StdScoreData.neg_rel_range < offsets[idx] <= StdScoreData.pos_rel_range):
+                record(frame, aimpoint, StdScoreData.TYPE_MISS, StdReplayData.RELEASE)
+            else:
+                record(frame, aimpoint, StdScoreData.TYPE_HITR, StdReplayData.RELEASE)
+
+        if len(score_data) == 0:
+            return np.empty((0, len(StdScoreData.COLUMNS)))
+
+        # Scorepoints are resolved in hitobject order; present them in the order the replay got to them
+        score_data = np.asarray(score_data, dtype=np.float64)
+        return score_data[np.argsort(score_data[:, StdScoreData.IDX_REPLAY_T], kind='stable')]
+
+
     '''
     @staticmethod
     def get_velocity_jump_frames(replay_data, map_data):
@@ -710,27 +1072,26 @@ class StdScoreData():
         score_data : numpy.array
             Score data
 
-        offset : float
-            Tap offset (ms) to determine odds for
+        offset : float or numpy.array
+            Tap offsets (ms) to determine odds for
 
         Returns
         -------
-        float
+        float or numpy.array
             Probability one random value ``[X]`` is between ``-offset <= X <= offset``.
             In simpler terms, look at all the hits for scores; What are the odds 
             of you picking a random hit that is between ``-offset`` and ``offset``?
         """
-        mean  = StdScoreData.tap_offset_mean(score_data)
-        stdev = StdScoreData.tap_offset_stdev(score_data)
+        mean   = StdScoreData.tap_offset_mean(score_data)
+        stdev  = StdScoreData.tap_offset_stdev(score_data)
+        offset = np.asarray(offset, dtype=np.float64)
 
         # scipy cdf can't handle 0 stdev (div by 0)
         if stdev == 0:
-            return 1.0 if -offset <= mean <= offset else 0.0
+            return np.where((-offset <= mean) & (mean <= offset), 1.0, 0.0)[()]
 
-        prob_greater_than_neg = scipy.stats.norm.cdf(-offset, loc=mean, scale=stdev)
-        prob_less_than_pos = scipy.stats.norm.cdf(offset, loc=mean, scale=stdev)
-
-        return prob_less_than_pos - prob_greater_than_neg
+        probs = scipy.stats.norm.cdf(np.stack((-offset, offset)), loc=mean, scale=stdev)
+        return probs[1] - probs[0]
 
 
     @staticmethod
@@ -744,12 +1105,12 @@ class StdScoreData():
         score_data : numpy.array
             Score data
 
-        offset : float
-            Tap offset (ms) to determine odds for
+        offset : float or numpy.array
+            Cursor offsets (osu!px) to determine odds for
 
         Returns
         -------
-        float
+        float or numpy.array
             Probability one random value ``[X, Y]`` is between ``(-offset, -offset) <= (X, Y) <= (offset, offset)``.
             In simpler terms, look at all the cursor positions for score; What are the odds of you picking a random hit that has 
             a cursor position between an area of ``(-offset, -offset)`` and ``(offset, offset)``?
@@ -765,10 +1126,12 @@ class StdScoreData():
         
         distribution = scipy.stats.multivariate_normal(mean, covariance, allow_singular=True)
 
-        prob_less_than_neg = distribution.cdf(np.asarray([-offset, -offset]))
-        prob_less_than_pos = distribution.cdf(np.asarray([offset, offset]))
+        # Corners of the area for all offsets, as (2, ..., 2) array of [ x, y ]
+        offset  = np.asarray(offset, dtype=np.float64)
+        corners = np.repeat(np.stack((-offset, offset))[..., None], 2, axis=-1)
 
-        return prob_less_than_pos - prob_less_than_neg
+        probs = np.reshape(distribution.cdf(corners), (2, ) + offset.shape)
+        return (probs[1] - probs[0])[()]
 
 
     @staticmethod
@@ -782,12 +1145,12 @@ class StdScoreData():
         score_data : numpy.array
             Score data
 
-        offset : float
-            Tap offset (ms) to determine odds for
+        offset : float or numpy.array
+            Tap offsets (ms) to determine odds for
 
         Returns
         ------- 
-        float
+        float or numpy.array
             Probability all random values ``[X]`` are between ``-offset <= X <= offset``.
             In simpler terms, look at all the hits for scores; What are the odds all of them are between -offset and offset?
         """
@@ -808,12 +1171,12 @@ class StdScoreData():
         score_data : numpy.array
             Score data
 
-        offset : float
-            Tap offset (ms) to determine odds for
+        offset : float or numpy.array
+            Cursor offsets (osu!px) to determine odds for
 
         Returns
         -------
-        float
+        float or numpy.array
             Probability all random values ``{[X, Y], ...}`` are between ``(-offset, -offset) <= (X, Y) <= (offset, offset)``
             In simpler terms, look at all the cursor positions for score; What are the odds all of them are between an area 
             of ``(-offset, -offset)`` and ``(offset, offset)``?
@@ -1,12 +1,13 @@
 from enum import Enum
 import numpy as np
+import pandas as pd
 import scipy.stats
 
 from misc.numpy_utils import NumpyUtils
 from misc.geometry import get_distance
 from misc.math_utils import prob_not, prob_and, prob_or
 
-from analysis.osu.std.score_data import StdScoreData, StdScoreDataEnums
+from analysis.osu.std.score_data import StdScoreData
 
 
 class StdScoreMetrics():
@@ -15,22 +16,22 @@ class StdScoreMetrics():
     """
 
     @staticmethod
-    def get_per_hitobject_score_data(score_data_array):
+    def get_per_hitobject_score_data(score_data_array, num_hitobjects=None, filepath=None):
         """
-        Takes arrays of score data pertaining to various players and transposes it to be an array of per-hitobject score data
+        Takes score data pertaining to various players and arranges it to be an array of per-hitobject score data
         by various players. In other words, it stacks all score data per-notes instead of standalone per-player. It allows to
         easier calculate data based how players do on specific notes or pattens. If ``a0`` corresponds to player a and note 0, 
         then the data
         ::
             [
                 [
-            a0      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
-            a1      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
+            a0      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
+            a1      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
             aN      ...  N events
                 ],
                 [
-            b0      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
-            b1      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
+            b0      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
+            b1      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
             bN      ...  N events
                 ],
                 ...
@@ -39,28 +40,93 @@ class StdScoreMetrics():
         ::
             [
                 [
-            a0      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
-            b0      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
+            a0      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
+            b0      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
             N0      ...  N events
                 ],
                 [
-            a1      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
-            b1      [ time, (cursor_pos_x, cursor_pos_y), hit_offset, (pos_offset_x, pos_offset_y), hitobject_idx ],
+            a1      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
+            b1      [ replay_t, map_t, replay_x, replay_y, map_x, map_y, type, action, map_idx ],
             N1      ...  N events
                 ],
                 ...
             ]
 
+        Players' score data are lined up by ``map_idx``, so they don't need to have the same number of 
+        rows. Each player gets the first row scored on each hitobject, which is the judgement of the press.
+        Hitobjects a player has no rows for are filled with ``nan``.
+
         Parameters
         ----------
-        score_data_array : numpy.array
-            List of ``score_data`` numpy arrays
+        score_data_array : list or pandas.DataFrame
+            List of ``score_data`` from ``StdScoreData.get_score_data``, or score data of many players 
+            from ``StdScoreData.get_score_data_batch``, in which case players are in the order of their ``replay_id``
+
+        num_hitobjects : int
+            Number of hitobjects in the map. Defaults to one past the highest hitobject index in the score data
+
+        filepath : str
+            If given, the array is memory-mapped to this *.npy file instead of held in memory. Use this for
+            arrays that don't fit in memory. It can be opened again later with ``np.load(filepath, mmap_mode='r')``
 
         Returns
         -------
         numpy.array
+            ``(hitobjects, players, fields)`` float32 array. Fields are indexed by ``StdScoreData.IDX_*``
         """
-        return np.transpose(score_data_array, axes=(1, 0, 2))
+        if isinstance(score_data_array, pd.DataFrame):
+            replay_ids, players = np.unique(score_data_array.index.get_level_values('replay_id'), return_inverse=True)
+            num_players = len(replay_ids)
+            score_data  = score_data_array.values
+        else:
+            num_players = len(score_data_array)
+            score_data  = [ np.asarray(score_data, dtype=np.float64).reshape(-1, len(StdScoreData.COLUMNS)) for score_data in score_data_array ]
+            players     = np.repeat(np.arange(num_players), [ len(data) for data in score_data ])
+            score_data  = np.concatenate(score_data) if num_players > 0 else np.empty((0, len(StdScoreData.COLUMNS)))
+
+        map_idxs  = score_data[:, StdScoreData.IDX_MAP_IDX]
+        is_scored = ~np.isnan(map_idxs)
+
+        score_data = score_data[is_scored]
+        players    = players[is_scored]
+        map_idxs   = map_idxs[is_scored].astype(np.int64)
+
+        if num_hitobjects is None:
+            num_hitobjects = map_idxs.max() + 1 if len(map_idxs) > 0 else 0
+
+        # First row of each player on each hitobject
+        _, first_idxs = np.unique(map_idxs*num_players + players, return_index=True)
+
+        shape = (num_hitobjects, num_players, len(StdScoreData.COLUMNS))
+        if filepath is None:
+            per_hitobject_score_data = np.full(shape, np.nan, dtype=np.float32)
+        else:
+            per_hitobject_score_data = np.lib.format.open_memmap(filepath, mode='w+', dtype=np.float32, shape=shape)
+            per_hitobject_score_data[:] = np.nan
+
+        per_hitobject_score_data[map_idxs[first_idxs], players[first_idxs]] = score_data[first_idxs]
+        return per_hitobject_score_data
+
+
+    @staticmethod
+    def get_hitobject_hit_offsets(per_hitobject_score_data):
+        """
+        Gets the hit offsets of each player's press on each hitobject
+
+        Parameters
+        ----------
+        per_hitobject_score_data : numpy.array
+            Per-hitobject score data from ``StdScoreMetrics.get_per_hitobject_score_data``
+
+        Returns
+        -------
+        numpy.array
+            ``(hitobjects, players)`` array of hit offsets. ``nan`` where the player didn't hit the hitobject
+        """
+        is_hit = per_hitobject_score_data[..., StdScoreData.IDX_TYPE] == StdScoreData.TYPE_HITP
+        hit_offsets = per_hitobject_score_data[..., StdScoreData.IDX_REPLAY_T] - per_hitobject_score_data[..., StdScoreData.IDX_MAP_T]
+
+        return np.where(is_hit, hit_offsets, np.nan)
 
 
     @staticmethod
@@ -85,10 +151,9 @@ class StdScoreMetrics():
             % of players able to hit better than ``offset`` based on given 
             mass score data in ``per_hitobject_score_data``.
         """
-        hit_offsets = per_hitobject_score_data[hitobject_idx][:, StdScoreDataEnums.HIT_OFFSET.value]
-        hit_offsets_below_offset = hit_offsets[abs(hit_offsets) < offset]
-
-        return len(hit_offsets_below_offset)/len(hit_offsets)
+        # Players that didn't hit the hitobject have nan offsets, which are never within ``offset``
+        hit_offsets = StdScoreMetrics.get_hitobject_hit_offsets(per_hitobject_score_data[hitobject_idx])
+        return np.count_nonzero(abs(hit_offsets) < offset)/len(hit_offsets)
 
 
     @staticmethod
@@ -111,10 +176,10 @@ class StdScoreMetrics():
             within ``offset`` for a list of hitobject. Times correspond to the timing of the
             respective hitobjects.
         """
-        times   = per_hitobject_score_data[:,0,0]
-        percent = [ StdScoreMetrics.get_percent_below_offset_one(per_hitobject_score_data, i, offset) for i in range(len(per_hitobject_score_data)) ]
+        times       = StdScoreMetrics.__get_hitobject_times(per_hitobject_score_data)
+        hit_offsets = StdScoreMetrics.get_hitobject_hit_offsets(per_hitobject_score_data)
 
-        return times, np.asarray(percent)
+        return times, np.count_nonzero(abs(hit_offsets) < offset, axis=1)/hit_offsets.shape[1]
 
 
     @staticmethod
@@ -139,19 +204,12 @@ class StdScoreMetrics():
         float
             The tap offset from 0ms that would satisfy ``target_percent`` % of players being able to hit better than.
         """
-        offset         = 0
-        target_percent = min(max(0.0, target_percent), 1.0)
-        curr_percent   = StdScoreMetrics.get_percent_below_offset_one(per_hitobject_score_data, hitobject_idx, offset)
-
-        while curr_percent < target_percent:
-            curr_percent = StdScoreMetrics.get_percent_below_offset_one(per_hitobject_score_data, hitobject_idx, offset)
-            offset += 1
-
-        return offset
+        hit_offsets = StdScoreMetrics.get_hitobject_hit_offsets(per_hitobject_score_data[hitobject_idx : hitobject_idx + 1])
+        return StdScoreMetrics.solve_for_hit_offsets(hit_offsets, target_percent)[0]
 
 
     @staticmethod
-    def solve_for_hit_offset_all(per_hitobject_score_data):
+    def solve_for_hit_offset_all(per_hitobject_score_data, target_percent=0.5):
         """
         Takes all of the players' results to solve for the tapping offset 50% of players are able to 
         hit better than for each note. This is useful for determining the difficulty response of 
@@ -162,6 +220,9 @@ class StdScoreMetrics():
         per_hitobject_score_data : numpy.array
             Per-hitobject score data across various plays
 
+        target_percent : float or list
+            Target percentage of players. If a list, offsets are solved for each of the percentages
+
         Returns
         -------
         (float, numpy.array)
@@ -169,7 +230,103 @@ class StdScoreMetrics():
             players are able to hit better than. Times correspond to the timing of the
             respective hitobjects.
         """
-        times       = per_hitobject_score_data[:,0,0]
-        hit_offsets = [ StdScoreMetrics.solve_for_hit_offset_one(per_hitobject_score_data, i, 0.5) for i in range(len(per_hitobject_score_data)) ]
+        times       = StdScoreMetrics.__get_hitobject_times(per_hitobject_score_data)
+        hit_offsets = StdScoreMetrics.get_hitobject_hit_offsets(per_hitobject_score_data)
+
+        return times, StdScoreMetrics.solve_for_hit_offsets(hit_offsets, target_percent)
+
+
+    @staticmethod
+    def get_hit_offsets(score_data, num_hitobjects=None):
+        """
+        Takes score data of many players and arranges the hit offsets of their presses into a 
+        ``(hitobjects, players)`` matrix.
+
+        Parameters
+        ----------
+        score_data : pandas.DataFrame
+            Score data from ``StdScoreData.get_score_data_batch``
+
+        num_hitobjects : int
+            Number of hitobjects in the map. Defaults to one past the highest hitobject index in ``score_data``
+
+        Returns
+        -------
+        (numpy.array, numpy.array)
+            A tuple ``(times, hit_offsets)``. ``hit_offsets`` is the matrix of hit offsets, with ``nan`` 
+            for hitobjects a player didn't hit. Players are in the order of their ``replay_id``. ``times``
+            are the start times of the respective hitobjects, ``nan`` if no player scored them.
+        """
+        replay_ids, players = np.unique(score_data.index.get_level_values('replay_id'), return_inverse=True)
+
+        data     = score_data.values
+        map_idxs = data[:, StdScoreData.IDX_MAP_IDX]
+
+        # Presses that didn't land on any hitobject have no hitobject index
+        is_scored = ~np.isnan(map_idxs)
 
-        return times, np.asarray(hit_offsets)
\ No newline at end of file
+        data     = data[is_scored]
+        players  = players[is_scored]
+        map_idxs = map_idxs[is_scored].astype(np.int64)
+
+        if num_hitobjects is None:
+            num_hitobjects = map_idxs.max() + 1 if len(map_idxs) > 0 else 0
+
+        # Sliders also have rows for their holds and release; the press is the earliest of a hitobject's rows
+        times = np.full(num_hitobjects, np.inf)
+        np.fmin.at(times, map_idxs, data[:, StdScoreData.IDX_MAP_T])
+        times[np.isinf(times)] = np.nan
+
+        # A press can't be scored on a hitobject more than once per play, so each of the cells gets at most one offset
+        is_hit = data[:, StdScoreData.IDX_TYPE] == StdScoreData.TYPE_HITP
+
+        hit_offsets = np.full((num_hitobjects, len(replay_ids)), np.nan)
+        hit_offsets[map_idxs[is_hit], players[is_hit]] = data[is_hit, StdScoreData.IDX_REPLAY_T] - data[is_hit, StdScoreData.IDX_MAP_T]
+
+        return times, hit_offsets
+
+
+    @staticmethod
+    def solve_for_hit_offsets(hit_offsets, target_percent=[ 0.25, 0.5, 0.75, 0.95 ]):
+        """
+        Solves for the tapping offset of each hitobject such that a certain percentage, ``target_percent``,
+        of players are able to hit within. The absolute offsets of each hitobject are sorted once, and
+        the offsets for all hitobjects and percentages are then picked out of the sorted offsets at once.
+
+        Parameters
+        ----------
+        hit_offsets : numpy.array
+            ``(hitobjects, players)`` matrix of hit offsets from ``StdScoreMetrics.get_hit_offsets``. 
+            ``nan`` offsets count as players that didn't hit the hitobject
+
+        target_percent : float or list
+            Target percentage of players. If a list, offsets are solved for each of the percentages
+
+        Returns
+        -------
+        numpy.array
+            The tap offset from 0ms within which ``target_percent`` % of players hit each hitobject. ``inf``
+            if not enough players hit the hitobject. If ``target_percent`` is a list, there is a column for 
+            each of the percentages
+        """
+        hit_offsets = np.abs(np.asarray(hit_offsets, dtype=np.float64))
+        hit_offsets[np.isnan(hit_offsets)] = np.inf
+        hit_offsets.sort(axis=1)
+
+        num_players    = hit_offsets.shape[1]
+        target_percent = np.clip(np.asarray(target_percent, dtype=np.float64), 0.0, 1.0)
+
+        if num_players == 0:
+            return np.full((len(hit_offsets), ) + target_percent.shape, np.nan)
+
+        # Number of players needed to be within the offset, from the "inverted cdf" definition of a quantile
+        target_idxs = np.clip(np.ceil(target_percent*num_players).astype(np.int64) - 1, 0, num_players - 1)
+        
+        # No players need to be within 0ms
+        return np.where(target_percent > 0, hit_offsets[:, target_idxs], 0.0)
+
+
+    @staticmethod
+    def __get_hitobject_times(per_hitobject_score_data):
+        # Players that have no rows for a hitobject don't have its time, so take it from any player that does
+        return np.fmax.reduce(per_hitobject_score_data[:, :, StdScoreData.IDX_MAP_T], axis=1, initial=np.nan)
@@ -10,4 +10,6 @@ class Temporal():
     @callback
     def time_changed(self, time):
         self.time = time
-        self.time_changed.emit(time)
\ No newline at end of file
+
+        # Only notify what is connected to this instance, see ``callback``
+        self.time_changed.emit(time, inst=self)
\ No newline at end of file
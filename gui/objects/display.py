@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 
 from misc.callback import callback
+from gui.objects.scene import Scene
 
 
 
@@ -13,4 +14,21 @@ class Display(QGraphicsView):
 
         self.setStyleSheet('background-color: #FEFEFE')
         self.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.scene = None
\ No newline at end of file
+        self.scene = None
+
+
+    def setScene(self, scene):
+        QGraphicsView.setScene(self, scene)
+        self.__area_resize()
+
+
+    def resizeEvent(self, event):
+        QGraphicsView.resizeEvent(self, event)
+        self.__area_resize()
+
+
+    def __area_resize(self):
+        # Layers paint to the size of the viewport
+        scene = QGraphicsView.scene(self)
+        if isinstance(scene, Scene):
+            scene.area_resize_event(self.viewport().width(), self.viewport().height())
\ No newline at end of file
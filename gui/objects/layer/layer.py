@@ -1,3 +1,5 @@
+import numpy as np
+
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
@@ -13,19 +15,136 @@ class Layer(QGraphicsItem):
 
         self.name = name
 
+        self.view         = None  # What the layer showed the last time its view changed; see get_view
+        self.content_rect = None  # Area of the scene the layer's content is in; None if not known
 
-    def area_resize_event(self, width, height):
-        raise NotImplementedError()
+        # Scale from playfield to scene coordinates; see area_resize_event
+        self.ratio_x = None
+        self.ratio_y = None
+        self.content_rect_stale = False
 
-        # Reminder this needs to be put in the 
-        # implementation of derived class
-        self.layer_changed()
+
+    def area_resize_event(self, width, height):
+        """
+        Called by the scene when the area the layer is displayed in is resized. Derived classes
+        that report a content rect set the scale they paint with here, see ``set_ratio``
+        """
+        pass
 
 
     @callback
     def layer_changed(self):
-        self.layer_changed.emit(inst=self)
+        self.layer_changed.emit(self, inst=self)
+
+
+    def view_changed(self):
+        """
+        Same as ``layer_changed``, but does nothing if what the layer shows is the same as
+        the last time. Use this for changes like time ticks that often don't change the layer.
+        """
+        view = self.get_view()
+        if view is not None and view == self.view:
+            return
+
+        self.view = view
+        self.layer_changed()
+
+
+    def get_view(self):
+        """
+        Derived classes return something that is equal between two calls only if the layer
+        would paint the same thing both times. None means the layer can't tell and is always repainted.
+        """
+        return None
+
+
+    def get_content_rect(self):
+        """
+        Derived classes return the area of the scene the layer's content would currently be
+        painted in. None means the layer can't tell, in which case the entire scene is repainted
+        whenever the layer changes.
+        """
+        return None
+
+
+    def update_content_rect(self):
+        """
+        Updates the layer's bounding rect to where its content currently is
+
+        Returns
+        -------
+        QRectF
+            Area that needs to be repainted to show the change, covering both where the content was
+            and where it is now. None if that is not known
+        """
+        old_rect = self.content_rect
+        new_rect = self.get_content_rect()
+
+        if new_rect != old_rect:
+            self.prepareGeometryChange()
+            self.content_rect = new_rect
+
+        if old_rect is None or new_rect is None or self.content_rect_stale:
+            self.content_rect_stale = False
+            return None
+
+        return old_rect.united(new_rect)
+
+
+    def set_ratio(self, ratio_x, ratio_y):
+        """
+        Derived classes call this from ``area_resize_event`` with the scale they paint with, so ``get_content_rect``
+        can map playfield positions to the scene. The scale is not taken from ``paint``, since a layer whose 
+        content rect is out of view after a resize would never get painted to learn of it.
+        """
+        if (ratio_x, ratio_y) == (self.ratio_x, self.ratio_y):
+            return
+
+        self.ratio_x, self.ratio_y = ratio_x, ratio_y
+        self.content_rect_stale = True
+
 
-    
     def boundingRect(self):
-        return QRectF(0, 0, 0, 0)
\ No newline at end of file
+        if self.content_rect is None:
+            return QRectF(0, 0, 0, 0)
+
+        return self.content_rect
+
+
+    @staticmethod
+    def get_points_rect(points, ratio_x, ratio_y, margin):
+        """
+        Area taken up by shapes drawn around playfield points
+
+        Parameters
+        ----------
+        points : numpy.array
+            (N, 2) array of [ x, y ] playfield positions
+
+        ratio_x : float
+            Scale from playfield to scene x coordinates
+
+        ratio_y : float
+            Scale from playfield to scene y coordinates
+
+        margin : float or numpy.array
+            How far (osu!px) shapes extend from each point. Either one margin for all points or one per point
+
+        Returns
+        -------
+        QRectF
+            Bounding rect in scene coordinates. Empty if there are no points
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) == 0:
+            return QRectF()
+
+        margin = np.broadcast_to(np.asarray(margin, dtype=np.float64), len(points))
+
+        # Leave a pixel for anti-aliasing
+        min_x = np.min((points[:, 0] - margin)*ratio_x) - 1
+        max_x = np.max((points[:, 0] + margin)*ratio_x) + 1
+        min_y = np.min((points[:, 1] - margin)*ratio_y) - 1
+        max_y = np.max((points[:, 1] + margin)*ratio_y) + 1
+
+        return QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
@@ -31,7 +31,7 @@ class ManiaScoreDebugLayer(Layer, Temporal):
         self.score_data  = ManiaScoreData.get_score_data(self.replay_data, self.map_data)
 
         time_updater.connect(self.time_changed)
-        self.time_changed.connect(lambda time: self.layer_changed())
+        self.time_changed.connect(lambda time: self.view_changed(), inst=self)
 
         ManiaSettings.set_viewable_time_interval.connect(self.layer_changed)
 
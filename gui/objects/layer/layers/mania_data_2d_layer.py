@@ -14,7 +14,7 @@ class ManiaData2DLayer(Layer, Temporal):
         Temporal.__init__(self)
 
         time_driver.connect(self.time_changed)
-        self.time_changed.connect(lambda time: self.layer_changed())
+        self.time_changed.connect(lambda time: self.view_changed(), inst=self)
 
         self.color     = color
         self.data      = data
@@ -26,7 +26,7 @@ class AimpointAngleTextLayer(Layer, Temporal):
         self.times, self.angles = StdMapMetrics.calc_angles(map_data)
         
         time_updater.connect(self.time_changed)
-        self.time_changed.connect(lambda time: self.layer_changed())
+        self.time_changed.connect(lambda time: self.view_changed(), inst=self)
 
         StdSettings.set_view_time_back.connect(self.layer_changed)
         StdSettings.set_view_time_ahead.connect(self.layer_changed)
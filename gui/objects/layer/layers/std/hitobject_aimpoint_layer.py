@@ -1,7 +1,11 @@
+import numpy as np
+
 from generic.temporal import Temporal
 from gui.objects.layer.layer import Layer
 
 from osu.local.hitobject.std.std import Std
+from osu.local.hitobject.std.std_holdnote_hitobject import StdHoldNoteHitobject
+from osu.local.hitobject.std.std_spinner_hitobject import StdSpinnerHitobject
 
 
 class HitobjectAimpointLayer(Layer, Temporal):
@@ -13,7 +17,32 @@ class HitobjectAimpointLayer(Layer, Temporal):
         self.beatmap = data
         
         time_updater.connect(self.time_changed)
-        self.time_changed.connect(lambda time: self.layer_changed())
+        self.time_changed.connect(lambda time: self.view_changed(), inst=self)
+
+
+    def get_view(self):
+        # Aimpoints don't move, so only changes in which hitobjects are visible matter
+        if not self.time: return None
+        return tuple(map(id, Std.get_hitobjects_visible_at_time(self.beatmap, self.time)))
+
+
+    def get_content_rect(self):
+        if not self.time or self.ratio_x is None: return None
+        points = [ np.empty((0, 2)) ]
+
+        for hitobject in Std.get_hitobjects_visible_at_time(self.beatmap, self.time):
+            if isinstance(hitobject, StdSpinnerHitobject): continue
+
+            if isinstance(hitobject, StdHoldNoteHitobject):
+                points.append(hitobject.times_to_pos(hitobject.tick_times))
+            else:
+                points.append([ (hitobject.pos.x, hitobject.pos.y) ])
+
+        return Layer.get_points_rect(np.concatenate(points), self.ratio_x, self.ratio_y, 3)
+
+
+    def area_resize_event(self, width, height):
+        self.set_ratio(width/Std.PLAYFIELD_WIDTH, height/Std.PLAYFIELD_HEIGHT)
 
 
     def paint(self, painter, option, widget):
@@ -1,7 +1,11 @@
+import numpy as np
+
 from generic.temporal import Temporal
 from gui.objects.layer.layer import Layer
 
 from osu.local.hitobject.std.std import Std
+from osu.local.hitobject.std.std_holdnote_hitobject import StdHoldNoteHitobject
+from osu.local.hitobject.std.std_spinner_hitobject import StdSpinnerHitobject
 
 
 class HitobjectOutlineLayer(Layer, Temporal):
@@ -13,7 +17,46 @@ class HitobjectOutlineLayer(Layer, Temporal):
         self.beatmap = data
 
         time_driver.connect(self.time_changed)
-        self.time_changed.connect(lambda time: self.layer_changed())
+        self.time_changed.connect(lambda time: self.view_changed(), inst=self)
+
+
+    def get_view(self):
+        if not self.time: return None
+        visible_hitobjects = Std.get_hitobjects_visible_at_time(self.beatmap, self.time)
+
+        # Sliders and spinners change as time goes on while they are being played
+        is_playing = any(hitobject.time <= self.time <= hitobject.get_end_time() for hitobject in visible_hitobjects)
+        return tuple(map(id, visible_hitobjects)), (self.time if is_playing else None)
+
+
+    def get_content_rect(self):
+        if not self.time or self.ratio_x is None: return None
+
+        radius = Std.cs_to_px(self.beatmap.difficulty.cs)
+        points, margins = [ np.empty((0, 2)) ], [ np.empty(0) ]
+
+        for hitobject in Std.get_hitobjects_visible_at_time(self.beatmap, self.time):
+            pos = [ (hitobject.pos.x, hitobject.pos.y) ]
+
+            if isinstance(hitobject, StdSpinnerHitobject):
+                points  += [ pos ]
+                margins += [ [ 0.5*Std.PLAYFIELD_HEIGHT + 5 ] ]
+                continue
+
+            points  += [ pos ]
+            margins += [ [ radius ] ]
+
+            # Slider body and the slider point
+            if isinstance(hitobject, StdHoldNoteHitobject):
+                slider_points = np.concatenate((hitobject.gen_points.reshape(-1, 2), hitobject.times_to_pos([ self.time ])))
+                points  += [ slider_points ]
+                margins += [ np.full(len(slider_points), 3) ]
+
+        return Layer.get_points_rect(np.concatenate(points), self.ratio_x, self.ratio_y, np.concatenate(margins))
+
+
+    def area_resize_event(self, width, height):
+        self.set_ratio(width/Std.PLAYFIELD_WIDTH, height/Std.PLAYFIELD_HEIGHT)
 
 
     def paint(self, painter, option, widget):
@@ -29,7 +29,7 @@ class StdScoreDebugLayer(Layer, Temporal):
         self.score_data    = StdScoreData.get_score_data(self.replay_data, self.aimpoint_data)
         
         time_updater.connect(self.time_changed)
-        self.time_changed.connect(lambda time: self.layer_changed())
+        self.time_changed.connect(lambda time: self.view_changed(), inst=self)
 
         StdSettings.set_view_time_back.connect(self.layer_changed)
         StdSettings.set_view_time_ahead.connect(self.layer_changed)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
@@ -5,20 +7,34 @@ from PyQt5.QtGui import *
 from generic.temporal import Temporal
 from gui.objects.layer.layer import Layer
 from osu.local.hitobject.std.std import Std, StdSettings
+from analysis.osu.std.std_layers import StdLayers
 
 
 class StdData2DLayer(Layer, Temporal):
 
+    # Draw functions that only draw around the replay frames in view. Where others draw is not known
+    frame_draw_funcs = [ StdLayers.StdReplayCursorLayer, StdLayers.StdReplayScatterLayer, StdLayers.StdReplayHoldLayer ]
+
     def __init__(self, name, data, draw_func, time_driver):
         Layer.__init__(self, name)
         Temporal.__init__(self)
 
         time_driver.connect(self.time_changed)
-        self.time_changed.connect(lambda time: self.layer_changed())
+        self.time_changed.connect(lambda time: self.view_changed(), inst=self)
 
         self.data      = data
         self.draw_func = draw_func
 
+        try: 
+            if not draw_func in StdData2DLayer.frame_draw_funcs: raise ValueError()
+
+            self.data_times = np.asarray(data['time'], dtype=np.float64)
+            self.data_pos   = np.asarray(data[[ 'x', 'y' ]], dtype=np.float64)
+            if np.any(np.diff(self.data_times) < 0): raise ValueError()
+        except Exception:
+            self.data_times = None
+            self.data_pos   = None
+
         StdSettings.set_cursor_radius.connect(self.layer_changed)
         StdSettings.set_cursor_thickness.connect(self.layer_changed)
         StdSettings.set_cursor_color.connect(self.layer_changed)
@@ -30,6 +46,53 @@ class StdData2DLayer(Layer, Temporal):
         StdSettings.set_view_time_ahead.connect(self.layer_changed)
 
 
+    def get_view(self):
+        if not self.time or self.data_times is None: return None
+
+        # Frames within the view time window and the latest frame at or before the current time
+        start_idx = np.searchsorted(self.data_times, self.time - StdSettings.view_time_back, side='left')
+        end_idx   = np.searchsorted(self.data_times, self.time + StdSettings.view_time_ahead, side='right')
+        curr_idx  = np.searchsorted(self.data_times, self.time, side='right')
+
+        return start_idx, end_idx, curr_idx, StdSettings.view_time_back, StdSettings.view_time_ahead
+
+
+    def get_content_rect(self):
+        if self.ratio_x is None: return None
+
+        view = self.get_view()
+        if view is None: return None
+
+        start_idx, end_idx, curr_idx, _, _ = view
+        ratio  = np.asarray([ self.ratio_x, self.ratio_y ])
+        radius = StdSettings.cursor_radius
+
+        # Where each draw function puts its shapes, in scene px. Ellipses are sized by the radius in
+        # screen px but placed by the playfield position, so they aren't centered on the frames
+        if self.draw_func == StdLayers.StdReplayCursorLayer:
+            top_left = (self.data_pos[max(curr_idx - 1, 0) : curr_idx] - radius)*ratio
+            bottom_right = top_left + 2*radius
+        elif self.draw_func == StdLayers.StdReplayScatterLayer:
+            top_left = self.data_pos[start_idx : end_idx]*ratio
+            bottom_right = top_left + 2*radius
+        else:
+            top_left = self.data_pos[start_idx : end_idx]*ratio
+            bottom_right = top_left
+
+        if len(top_left) == 0:
+            return QRectF()
+
+        # Leave a pixel for the pen and one for anti-aliasing
+        min_x, min_y = np.min(top_left, axis=0) - 2
+        max_x, max_y = np.max(bottom_right, axis=0) + 2
+
+        return QRectF(min_x, min_y, max_x - min_x, max_y - min_y)
+
+
+    def area_resize_event(self, width, height):
+        self.set_ratio(width/Std.PLAYFIELD_WIDTH, height/Std.PLAYFIELD_HEIGHT)
+
+
     def paint(self, painter, option, widget):
         if not self.time: return
         painter.setPen(QColor(0, 0, 0, 255))
@@ -2,17 +2,37 @@ from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 
+from gui.objects.layer.layer import Layer
+
 
 class Scene(QGraphicsScene):
 
+    frame_interval = 16  # ms; Layer changes are repainted at most once per frame (~60 fps)
+
     def __init__(self):
         QGraphicsScene.__init__(self)
 
+        # Layers paint to the size of the view rather than their bounding rect, so don't let 
+        # the scene grow with the layers' content rects and scroll the view around
+        self.setSceneRect(0, 0, 1, 1)
+
+        self.dirty_layers = set()
+        self.dirty_all    = False
+        self.area         = None  # (width, height) of the area the scene is displayed in
+
+        self.render_timer = QTimer()
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(Scene.frame_interval)
+        self.render_timer.timeout.connect(self.render_layers)
+
 
     def add_layer(self, layer):
         print(self, layer)
         self.addItem(layer)
-        self.update()
+        if self.area is not None:
+            layer.area_resize_event(*self.area)
+
+        self.update_layers(layer)
 
         layer.layer_changed.connect(self.update_layers, inst=layer)
 
@@ -21,8 +41,65 @@ class Scene(QGraphicsScene):
         layer.layer_changed.disconnect(self.update_layers, inst=layer)
 
         self.removeItem(layer)
-        self.update()
+        self.update_layers()
+
+
+    def area_resize_event(self, width, height):
+        """
+        Called by the display when the area the scene is displayed in is resized. Layers get the new size
+        right away rather than when they get painted, because content rects from before the resize may be
+        out of view and would keep the layers from getting painted at all.
+        """
+        self.area = (width, height)
+
+        # Move content rects now too, so the repaint the display does for the resize doesn't leave layers out
+        for item in self.items():
+            if not isinstance(item, Layer): continue
+
+            item.area_resize_event(width, height)
+            item.update_content_rect()
+
+        self.update_layers()
 
 
     def update_layers(self, layer=None):
-        self.update()
\ No newline at end of file
+        """
+        Schedules a repaint of the layer. Changes made within the same frame are repainted together.
+        None repaints the entire scene.
+        """
+        if layer is None: self.dirty_all = True
+        else:             self.dirty_layers.add(layer)
+
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+
+
+    def render_layers(self):
+        """
+        Repaints what changed since the last frame. Only the areas the changed layers' content moved 
+        between are repainted, unless there is a visible layer that can't tell where its content is.
+        """
+        dirty_layers, self.dirty_layers = self.dirty_layers, set()
+        dirty_all,    self.dirty_all    = self.dirty_all, False
+
+        # Entire scene gets repainted, so every layer's content rect needs to be where its content is now
+        if dirty_all:
+            dirty_layers = [ item for item in self.items() if isinstance(item, Layer) ]
+
+        rects = [ layer.update_content_rect() for layer in dirty_layers if layer.scene() is self ]
+
+        # Anything not covered by a content rect would not get painted
+        all_known = all(isinstance(item, Layer) and item.content_rect is not None for item in self.items() if item.isVisible())
+
+        if dirty_all or not all_known or None in rects:
+            self.update()
+            return
+
+        if len(rects) == 0:
+            return
+
+        area = rects[0]
+        for rect in rects[1:]:
+            area = area.united(rect)
+
+        self.update(area)
\ No newline at end of file
@@ -1,24 +1,16 @@
-from .math_utils import bernstein
+import numpy as np
+
+from .math_utils import bernstein, binomialCoefficient
 from .pos import Pos
 
 
 class Bezier():
 
     def __init__(self, curve_points):
-        self.curve_points    = []
+        self.curve_points    = [ Pos(x, y) for x, y in Bezier.get_curve_array(curve_points).tolist() ]
         self.curve_distances = [ 0 ]
         self.total_distance  = 0
 
-        # Estimate the length of the curve
-        approx_length = 0
-        for i in range(len(curve_points) - 1):
-            approx_length += curve_points[i].distance_to(curve_points[i + 1])
-
-        # subdivide the curve
-        ncurve = int(approx_length / 4.0) + 2
-        for i in range(ncurve):
-            self.curve_points.append(Bezier.point_at(curve_points, float(i) / float(ncurve - 1)))
-
         # find the distance of each point from the previous point
         for i in range(1, len(curve_points)):
             self.curve_distances.append(curve_points[i].distance_to(curve_points[i - 1]))
@@ -40,6 +32,31 @@ class Bezier():
         return self.total_distance
     
 
+    @staticmethod
+    def get_curve_array(curve_points):
+        """
+        Subdivides the curve into points roughly 4 px apart
+
+        Parameters
+        ----------
+        curve_points : list
+            Control points of the curve as ``Pos`` objects
+
+        Returns
+        -------
+        numpy.array
+            (N, 2) array of [ x, y ] points along the curve
+        """
+        # Estimate the length of the curve
+        approx_length = 0
+        for i in range(len(curve_points) - 1):
+            approx_length += curve_points[i].distance_to(curve_points[i + 1])
+
+        # subdivide the curve
+        ncurve = int(approx_length / 4.0) + 2
+        return Bezier.points_at(curve_points, np.arange(ncurve) / float(ncurve - 1))
+
+
     @staticmethod
     def point_at(curve_points, t):
         c = Pos(0, 0)
@@ -49,4 +66,35 @@ class Bezier():
             b = bernstein(i, n - 1, t)
             c += Pos(curve_points[i].x * b, curve_points[i].y * b)
 
-        return c
\ No newline at end of file
+        return c
+
+
+    @staticmethod
+    def points_at(curve_points, t):
+        """
+        Same as ``Bezier.point_at``, but evaluates all of ``t`` at once. The Bernstein basis
+        is computed for all ``t`` per control point instead of per sample.
+
+        Parameters
+        ----------
+        curve_points : list
+            Control points of the curve as ``Pos`` objects
+
+        t : numpy.array
+            Points along the curve to evaluate, from 0.0 to 1.0
+
+        Returns
+        -------
+        numpy.array
+            (N, 2) array of [ x, y ] points on the curve
+        """
+        t = np.asarray(t, dtype=np.float64)
+        n = len(curve_points)
+
+        points = np.zeros((len(t), 2))
+        for i in range(n):
+            b = binomialCoefficient(n - 1, i) * (t**i) * ((1 - t)**(n - 1 - i))
+            points[:, 0] += curve_points[i].x * b
+            points[:, 1] += curve_points[i].y * b
+
+        return points
@@ -107,4 +107,86 @@ class NumpyUtils():
         diff = np.insert(np.diff(filtered), 0, 0)
 
         # output = curr_val - (curr_val - prev_val)/num_consecutive
-        return mask, filtered, filtered - diff*(1-mult)
\ No newline at end of file
+        return mask, filtered, filtered - diff*(1-mult)
+
+
+    @staticmethod
+    def bump_duplicates(lst):
+        """
+        Info: Makes integer values unique by bumping each value up to the next value that 
+              is not already taken by a value before it. Gives the same result as doing
+              ``while val in taken: val += 1`` for each value in order, but sorts instead 
+              of probing.
+        Example:
+            [in]:  [ 100, 100, 101, 50, 100 ]
+            [out]: [ 100, 101, 102, 50, 103 ]
+        """
+        lst = np.asarray(lst, dtype=np.int64)
+        
+        n = lst.shape[0]
+        if n == 0: return lst.copy()
+
+        # If values came in sorted order, each value goes to max(val, prev_val + 1). Sorting
+        # gives the right set of taken values regardless of the order values came in
+        order  = np.argsort(lst, kind='stable')
+        ranks  = np.arange(n)
+        bumped = np.maximum.accumulate(lst[order] - ranks) + ranks
+
+        # Values only compete with others within a run of consecutive taken values. Runs
+        # where nothing got bumped, or where values came in sorted order, are already right
+        run_start     = np.empty(n, dtype=bool)
+        run_start[0]  = True
+        run_start[1:] = np.diff(bumped) != 1
+
+        run_ids     = np.cumsum(run_start) - 1
+        is_bumped   = np.bincount(run_ids, weights=(bumped != lst[order])) > 0
+        is_unsorted = np.bincount(run_ids[1:], weights=((np.diff(order) < 0) & ~run_start[1:]), minlength=run_ids[-1] + 1) > 0
+        
+        out = np.empty(n, dtype=np.int64)
+        out[order] = bumped
+
+        # Redo the rest in the order values came in
+        starts = np.append(np.nonzero(run_start)[0], n)
+        for run_id in np.nonzero(is_bumped & is_unsorted)[0]:
+            idxs  = np.sort(order[starts[run_id] : starts[run_id + 1]])
+            taken = set()
+
+            for idx in idxs:
+                val = lst[idx]
+                while val in taken: val += 1
+                
+                taken.add(val)
+                out[idx] = val
+
+        return out
+
+
+    @staticmethod
+    def scan_states(transitions, init_state=0):
+        """
+        Info: Runs a finite state machine over a sequence of steps without looping over each step.
+              transitions[i, s] is the state step i goes to when it starts in state s. Transition
+              tables are composed by prefix doubling, so this takes log2(N) vectorized passes.
+              Returns the state each step starts in.
+        Example:
+            [in]:  [ [ 1, 1 ], [ 1, 0 ], [ 1, 0 ] ], init_state=0
+            [out]: [ 0, 1, 0 ]
+        """
+        transitions = np.asarray(transitions)
+
+        n = transitions.shape[0]
+        if n == 0: return np.empty(0, dtype=transitions.dtype)
+
+        # Each pass composes every table with the one `step` steps before it. Once step >= n,
+        # scan[i] maps the initial state to the state after step i
+        scan = transitions.copy()
+        step = 1
+        
+        while step < n:
+            scan[step:] = np.take_along_axis(scan[step:], scan[:-step], axis=1)
+            step *= 2
+
+        states     = np.empty(n, dtype=transitions.dtype)
+        states[0]  = init_state
+        states[1:] = scan[:-1, init_state]
+        return states
@@ -26,6 +26,16 @@ class Beatmap():
     GAMEMODE_CATCH = 2
     GAMEMODE_MANIA = 3
 
+    # Columns of Beatmap.hitobject_data
+    IDX_TIME         = 0
+    IDX_X            = 1
+    IDX_Y            = 2
+    IDX_TYPE         = 3
+    IDX_END_TIME     = 4
+    IDX_REPEAT       = 5
+    IDX_PIXEL_LENGTH = 6
+    NUM_COLS         = 7
+
     '''
     cs_changed        = pyqtSignal(float)
     ar_changed        = pyqtSignal()
@@ -86,6 +96,9 @@ class Beatmap():
         self.end_times         = []
         self.slider_tick_times = []
 
+        # Hitobjects as a (N, NUM_COLS) array when read without making hitobjects; see BeatmapIO.read_beatmap
+        self.hitobject_data = None
+
         self.bpm_min = float('inf')
         self.bpm_max = float('-inf')
 
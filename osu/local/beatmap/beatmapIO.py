@@ -1,8 +1,11 @@
+import io
+import hashlib
 import numpy as np
 from collections import OrderedDict
 
 from misc.math_utils import find
 from osu.local.beatmap.beatmap import Beatmap
+from osu.local.beatmap.beatmap_cache import BeatmapCache
 
 from osu.local.hitobject.hitobject import Hitobject
 
@@ -52,6 +55,17 @@ class BeatmapIO():
         SECTION_COLOURS      = 7
         SECTION_HITOBJECTS   = 8
 
+        HEADERS = {
+            '[General]'      : SECTION_GENERAL,
+            '[Editor]'       : SECTION_EDITOR,
+            '[Metadata]'     : SECTION_METADATA,
+            '[Difficulty]'   : SECTION_DIFFICULTY,
+            '[Events]'       : SECTION_EVENTS,
+            '[TimingPoints]' : SECTION_TIMINGPOINTS,
+            '[Colours]'      : SECTION_COLOURS,
+            '[HitObjects]'   : SECTION_HITOBJECTS,
+        }
+
 
     @staticmethod
     def init():
@@ -68,39 +82,81 @@ class BeatmapIO():
 
 
     """
-    Opens a beatmap file and reads it
+    Opens a beatmap file and reads it. If ``BeatmapCache.cache_dir`` is set, the parsed
+    beatmap is taken from the cache when the file was opened before.
 
     Args:
         filepath: (string) filepath to the beatmap file to load
     """
     @staticmethod
     def open_beatmap(filepath=None):
-        with open(filepath, 'rt', encoding='utf-8') as beatmap_file:
-            beatmap = BeatmapIO.load_beatmap(beatmap_file)
-        
+        with open(filepath, 'rb') as beatmap_file:
+            beatmap_data = beatmap_file.read()
+
+        md5 = hashlib.md5(beatmap_data).hexdigest()
+
+        beatmap = BeatmapCache.load_beatmap(md5)
+        if beatmap is not None:
+            return beatmap
+
+        beatmap = BeatmapIO.load_beatmap(io.TextIOWrapper(io.BytesIO(beatmap_data), encoding='utf-8'))
+        beatmap.metadata.beatmap_md5 = md5
+
+        BeatmapCache.save_beatmap(beatmap)
         return beatmap
 
 
+    """
+    Reads only what is needed out of a beatmap file. Reading stops once the requested
+    sections are read, and hitobjects are put in ``beatmap.hitobject_data`` instead of
+    being made into hitobjects unless ``make_hitobjects`` is set. Beatmaps read this way
+    are not cached.
+
+    Args:
+        filepath: (string) filepath to the beatmap file to read
+        sections: (list) BeatmapIO.Section values of the sections to read; None reads all
+        make_hitobjects: (bool) whether to make hitobjects or only read them into an array
+    """
+    @staticmethod
+    def read_beatmap(filepath, sections=None, make_hitobjects=False):
+        with open(filepath, 'rt', encoding='utf-8') as beatmap_file:
+            return BeatmapIO.load_beatmap(beatmap_file, sections, make_hitobjects)
+
+
     """
     Loads beatmap data
 
     Args:
         beatmap_file: (string) contents of the beatmap file
+        sections: (list) BeatmapIO.Section values of the sections to read; None reads all
+        make_hitobjects: (bool) whether to make hitobjects or only read them into ``beatmap.hitobject_data``
     """
     @staticmethod
-    def load_beatmap(beatmap_data):
+    def load_beatmap(beatmap_data, sections=None, make_hitobjects=True):
         beatmap = Beatmap()
+
+        read_hitobjects = sections is None or BeatmapIO.Section.SECTION_HITOBJECTS in sections
+
+        # Hitobjects depend on the gamemode, difficulty, and timing points
+        if sections is not None and read_hitobjects:
+            sections = set(sections) | { BeatmapIO.Section.SECTION_GENERAL, BeatmapIO.Section.SECTION_DIFFICULTY, BeatmapIO.Section.SECTION_TIMINGPOINTS }
+
+        hitobject_lines = None if make_hitobjects else []
         
-        BeatmapIO.__parse_beatmap_data(beatmap_data, beatmap)
+        BeatmapIO.__parse_beatmap_data(beatmap_data, beatmap, sections, hitobject_lines)
         BeatmapIO.__process_timing_points(beatmap)
 
-        if beatmap.gamemode == Beatmap.GAMEMODE_OSU or beatmap.gamemode == None:
-            BeatmapIO.__process_slider_timings(beatmap)
-            BeatmapIO.__process_hitobject_end_times(beatmap)
-            BeatmapIO.__process_slider_tick_times(beatmap)
+        if hitobject_lines is not None:
+            if read_hitobjects:
+                BeatmapIO.__process_hitobject_data(beatmap, hitobject_lines)
+        else:
+            if beatmap.gamemode == Beatmap.GAMEMODE_OSU or beatmap.gamemode == None:
+                BeatmapIO.__process_slider_timings(beatmap)
+                BeatmapIO.__process_hitobject_end_times(beatmap)
+                BeatmapIO.__process_slider_tick_times(beatmap)
 
-        if beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
-            BeatmapIO.__process_columns(beatmap)
+            if beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
+                BeatmapIO.__process_columns(beatmap)
 
         BeatmapIO.__validate(beatmap)
 
@@ -124,12 +180,16 @@ class BeatmapIO():
 
 
     """
+    Args:
+        filepath: (string) filepath to the beatmap file
+
     Returns:
-        MD5 checksum of the beatmap file
+        MD5 checksum of the beatmap file. This is what replays refer to the beatmap by
     """
     @staticmethod
-    def get_md5(beatmap):
-        pass
+    def get_md5(filepath):
+        with open(filepath, 'rb') as beatmap_file:
+            return hashlib.md5(beatmap_file.read()).hexdigest()
 
 
     @staticmethod
@@ -158,9 +218,9 @@ class BeatmapIO():
 
 
     @staticmethod
-    def __parse_beatmap_data(beatmap_data, beatmap):
+    def __parse_beatmap_data(beatmap_data, beatmap, sections=None, hitobject_lines=None):
         BeatmapIO.__parse_beatmap_file_format(beatmap_data, beatmap)
-        BeatmapIO.__parse_beatmap_content(beatmap_data, beatmap)
+        BeatmapIO.__parse_beatmap_content(beatmap_data, beatmap, sections, hitobject_lines)
 
         beatmap.metadata.name = beatmap.metadata.artist + ' - ' + beatmap.metadata.title + ' (' + beatmap.metadata.creator + ') ' + '[' + beatmap.metadata.version + ']'
 
@@ -175,27 +235,36 @@ class BeatmapIO():
 
 
     @staticmethod
-    def __parse_beatmap_content(beatmap_data, beatmap):
+    def __parse_beatmap_content(beatmap_data, beatmap, sections=None, hitobject_lines=None):
         if beatmap.metadata.beatmap_format == -1: return
 
-        section = BeatmapIO.Section.SECTION_NONE
-        line    = ''
+        section   = BeatmapIO.Section.SECTION_NONE
+        remaining = None if sections is None else set(sections)
+        line      = ''
         
         while True:
             line = beatmap_data.readline()
-
-            if line.strip() == '[General]':        section = BeatmapIO.Section.SECTION_GENERAL
-            elif line.strip() == '[Editor]':       section = BeatmapIO.Section.SECTION_EDITOR
-            elif line.strip() == '[Metadata]':     section = BeatmapIO.Section.SECTION_METADATA
-            elif line.strip() == '[Difficulty]':   section = BeatmapIO.Section.SECTION_DIFFICULTY
-            elif line.strip() == '[Events]':       section = BeatmapIO.Section.SECTION_EVENTS
-            elif line.strip() == '[TimingPoints]': section = BeatmapIO.Section.SECTION_TIMINGPOINTS
-            elif line.strip() == '[Colours]':      section = BeatmapIO.Section.SECTION_COLOURS
-            elif line.strip() == '[HitObjects]':   section = BeatmapIO.Section.SECTION_HITOBJECTS
-            elif line == '':               
+            if line == '':
                 return
-            else:
-                BeatmapIO.__parse_section(section, line, beatmap)
+
+            header = line.strip()
+            if header in BeatmapIO.Section.HEADERS:
+                # Stop reading once all of the requested sections are read
+                if remaining is not None:
+                    remaining.discard(section)
+                    if len(remaining) == 0: return
+
+                section = BeatmapIO.Section.HEADERS[header]
+                continue
+
+            if remaining is not None and section not in remaining:
+                continue
+
+            if section == BeatmapIO.Section.SECTION_HITOBJECTS and hitobject_lines is not None:
+                hitobject_lines.append(line)
+                continue
+
+            BeatmapIO.__parse_section(section, line, beatmap)
 
 
     @staticmethod
@@ -437,6 +506,49 @@ class BeatmapIO():
                 return
 
 
+    @staticmethod
+    def __process_hitobject_data(beatmap, hitobject_lines):
+        hitobject_lines = [ line.split(',') for line in hitobject_lines ]
+        hitobject_lines = [ data for data in hitobject_lines if len(data) >= 4 ]
+
+        hitobject_data = np.full((len(hitobject_lines), Beatmap.NUM_COLS), np.nan)
+        beatmap.hitobject_data = hitobject_data
+        if len(hitobject_lines) == 0: return
+
+        # Lines start with x, y, time, type
+        hitobject_data[:, [ Beatmap.IDX_X, Beatmap.IDX_Y, Beatmap.IDX_TIME, Beatmap.IDX_TYPE ]] = np.asarray([ data[:4] for data in hitobject_lines ], dtype=np.float64)
+        hitobject_data[:, Beatmap.IDX_END_TIME] = hitobject_data[:, Beatmap.IDX_TIME]
+
+        hitobject_types = hitobject_data[:, Beatmap.IDX_TYPE].astype(np.int64)
+        is_slider = (hitobject_types & Hitobject.SLIDER) > 0
+
+        for i in np.flatnonzero(hitobject_types & Hitobject.SPINNER):
+            hitobject_data[i, Beatmap.IDX_END_TIME] = float(hitobject_lines[i][5])
+
+        for i in np.flatnonzero(hitobject_types & Hitobject.MANIALONG):
+            hitobject_data[i, Beatmap.IDX_END_TIME] = float(hitobject_lines[i][5].split(':')[0])
+
+        slider_idxs = np.flatnonzero(is_slider)
+        if len(slider_idxs) == 0: return
+
+        hitobject_data[slider_idxs, Beatmap.IDX_REPEAT]       = [ float(hitobject_lines[i][6]) for i in slider_idxs ]
+        hitobject_data[slider_idxs, Beatmap.IDX_PIXEL_LENGTH] = [ float(hitobject_lines[i][7]) for i in slider_idxs ]
+
+        # Same as BeatmapIO.__process_slider_timings; slider end times are left as NaN without timing points
+        if len(beatmap.timing_points) == 0 or beatmap.difficulty.sm is None:
+            hitobject_data[slider_idxs, Beatmap.IDX_END_TIME] = np.nan
+            return
+
+        offsets = [ timing_point.offset for timing_point in beatmap.timing_points ]
+        timing_points = [ beatmap.timing_points[find(offsets, time)] for time in hitobject_data[slider_idxs, Beatmap.IDX_TIME] ]
+
+        bpms              = np.asarray([ timing_point.bpm for timing_point in timing_points ], dtype=np.float64)
+        slider_multipliers = np.asarray([ timing_point.slider_multiplier for timing_point in timing_points ], dtype=np.float64)
+
+        to_repeat_times = np.round(((-600.0/bpms) * hitobject_data[slider_idxs, Beatmap.IDX_PIXEL_LENGTH] * slider_multipliers) / (100.0 * beatmap.difficulty.sm))
+        hitobject_data[slider_idxs, Beatmap.IDX_END_TIME] = hitobject_data[slider_idxs, Beatmap.IDX_TIME] + to_repeat_times*hitobject_data[slider_idxs, Beatmap.IDX_REPEAT]
+
+
     @staticmethod
     def __process_timing_points(beatmap):
         beatmap.bpm_min = float('inf')
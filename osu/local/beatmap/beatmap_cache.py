@@ -0,0 +1,302 @@
+import os
+import json
+import numpy as np
+from collections import OrderedDict
+
+from misc.pos import Pos
+from osu.local.beatmap.beatmap import Beatmap
+from osu.local.hitobject.hitobject import Hitobject
+
+from osu.local.hitobject.std.std import Std
+from osu.local.hitobject.mania.mania import Mania
+
+from osu.local.hitobject.std.std_singlenote_hitobject import StdSingleNoteHitobject
+from osu.local.hitobject.std.std_holdnote_hitobject import StdHoldNoteHitobject
+from osu.local.hitobject.std.std_spinner_hitobject import StdSpinnerHitobject
+
+from osu.local.hitobject.mania.mania_singlenote_hitobject import ManiaSingleNoteHitobject
+from osu.local.hitobject.mania.mania_holdnote_hitobject import ManiaHoldNoteHitobject
+
+
+
+class BeatmapCache():
+    """
+    On-disk cache of parsed beatmaps and of arrays derived from them, keyed by the MD5 of the *.osu file.
+
+    Beatmaps are stored as *.npz files of flat arrays, so loading one skips all of the text parsing,
+    slider curve generation, and timing processing. Derived arrays, such as map data, are stored as
+    *.npy files next to it and are loaded memory mapped.
+
+    Example
+    ::
+        BeatmapCache.cache_dir = 'cache/beatmaps'
+
+        beatmap  = BeatmapIO.open_beatmap('download/osu/maps/map.osu')  # Parsed and cached the first time
+        map_data = StdMapData.get_cached_map_data(beatmap)              # Built and cached the first time
+    """
+
+    """
+    Directory cached beatmaps are kept in. None disables the cache
+    """
+    cache_dir = None
+
+    """
+    Version of the parsed beatmap data. Bump this when changes to BeatmapIO or to the hitobject IO
+    classes change what beatmaps parse to. Entries cached by other versions are then ignored.
+    """
+    PARSER_VERSION = 3
+
+    # Columns of the 'hitobjects' array
+    IDX_TYPE           = 0
+    IDX_TIME           = 1
+    IDX_X              = 2
+    IDX_Y              = 3
+    IDX_END_TIME       = 4
+    IDX_REPEAT         = 5
+    IDX_PIXEL_LENGTH   = 6
+    IDX_TO_REPEAT_TIME = 7
+    IDX_CURVE_TYPE     = 8
+    IDX_COLUMN         = 9
+    NUM_COLS           = 10
+
+    # Columns of the 'timing_points' array
+    TIMING_POINT_FIELDS = [ 'offset', 'beat_interval', 'inherited', 'meter', 'beat_length', 'bpm', 'slider_multiplier' ]
+
+    @staticmethod
+    def load_beatmap(md5):
+        """
+        Loads a cached beatmap
+
+        Parameters
+        ----------
+        md5 : str
+            MD5 of the *.osu file. See ``BeatmapIO.get_md5``
+
+        Returns
+        -------
+        Beatmap
+            The cached beatmap, or None if the cache is disabled or has no up to date entry for it
+        """
+        filepath = BeatmapCache.__get_filepath(md5, 'beatmap.npz')
+        if filepath is None or not os.path.isfile(filepath):
+            return None
+
+        try:
+            with np.load(filepath) as data:
+                arrays = { name : data[name] for name in data.files }
+        except (OSError, ValueError):
+            # Corrupted or partially written entry
+            return None
+
+        if int(arrays['version']) != BeatmapCache.PARSER_VERSION:
+            return None
+
+        return BeatmapCache.__arrays_to_beatmap(arrays)
+
+
+    @staticmethod
+    def save_beatmap(beatmap):
+        """
+        Saves a parsed beatmap to the cache. Does nothing if the cache is disabled.
+
+        Parameters
+        ----------
+        beatmap : Beatmap
+            Beatmap to cache. ``beatmap.metadata.beatmap_md5`` needs to be set
+        """
+        filepath = BeatmapCache.__get_filepath(beatmap.metadata.beatmap_md5, 'beatmap.npz')
+        if filepath is None:
+            return
+
+        arrays = BeatmapCache.__beatmap_to_arrays(beatmap)
+        BeatmapCache.__write(filepath, lambda f: np.savez(f, **arrays))
+
+
+    @staticmethod
+    def get_array(beatmap, name, func):
+        """
+        Gets an array derived from the beatmap from the cache. If it's not there yet, it's made
+        with ``func`` and saved. If the cache is disabled, this just returns ``func()``.
+
+        Parameters
+        ----------
+        beatmap : Beatmap
+            Beatmap the array is derived from. ``beatmap.metadata.beatmap_md5`` needs to be set
+
+        name : str
+            Name of the array. Change the name if what ``func`` returns changes
+
+        func : function
+            Makes the array from the beatmap. Takes no arguments
+
+        Returns
+        -------
+        numpy.array
+            The array. Cached arrays are memory mapped and read only
+        """
+        filepath = BeatmapCache.__get_filepath(beatmap.metadata.beatmap_md5, name + '.npy')
+        if filepath is None:
+            return func()
+
+        if os.path.isfile(filepath):
+            try: return np.load(filepath, mmap_mode='r')
+            except (OSError, ValueError): pass
+
+        array = np.asarray(func())
+        BeatmapCache.__write(filepath, lambda f: np.save(f, array))
+        return array
+
+
+    @staticmethod
+    def __get_filepath(md5, filename):
+        if BeatmapCache.cache_dir is None or not md5:
+            return None
+
+        return os.path.join(BeatmapCache.cache_dir, f'v{BeatmapCache.PARSER_VERSION}', md5[:2], f'{md5}.{filename}')
+
+
+    @staticmethod
+    def __write(filepath, write_func):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        # Write to a temporary file first, so other processes never see a partially written entry
+        tmp_filepath = f'{filepath}.{os.getpid()}.tmp'
+        with open(tmp_filepath, 'wb') as f:
+            write_func(f)
+
+        os.replace(tmp_filepath, filepath)
+
+
+    @staticmethod
+    def __beatmap_to_arrays(beatmap):
+        info = {
+            'gamemode'   : beatmap.gamemode,
+            'bpm_min'    : beatmap.bpm_min,
+            'bpm_max'    : beatmap.bpm_max,
+            'metadata'   : { name : value for name, value in vars(beatmap.metadata).items() if not name.startswith('_') },
+            'difficulty' : { name : value for name, value in vars(beatmap.difficulty).items() if not name.startswith('_') },
+        }
+
+        timing_points = np.asarray([
+            [ getattr(timing_point, field) for field in BeatmapCache.TIMING_POINT_FIELDS ] for timing_point in beatmap.timing_points
+        ], dtype=np.float64).reshape(-1, len(BeatmapCache.TIMING_POINT_FIELDS))
+
+        # Mania hitobjects are split into columns
+        if beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
+            hitobjects = [ (hitobject, column) for column in range(len(beatmap.hitobjects)) for hitobject in beatmap.hitobjects[column] ]
+        else:
+            hitobjects = [ (hitobject, -1) for hitobject in beatmap.hitobjects ]
+
+        hitobject_data = np.full((len(hitobjects), BeatmapCache.NUM_COLS), np.nan)
+        curve_points, gen_points, tick_times = [], [], []
+        curve_offsets, gen_offsets, tick_offsets = [ 0 ], [ 0 ], [ 0 ]
+
+        for i, (hitobject, column) in enumerate(hitobjects):
+            hitobject_data[i, BeatmapCache.IDX_TYPE]   = hitobject.hitobject_type
+            hitobject_data[i, BeatmapCache.IDX_TIME]   = hitobject.time
+            hitobject_data[i, BeatmapCache.IDX_X]      = hitobject.pos.x
+            hitobject_data[i, BeatmapCache.IDX_Y]      = hitobject.pos.y
+            hitobject_data[i, BeatmapCache.IDX_COLUMN] = column
+
+            if hasattr(hitobject, 'end_time'):
+                hitobject_data[i, BeatmapCache.IDX_END_TIME] = hitobject.end_time
+
+            if isinstance(hitobject, StdHoldNoteHitobject):
+                hitobject_data[i, BeatmapCache.IDX_REPEAT]         = hitobject.repeat
+                hitobject_data[i, BeatmapCache.IDX_PIXEL_LENGTH]   = hitobject.pixel_length
+                hitobject_data[i, BeatmapCache.IDX_TO_REPEAT_TIME] = hitobject.to_repeat_time
+                hitobject_data[i, BeatmapCache.IDX_CURVE_TYPE]     = ord(hitobject.curve_type)
+
+                curve_points += [ (pos.x, pos.y) for pos in hitobject.curve_points ]
+                gen_points   += hitobject.gen_points.tolist()
+                tick_times   += list(hitobject.tick_times)
+
+            curve_offsets.append(len(curve_points))
+            gen_offsets.append(len(gen_points))
+            tick_offsets.append(len(tick_times))
+
+        return {
+            'version'       : np.asarray(BeatmapCache.PARSER_VERSION),
+            'info'          : np.asarray(json.dumps(info)),
+            'timing_points' : timing_points,
+            'hitobjects'    : hitobject_data,
+            'curve_points'  : np.asarray(curve_points, dtype=np.int64).reshape(-1, 2),
+            'curve_offsets' : np.asarray(curve_offsets, dtype=np.int64),
+            'gen_points'    : np.asarray(gen_points, dtype=np.float64).reshape(-1, 2),
+            'gen_offsets'   : np.asarray(gen_offsets, dtype=np.int64),
+            'tick_times'    : np.asarray(tick_times, dtype=np.float64),
+            'tick_offsets'  : np.asarray(tick_offsets, dtype=np.int64),
+            'end_times'     : np.asarray(list(beatmap.end_times.items()) if isinstance(beatmap.end_times, dict) else [], dtype=np.float64).reshape(-1, 2),
+        }
+
+
+    @staticmethod
+    def __arrays_to_beatmap(arrays):
+        info = json.loads(str(arrays['info']))
+
+        beatmap = Beatmap()
+        beatmap.gamemode = info['gamemode']
+        beatmap.bpm_min  = info['bpm_min']
+        beatmap.bpm_max  = info['bpm_max']
+
+        for name, value in info['metadata'].items():
+            setattr(beatmap.metadata, name, value)
+
+        for name, value in info['difficulty'].items():
+            setattr(beatmap.difficulty, name, value)
+
+        for values in arrays['timing_points'].tolist():
+            timing_point = Beatmap.TimingPoint()
+            for field, value in zip(BeatmapCache.TIMING_POINT_FIELDS, values):
+                setattr(timing_point, field, value)
+
+            timing_point.inherited = bool(timing_point.inherited)
+            timing_point.meter     = int(timing_point.meter)
+            beatmap.timing_points.append(timing_point)
+
+        if beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
+            beatmap.hitobjects = [ [] for _ in range(int(beatmap.difficulty.cs)) ]
+
+        if beatmap.gamemode == Beatmap.GAMEMODE_OSU:
+            beatmap.end_times = OrderedDict((int(end_time), int(idx)) for end_time, idx in arrays['end_times'].tolist())
+
+        curve_points, curve_offsets = arrays['curve_points'].tolist(), arrays['curve_offsets']
+        gen_points, gen_offsets     = arrays['gen_points'], arrays['gen_offsets']
+        tick_times, tick_offsets    = arrays['tick_times'].tolist(), arrays['tick_offsets']
+
+        for i, values in enumerate(arrays['hitobjects'].tolist()):
+            hitobject_type = int(values[BeatmapCache.IDX_TYPE])
+
+            if beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
+                if Mania.is_hitobject_type(hitobject_type, Hitobject.MANIALONG): hitobject = ManiaHoldNoteHitobject()
+                else:                                                            hitobject = ManiaSingleNoteHitobject()
+            else:
+                if   Std.is_hitobject_type(hitobject_type, Hitobject.CIRCLE): hitobject = StdSingleNoteHitobject()
+                elif Std.is_hitobject_type(hitobject_type, Hitobject.SLIDER): hitobject = StdHoldNoteHitobject()
+                else:                                                         hitobject = StdSpinnerHitobject()
+
+            hitobject.hitobject_type = hitobject_type
+            hitobject.time           = int(values[BeatmapCache.IDX_TIME])
+            hitobject.pos            = Pos(int(values[BeatmapCache.IDX_X]), int(values[BeatmapCache.IDX_Y]))
+            hitobject.difficulty     = beatmap.difficulty
+
+            if hasattr(hitobject, 'end_time'):
+                hitobject.end_time = int(values[BeatmapCache.IDX_END_TIME])
+
+            if isinstance(hitobject, StdHoldNoteHitobject):
+                hitobject.repeat         = int(values[BeatmapCache.IDX_REPEAT])
+                hitobject.pixel_length   = values[BeatmapCache.IDX_PIXEL_LENGTH]
+                hitobject.to_repeat_time = int(values[BeatmapCache.IDX_TO_REPEAT_TIME])
+                hitobject.curve_type     = chr(int(values[BeatmapCache.IDX_CURVE_TYPE]))
+
+                # The first curve point is the slider's starting position
+                hitobject.curve_points = [ hitobject.pos ] + [ Pos(x, y) for x, y in curve_points[curve_offsets[i] + 1 : curve_offsets[i + 1]] ]
+                hitobject.gen_points   = gen_points[gen_offsets[i] : gen_offsets[i + 1]]
+                hitobject.tick_times   = tick_times[tick_offsets[i] : tick_offsets[i + 1]]
+
+            if beatmap.gamemode == Beatmap.GAMEMODE_MANIA:
+                beatmap.hitobjects[int(values[BeatmapCache.IDX_COLUMN])].append(hitobject)
+            else:
+                beatmap.hitobjects.append(hitobject)
+
+        return beatmap
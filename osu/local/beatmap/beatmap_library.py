@@ -0,0 +1,254 @@
+import os
+import io
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+import concurrent.futures
+
+from osu.local.beatmap.beatmap import Beatmap
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.hitobject.hitobject import Hitobject
+
+
+
+class BeatmapLibrary():
+    """
+    SQLite index of the *.osu files in an osu! Songs folder. Lets beatmaps be looked up by MD5,
+    like the ones in ``CollectionIO.collections`` and ``Replay.beatmap_hash``, without opening
+    every file in the folder.
+
+    Only files that are new or have changed since the last ``update`` are read, and those
+    are read in parallel. Hitobjects are read into arrays rather than made into hitobjects,
+    see ``BeatmapIO.read_beatmap``.
+
+    The library can be used from multiple threads; access to the index is serialized.
+
+    Example
+    ::
+        library = BeatmapLibrary('C:/osu!/Songs', 'cache/library.db')
+        library.update()
+
+        beatmap = library.open_beatmap(replay.beatmap_hash)
+    """
+
+    """
+    Attributes stored for each beatmap, in the order of the rows ``BeatmapLibrary.read_entry`` returns
+    """
+    FIELDS = [
+        'path', 'mtime', 'size', 'md5',
+        'gamemode', 'cs', 'ar', 'od', 'hp', 'bpm_min', 'bpm_max', 'length',
+        'num_circles', 'num_sliders', 'num_spinners', 'num_holds',
+        'artist', 'title', 'creator', 'version', 'beatmap_id', 'beatmapset_id'
+    ]
+
+    def __init__(self, songs_path, db_path):
+        if not os.path.exists(songs_path):
+            raise Exception(f'"{songs_path}" does not exist!')
+
+        self.songs_path = songs_path
+        # Shared with other threads, like the one ``ReplayIngester.watch`` starts; only used while holding ``self.lock``
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+
+        self.db.execute(f'CREATE TABLE IF NOT EXISTS beatmaps ({", ".join(self.FIELDS)}, PRIMARY KEY (path))')
+        self.db.execute('CREATE INDEX IF NOT EXISTS beatmaps_md5 ON beatmaps (md5)')
+        self.db.commit()
+
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+    def update(self, num_workers=None):
+        """
+        Brings the index up to date with the Songs folder. Beatmaps that are new or whose modification
+        time or size changed are read, and beatmaps no longer in the folder are removed.
+
+        Parameters
+        ----------
+        num_workers : int
+            Number of processes to read beatmaps with. None uses one per CPU, 1 reads them in this process
+
+        Returns
+        -------
+        (int, int)
+            Number of beatmaps read and number of beatmaps removed
+        """
+        with self.lock:
+            indexed = { row['path'] : (row['mtime'], row['size']) for row in self.db.execute('SELECT path, mtime, size FROM beatmaps') }
+
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(self.songs_path):
+            for filename in filenames:
+                if not filename.endswith('.osu'): continue
+
+                filepath = os.path.join(dirpath, filename)
+                stat = os.stat(filepath)
+                files[filepath] = (stat.st_mtime, stat.st_size)
+
+        changed = [ filepath for filepath, stat in files.items() if indexed.get(filepath) != stat ]
+        removed = [ filepath for filepath in indexed if filepath not in files ]
+
+        if num_workers == 1 or len(changed) < 2:
+            entries = map(BeatmapLibrary.read_entry, changed)
+            self.__store(entries, removed)
+        else:
+            with concurrent.futures.ProcessPoolExecutor(num_workers) as executor:
+                entries = executor.map(BeatmapLibrary.read_entry, changed, chunksize=32)
+                self.__store(entries, removed)
+
+        return len(changed), len(removed)
+
+
+    def get_beatmap(self, md5):
+        """
+        Parameters
+        ----------
+        md5 : str
+            MD5 of the *.osu file
+
+        Returns
+        -------
+        sqlite3.Row
+            The beatmap's indexed attributes, accessible by name like a dict. None if it's not in the library
+        """
+        with self.lock:
+            return self.db.execute('SELECT * FROM beatmaps WHERE md5 = ?', (md5, )).fetchone()
+
+
+    def get_path(self, md5):
+        """
+        Parameters
+        ----------
+        md5 : str
+            MD5 of the *.osu file
+
+        Returns
+        -------
+        str
+            Path to the *.osu file. None if it's not in the library
+        """
+        with self.lock:
+            row = self.db.execute('SELECT path FROM beatmaps WHERE md5 = ?', (md5, )).fetchone()
+        return None if row is None else row['path']
+
+
+    def get_paths(self, md5s):
+        """
+        Looks up many beatmaps at once, like the ones in a collection from ``CollectionIO.collections``
+
+        Parameters
+        ----------
+        md5s : list
+            MD5s of *.osu files
+
+        Returns
+        -------
+        list
+            Path to each *.osu file. None for ones not in the library
+        """
+        paths = {}
+        md5s  = list(md5s)
+
+        # SQLite limits the number of parameters a query can have
+        for i in range(0, len(md5s), 500):
+            chunk = md5s[i : i + 500]
+            query = f'SELECT md5, path FROM beatmaps WHERE md5 IN ({", ".join("?"*len(chunk))})'
+            with self.lock:
+                paths.update({ row['md5'] : row['path'] for row in self.db.execute(query, chunk) })
+
+        return [ paths.get(md5) for md5 in md5s ]
+
+
+    def open_beatmap(self, md5):
+        """
+        Parameters
+        ----------
+        md5 : str
+            MD5 of the *.osu file
+
+        Returns
+        -------
+        Beatmap
+            The beatmap loaded with ``BeatmapIO.open_beatmap``. None if it's not in the library
+        """
+        path = self.get_path(md5)
+        return None if path is None else BeatmapIO.open_beatmap(path)
+
+
+    def query(self, where='1', params=()):
+        """
+        Gets beatmaps matching an SQL condition on ``BeatmapLibrary.FIELDS``
+
+        Example
+        ::
+            library.query('gamemode = ? AND od >= ?', (Beatmap.GAMEMODE_MANIA, 8))
+
+        Returns
+        -------
+        list
+            sqlite3.Row of each matching beatmap
+        """
+        with self.lock:
+            return self.db.execute(f'SELECT * FROM beatmaps WHERE {where}', params).fetchall()
+
+
+    @staticmethod
+    def read_entry(filepath):
+        """
+        Reads a *.osu file into a row for the index. Files that fail to read are still
+        indexed by MD5, with None for their attributes.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the *.osu file
+
+        Returns
+        -------
+        tuple
+            Values of ``BeatmapLibrary.FIELDS``
+        """
+        stat = os.stat(filepath)
+        with open(filepath, 'rb') as beatmap_file:
+            data = beatmap_file.read()
+
+        entry = [ filepath, stat.st_mtime, stat.st_size, hashlib.md5(data).hexdigest() ]
+
+        try: beatmap = BeatmapIO.load_beatmap(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'), make_hitobjects=False)
+        except Exception:
+            return tuple(entry + [ None ]*(len(BeatmapLibrary.FIELDS) - len(entry)))
+
+        hitobject_data  = beatmap.hitobject_data
+        hitobject_types = hitobject_data[:, Beatmap.IDX_TYPE].astype(np.int64)
+
+        if len(hitobject_data) > 0:
+            length = np.nanmax(hitobject_data[:, [ Beatmap.IDX_TIME, Beatmap.IDX_END_TIME ]]) - np.nanmin(hitobject_data[:, Beatmap.IDX_TIME])
+        else:
+            length = 0
+
+        bpm_min = beatmap.bpm_min if np.isfinite(beatmap.bpm_min) else None
+        bpm_max = beatmap.bpm_max if np.isfinite(beatmap.bpm_max) else None
+
+        entry += [
+            beatmap.gamemode, beatmap.difficulty.cs, beatmap.difficulty.ar, beatmap.difficulty.od, beatmap.difficulty.hp, bpm_min, bpm_max, float(length),
+            int(np.count_nonzero(hitobject_types & Hitobject.CIRCLE)),
+            int(np.count_nonzero(hitobject_types & Hitobject.SLIDER)),
+            int(np.count_nonzero(hitobject_types & Hitobject.SPINNER)),
+            int(np.count_nonzero(hitobject_types & Hitobject.MANIALONG)),
+            beatmap.metadata.artist, beatmap.metadata.title, beatmap.metadata.creator, beatmap.metadata.version,
+            beatmap.metadata.beatmap_id, beatmap.metadata.beatmapset_id
+        ]
+
+        return tuple(entry)
+
+
+    def __store(self, entries, removed):
+        query = f'INSERT OR REPLACE INTO beatmaps VALUES ({", ".join("?"*len(self.FIELDS))})'
+
+        with self.lock, self.db:
+            self.db.executemany('DELETE FROM beatmaps WHERE path = ?', [ (filepath, ) for filepath in removed ])
+            self.db.executemany(query, entries)
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import *
@@ -41,7 +42,8 @@ class StdHoldNoteHitobject(Hitobject):
         self.to_repeat_time   = None
 
         self.curve_points = []  # Points that define slider in editor
-        self.gen_points   = []  # The rough generated slider curve
+        self.gen_points   = np.empty((0, 2))  # The rough generated slider curve; (N, 2) array of [ x, y ]
+        self.gen_lengths  = None  # Distance along the curve of each generated point; made on first use
         self.tick_times   = []  # Slider ticks/score points/aimpoints
 
         Hitobject.__init__(self)
@@ -52,7 +54,68 @@ class StdHoldNoteHitobject(Hitobject):
 
 
     def time_to_pos(self, time):
-        return self.percent_to_pos(self.time_to_percent(time))
+        x_pos, y_pos = self.times_to_pos([ time ])[0].tolist()
+        return Pos(x_pos, y_pos)
+
+
+    def times_to_pos(self, times):
+        """
+        Gets the slider's position at each of the given times. Positions are spaced by distance 
+        along the curve, which is ``pixel_length`` long, and go back and forth for each repeat.
+
+        Parameters
+        ----------
+        times : numpy.array
+            Times to get positions at
+
+        Returns
+        -------
+        numpy.array
+            (N, 2) array of [ x, y ] positions
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if len(self.gen_points) < 2:
+            pos = self.gen_points[-1] if len(self.gen_points) > 0 else (self.pos.x, self.pos.y)
+            return np.tile(np.asarray(pos, dtype=np.float64), (len(times), 1))
+
+        # How far along the slider each time is, in number of slides
+        duration = self.end_time - self.time
+        percent  = np.clip((times - self.time)/duration, 0.0, 1.0) if duration > 0 else np.zeros(len(times))
+        slides   = percent*max(self.repeat, 1)
+
+        # Repeats go back and forth along the curve
+        slides = np.fmod(slides, 2.0)
+        slides = np.where(slides > 1.0, 2.0 - slides, slides)
+
+        gen_lengths = self.get_curve_lengths()
+        length      = gen_lengths[-1] if self.pixel_length is None else self.pixel_length
+        dists       = slides*length
+
+        # Interpolate between the generated points the distances fall in. Distances past the
+        # end of the generated curve continue along the direction of its last segment
+        idxs = np.clip(np.searchsorted(gen_lengths, dists, side='right') - 1, 0, len(gen_lengths) - 2)
+        segment_lengths = gen_lengths[idxs + 1] - gen_lengths[idxs]
+
+        segment_percent = np.zeros(len(dists))
+        np.divide(dists - gen_lengths[idxs], segment_lengths, out=segment_percent, where=(segment_lengths > 0))
+
+        return self.gen_points[idxs] + (self.gen_points[idxs + 1] - self.gen_points[idxs])*segment_percent[:, None]
+
+
+    def get_curve_lengths(self):
+        """
+        Gets the distance along the generated curve of each point in ``gen_points``
+
+        Returns
+        -------
+        numpy.array
+            Cumulative lengths, starting at 0
+        """
+        if self.gen_lengths is None or len(self.gen_lengths) != len(self.gen_points):
+            segment_lengths  = np.hypot(*np.diff(self.gen_points, axis=0).T)
+            self.gen_lengths = np.concatenate(([ 0.0 ], np.cumsum(segment_lengths)))
+
+        return self.gen_lengths
 
 
     def percent_to_idx(self, percent):
@@ -67,11 +130,10 @@ class StdHoldNoteHitobject(Hitobject):
 
     def idx_to_pos(self, idx):
         if idx > len(self.gen_points) - 2:
-            return Pos(self.gen_points[-1].x, self.gen_points[-1].y)
+            return Pos(float(self.gen_points[-1, 0]), float(self.gen_points[-1, 1]))
 
         percent_point = float(int(idx)) - idx
-        x_pos = lerp(self.gen_points[idx].x, self.gen_points[idx + 1].x, percent_point)
-        y_pos = lerp(self.gen_points[idx].y, self.gen_points[idx + 1].y, percent_point)
+        x_pos, y_pos  = lerp(self.gen_points[idx], self.gen_points[idx + 1], percent_point).tolist()
 
         return Pos(x_pos, y_pos)
 
@@ -97,7 +159,8 @@ class StdHoldNoteHitobject(Hitobject):
 
 
     def raw_data(self):
-        return [ [ tick_time, (self.time_to_pos(tick_time).x, self.time_to_pos(tick_time).y) ] for tick_time in self.tick_times ]
+        tick_positions = self.times_to_pos(self.tick_times).tolist()
+        return [ [ tick_time, tuple(tick_pos) ] for tick_time, tick_pos in zip(self.tick_times, tick_positions) ]
 
 
     # TODO: make sure this is correct
@@ -120,8 +183,9 @@ class StdHoldNoteHitobject(Hitobject):
         painter.drawEllipse(pos_x, pos_y, 2*radius*ratio_x, 2*radius*ratio_y)
 
         try:
-            for i in range(len(self.gen_points) - 1):
-                painter.drawLine(self.gen_points[i].x*ratio_x, self.gen_points[i].y*ratio_y, self.gen_points[i + 1].x*ratio_x, self.gen_points[i + 1].y*ratio_y)
+            gen_points = (self.gen_points*(ratio_x, ratio_y)).tolist()
+            for i in range(len(gen_points) - 1):
+                painter.drawLine(QLineF(*gen_points[i], *gen_points[i + 1]))
         except:
             print('Error drawing slider: ', self.gen_points)
 
@@ -144,11 +208,9 @@ class StdHoldNoteHitobject(Hitobject):
         painter.setPen(QColor(255, 0, 255, self.opacity*255))
         slider_tick_radius = 3
 
-        for tick_time in self.tick_times:
-            tick_pos = self.time_to_pos(tick_time)
-
-            pos_x = (tick_pos.x - slider_tick_radius)*ratio_x
-            pos_y = (tick_pos.y - slider_tick_radius)*ratio_y
+        for tick_x, tick_y in self.times_to_pos(self.tick_times).tolist():
+            pos_x = (tick_x - slider_tick_radius)*ratio_x
+            pos_y = (tick_y - slider_tick_radius)*ratio_y
             painter.drawEllipse(pos_x, pos_y, 2*slider_tick_radius*ratio_x, 2*slider_tick_radius*ratio_y)
 
 
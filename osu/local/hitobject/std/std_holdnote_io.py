@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 from misc.pos import Pos
 from misc.bezier import Bezier
@@ -55,7 +56,7 @@ class StdHoldNoteIO():
     
     @staticmethod
     def __process_curve_points(holdnote):
-        holdnote.gen_points  = []
+        holdnote.gen_points  = np.empty((0, 2))
 
         if holdnote.curve_type == StdHoldNoteHitobject.BEZIER:
             StdHoldNoteIO.__make_bezier(holdnote)
@@ -86,9 +87,9 @@ class StdHoldNoteIO():
         # Lines: generate a new curve for each sequential pair
         # ab  bc  cd  de  ef  fg
 
-        for i in range(len(self.curve_points) - 1):
-            bezier = Bezier([ self.curve_points[i], self.curve_points[i + 1] ])
-            self.gen_points += bezier.curve_points
+        gen_points = [ Bezier.get_curve_array([ self.curve_points[i], self.curve_points[i + 1] ]) for i in range(len(self.curve_points) - 1) ]
+        if len(gen_points) > 0:
+            self.gen_points = np.concatenate(gen_points)
 
 
     @staticmethod
@@ -96,6 +97,7 @@ class StdHoldNoteIO():
         # Beziers: splits points into different Beziers if has the same points (red points)
         # a b c - c d - d e f g
         point_section = []
+        gen_points    = []
 
         for i in range(len(self.curve_points)):
             point_section.append(self.curve_points[i])
@@ -105,9 +107,11 @@ class StdHoldNoteIO():
 
             # If we reached a red point or the end of the point list, then segment the bezier
             if segment_bezier:
-                self.gen_points += Bezier(point_section).curve_points
+                gen_points.append(Bezier.get_curve_array(point_section))
                 point_section = []
 
+        self.gen_points = np.concatenate(gen_points)
+
 
     @staticmethod
     def __make_circumscribed(holdnote):
@@ -155,9 +159,7 @@ class StdHoldNoteIO():
         step = holdnote.pixel_length / 5  # 5 = CURVE_POINTS_SEPERATION
         len = int(step) + 1
 
-        for i in range(len):
-            ang = lerp(start_angle, end_angle, i/step)
-            xy  = Pos(math.cos(ang)*radius + circle_center.x, math.sin(ang)*radius + circle_center.y)
-            holdnote.gen_points.append(Pos(xy.x, xy.y))
+        ang = lerp(start_angle, end_angle, np.arange(len)/step)
+        holdnote.gen_points = np.column_stack((np.cos(ang)*radius + circle_center.x, np.sin(ang)*radius + circle_center.y))
         
-        return True
\ No newline at end of file
+        return True
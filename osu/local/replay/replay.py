@@ -1,11 +1,12 @@
 import math
 import osrparse
 import lzma
+import numpy as np
 
 from osu.local.hitobject.std.std import Std
 from osu.local.hitobject.mania.mania import Mania
 
-from osrparse.replay import ReplayEvent
+from osu.local.replay.replay_frames import ReplayFrames
 from osrparse.enums import GameMode
 from osu.local.enums import Mod
 from misc.math_utils import find
@@ -15,11 +16,56 @@ from misc.math_utils import find
 #         https://github.com/ppy/osu/blob/master/osu.Game/Scoring/Legacy/LegacyScoreParser.cs#L78
 class Replay(osrparse.replay.Replay):
 
-    def __init__(self, replay_data):
+    def __init__(self, replay_data, lazy=False):
+        """
+        Parameters
+        ----------
+        replay_data : bytes
+            Contents of the *.osr file
+
+        lazy : bool
+            If True, only the header (player, mods, score, beatmap hash, etc) is parsed right away.
+            The compressed frame stream is kept and only decompressed and parsed on first access 
+            to ``play_data``, ``event_times``, or ``mania_keys``
+        """
+        self.__lazy       = lazy
+        self.__frame_data = None
+        self.__play_data  = None
+        self.__mania_keys = None
+
         osrparse.replay.Replay.__init__(self, replay_data)
-        self.event_times = []
 
-        self.__process_event_times()
+
+    @property
+    def play_data(self):
+        if self.__frame_data is not None:
+            self.__parse_frame_data()
+        return self.__play_data
+
+
+    @play_data.setter
+    def play_data(self, play_data):
+        self.__play_data = play_data
+
+
+    @property
+    def event_times(self):
+        # Frame times get accumulated when the frames are parsed
+        return self.play_data.t
+
+
+    @property
+    def mania_keys(self):
+        if self.__frame_data is not None:
+            self.__parse_frame_data()
+        return self.__mania_keys
+
+
+    def is_loaded(self):
+        """
+        Whether the frame stream has been parsed into ``play_data`` yet
+        """
+        return self.__frame_data is None
 
 
     def is_md5_match(self, md5_hash):
@@ -78,8 +124,6 @@ class Replay(osrparse.replay.Replay):
 
 
     def get_event_times(self):
-        if not self.event_times:
-            self.__process_event_times()
         return self.event_times
 
 
@@ -154,25 +198,33 @@ class Replay(osrparse.replay.Replay):
     # Because library doesn't support non std gamemodes
     def parse_play_data(self, replay_data):
         offset_end = self.offset + self.__replay_length
-        datastring = lzma.decompress(replay_data[self.offset : offset_end], format=lzma.FORMAT_AUTO).decode('ascii')[:-1]
+        self.__frame_data = bytes(replay_data[self.offset : offset_end])
         self.offset = offset_end
 
-        events = [ eventstring.split('|') for eventstring in datastring.split(',') ]
+        if not self.__lazy:
+            self.__parse_frame_data()
 
+
+    def __parse_frame_data(self):
+        datastring = lzma.decompress(self.__frame_data, format=lzma.FORMAT_AUTO)
+
+        # Frames are ascii "dt|x|y|keys," entries. Parse all of the values in one go and split them into columns
+        values = np.fromstring(datastring.replace(b'|', b','), dtype=np.float64, sep=',')
+        if len(values) % 4 != 0:
+            #TODO: Replace with custom exception
+            raise Exception(f'Invalid replay\nFrame data has {len(values)} values, which is not a multiple of 4')
+
+        # Drop the frame holding the RNG seed
+        values = values.reshape(-1, 4)
+        values = values[values[:, 0] != -12345]
+
+        dt, x, y, keys = values.T
         if self.game_mode == GameMode.Standard and Mod.HardRock in self.mod_combination:
-            self.play_data = [ ReplayEvent(int(event[0]), float(event[1]), Std.PLAYFIELD_HEIGHT - float(event[2]), int(event[3])) for event in events if int(event[0]) != -12345 ]
-        else:
-            self.play_data = [ ReplayEvent(int(event[0]), float(event[1]), float(event[2]), int(event[3])) for event in events if int(event[0]) != -12345 ]
+            y = Std.PLAYFIELD_HEIGHT - y
+
+        self.__play_data  = ReplayFrames(dt, x, y, keys)
+        self.__frame_data = None
         
         if self.game_mode == GameMode.Osumania:
             # Calculate number of keys used in the replay for mania
-            largest_key_event = max(self.play_data, key=lambda event: event.x)
-            self.mania_keys = int(math.log(largest_key_event.x, 2)/2)
-        
-
-    def __process_event_times(self):
-        time = 0
-        for frame in self.play_data:
-            time += frame.time_since_previous_action
-            frame.t = time
-            self.event_times.append(time)
\ No newline at end of file
+            self.__mania_keys = int(math.log(self.__play_data.x.max(), 2)/2)
\ No newline at end of file
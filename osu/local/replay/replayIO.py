@@ -10,11 +10,12 @@ class ReplayIO():
 
     Args:
         filepath: (string) filepath to the replay file to load
+        lazy: (bool) only read the header right away and decode the replay frames on first access to play_data
     """
     @staticmethod
-    def open_replay(filepath=None):
+    def open_replay(filepath=None, lazy=False):
         with open(filepath, 'rb') as replay_data:
-            replay = Replay(replay_data.read())
+            replay = Replay(replay_data.read(), lazy)
 
         return replay
 
@@ -24,10 +25,11 @@ class ReplayIO():
 
     Args:
         replay_data: (string) contents of the replay file
+        lazy: (bool) only read the header right away and decode the replay frames on first access to play_data
     """
     @staticmethod
-    def load_replay(replay_data):
-        return Replay(replay_data)
+    def load_replay(replay_data, lazy=False):
+        return Replay(replay_data, lazy)
 
 
     """
@@ -0,0 +1,81 @@
+import numpy as np
+
+from osrparse.replay import ReplayEvent
+
+
+
+class ReplayFrames():
+    """
+    Replay frames stored as numpy columns instead of one ``ReplayEvent`` per frame.
+
+    Supports ``len``, indexing, slicing, and iteration like the list of ``ReplayEvent``
+    that osrparse gives. ``ReplayEvent`` objects are only made for the frames that get
+    accessed that way, and they read and write through to the columns.
+
+    Columns
+    -------
+    dt : numpy.array
+        Time since previous frame
+
+    t : numpy.array
+        Time of frame
+
+    x : numpy.array
+        Cursor x position. Holds the pressed keys bit flags for mania
+
+    y : numpy.array
+        Cursor y position
+
+    keys : numpy.array
+        Pressed keys bit flags
+    """
+
+    def __init__(self, dt, x, y, keys, t=None):
+        self.dt   = np.asarray(dt, dtype=np.int64)
+        self.x    = np.asarray(x, dtype=np.float64)
+        self.y    = np.asarray(y, dtype=np.float64)
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self.t    = np.cumsum(self.dt) if t is None else np.asarray(t, dtype=np.int64)
+
+
+    def __len__(self):
+        return len(self.dt)
+
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return ReplayFrames(self.dt[idx], self.x[idx], self.y[idx], self.keys[idx], self.t[idx])
+
+        if idx < 0: idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('replay frame index out of range')
+
+        return ReplayFrame(self, idx)
+
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield ReplayFrame(self, idx)
+
+
+
+def _column(name, cast):
+    def get(self):        return cast(getattr(self._frames, name)[self._idx])
+    def set(self, value): getattr(self._frames, name)[self._idx] = value
+    return property(get, set)
+
+
+class ReplayFrame(ReplayEvent):
+    """
+    ``ReplayEvent`` of one frame in ``ReplayFrames``. Values are read from and written to the columns.
+    """
+
+    def __init__(self, frames, idx):
+        self._frames = frames
+        self._idx    = idx
+
+    time_since_previous_action = _column('dt', int)
+    t                          = _column('t', int)
+    x                          = _column('x', float)
+    y                          = _column('y', float)
+    keys_pressed               = _column('keys', int)
@@ -13,7 +13,7 @@ class SolveHitoffsets():
         beatmap_filepath = f'download/osu/maps/{beatmap_name}.osu'
         beatmap = BeatmapIO.open_beatmap(beatmap_filepath)
         print('Loading map data...')
-        map_data = StdMapData.get_aimpoint_data(beatmap.hitobjects)
+        map_data = StdMapData.get_map_data(beatmap.hitobjects)
 
         print('Loading replays...')
         replays = [ ReplayIO.open_replay(replay_filepath) for replay_filepath in replay_filepaths ]
@@ -21,17 +21,23 @@ class SolveHitoffsets():
         replay_data = [ StdReplayData.get_replay_data(replay.play_data) for replay in replays ]
 
         print('Loading scores...')
-        score_data_array = np.asarray([ StdScoreData.get_score_data(data, map_data) for data in replay_data ])
-        per_hitobject_score_data = StdScoreMetrics.get_per_hitobject_score_data(score_data_array)
+        score_data = StdScoreData.get_score_data_batch(replay_data, map_data, beatmap.difficulty.ar, beatmap.difficulty.cs)
+        times, hit_offsets = StdScoreMetrics.get_hit_offsets(score_data)
 
-        times, hit_offsets = StdScoreMetrics.solve_for_hit_offset_all(per_hitobject_score_data)
+        percents = [ 0.25, 0.5, 0.75, 0.95 ]
+        hit_offsets = StdScoreMetrics.solve_for_hit_offsets(hit_offsets, percents)
 
         win = pygraph.GraphicsWindow(title='Graph')
         win.resize(1000, 600)
 
-        hit_offset_plot = win.addPlot(title='50% Hit offsets')
-        hit_offset_plot = hit_offset_plot.plot(pen='y')
-        hit_offset_plot.setData(times, hit_offsets)
+        hit_offset_plot = win.addPlot(title='Hit offsets')
+        hit_offset_plot.addLegend()
+
+        # Hitobjects not enough players hit have infinite offsets, which can't be plotted
+        for i, (percent, color) in enumerate(zip(percents, [ 'g', 'y', 'r', 'm' ])):
+            is_finite = np.isfinite(hit_offsets[:, i])
+            hit_offset_plot.plot(times[is_finite], hit_offsets[is_finite, i], pen=color, name=f'{int(percent*100)}%')
+
         win.show()
 
         return win
\ No newline at end of file
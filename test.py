@@ -5,10 +5,13 @@ from unit_tests.test_callback import TestCallback
 from unit_tests.test_graph import TestGraph
 from unit_tests.test_graph_manager import TestGraphManager
 from unit_tests.test_manager_switch import TestManagerSwitch
+from unit_tests.test_scene import TestScene
 
 # File tests
 from unit_tests.test_beatmap import TestBeatmap
 from unit_tests.test_replay import TestReplay
+from unit_tests.test_beatmap_cache import TestBeatmapCache
+from unit_tests.test_beatmap_library import TestBeatmapLibrary
 
 # Visualization tests
 from unit_tests.test_std_replay_visualization import TestStdReplayVisualization
@@ -21,15 +24,20 @@ from unit_tests.test_mania_score_data_press import TestManiaScoreDataPress
 from unit_tests.test_mania_score_data import TestManiaScoreData
 
 from unit_tests.test_std_map_data import TestStdMapData
+from unit_tests.test_std_map_array import TestStdMapArray
 from unit_tests.test_std_map_metrics import TestStdMapMetrics
 from unit_tests.test_std_map_patterns import TestStdMapPatterns
 from unit_tests.test_std_replay_data import TestStdReplayData
+from unit_tests.test_std_replay_metrics import TestStdReplayMetrics
 from unit_tests.test_std_score_data_free import TestStdScoreDataFree
 from unit_tests.test_std_score_data_press import TestStdScoreDataPress
 from unit_tests.test_std_score_data_release import TestStdScoreDataRelease
 from unit_tests.test_std_score_data_hold import TestStdScoreDataHold
 from unit_tests.test_std_score_data import TestStdScoreData
+from unit_tests.test_std_score_data_array import TestStdScoreDataArray
 from unit_tests.test_std_score_metrics import TestStdScoreMetrics
+from unit_tests.test_score_pool import TestScorePool
+from unit_tests.test_replay_ingester import TestReplayIngester
 
 
 
@@ -1,7 +1,12 @@
 import unittest
+import numpy as np
 
 from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.beatmap.beatmap import Beatmap
 from osu.local.hitobject.std.std import Std
+from osu.local.hitobject.hitobject import Hitobject
+from misc.bezier import Bezier
+from misc.pos import Pos
 
 
 class TestBeatmap(unittest.TestCase):
@@ -130,4 +135,114 @@ class TestBeatmap(unittest.TestCase):
 
             result_obj_idxs = [ beatmap.hitobjects.index(result_obj) for result_obj in result_objs ] 
             for test_obj_idx in test_obj_idxs:
-                self.assertTrue(test_obj_idx in result_obj_idxs, 'Wrong object visible')
\ No newline at end of file
+                self.assertTrue(test_obj_idx in result_obj_idxs, 'Wrong object visible')
+
+    def test_slider_curves_std(self):
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu')
+
+        for hitobject in beatmap.hitobjects:
+            if not hitobject.is_hitobject_type(Hitobject.SLIDER):
+                continue
+
+            self.assertEqual(hitobject.gen_points.ndim, 2)
+            self.assertEqual(hitobject.gen_points.shape[1], 2)
+            self.assertGreater(len(hitobject.gen_points), 0)
+
+            # Generated curve starts at the slider's position
+            self.assertAlmostEqual(hitobject.gen_points[0, 0], hitobject.pos.x)
+            self.assertAlmostEqual(hitobject.gen_points[0, 1], hitobject.pos.y)
+
+        # Array evaluation of a curve matches evaluating it point by point
+        curve_points = [ Pos(0, 0), Pos(100, 300), Pos(250, -50), Pos(400, 120) ]
+        t = np.linspace(0, 1, 50)
+
+        points   = Bezier.points_at(curve_points, t)
+        expected = [ Bezier.point_at(curve_points, t_) for t_ in t ]
+
+        np.testing.assert_allclose(points[:, 0], [ pos.x for pos in expected ])
+        np.testing.assert_allclose(points[:, 1], [ pos.y for pos in expected ])
+
+
+    def test_slider_times_to_pos_std(self):
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/osu/test/abraker - unknown (abraker) [250ms].osu')
+
+        # Linear slider that's generated 512 px long, but only 490 px of it is part of the slider
+        slider = beatmap.hitobjects[5]
+        self.assertEqual(slider.curve_type, 'L')
+
+        start = np.asarray([ slider.curve_points[0].x, slider.curve_points[0].y ], dtype=np.float64)
+        end   = np.asarray([ slider.curve_points[1].x, slider.curve_points[1].y ], dtype=np.float64)
+        direction = (end - start)/np.linalg.norm(end - start)
+
+        times = np.linspace(slider.time, slider.end_time, 11)
+        positions = slider.times_to_pos(times)
+
+        for percent, pos in zip(np.linspace(0, 1, 11), positions):
+            np.testing.assert_allclose(pos, start + direction*slider.pixel_length*percent)
+
+        # Times outside of the slider are clamped to its ends
+        np.testing.assert_allclose(slider.times_to_pos([ slider.time - 100, slider.end_time + 100 ]), positions[[ 0, -1 ]])
+
+        # Same positions one at a time
+        for time, pos in zip(times, positions):
+            self.assertAlmostEqual(slider.time_to_pos(time).x, pos[0])
+            self.assertAlmostEqual(slider.time_to_pos(time).y, pos[1])
+
+        # Repeating sliders go back and forth
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu')
+        num_repeating = 0
+
+        for slider in beatmap.hitobjects:
+            if not slider.is_hitobject_type(Hitobject.SLIDER) or slider.repeat < 2:
+                continue
+
+            num_repeating += 1
+            slide_times = slider.time + np.arange(slider.repeat + 1)*slider.to_repeat_time
+            positions = slider.times_to_pos(slide_times)
+
+            np.testing.assert_allclose(positions[0::2], np.tile(positions[0], (len(positions[0::2]), 1)), atol=1e-6)
+            np.testing.assert_allclose(positions[1::2], np.tile(positions[1], (len(positions[1::2]), 1)), atol=1e-6)
+
+        self.assertGreater(num_repeating, 0)
+
+
+    def test_read_beatmap(self):
+        filepath = 'unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'
+        beatmap  = BeatmapIO.open_beatmap(filepath)
+
+        # Only metadata and difficulty
+        sections = [ BeatmapIO.Section.SECTION_METADATA, BeatmapIO.Section.SECTION_DIFFICULTY ]
+        header = BeatmapIO.read_beatmap(filepath, sections)
+
+        self.assertEqual(header.metadata.name, beatmap.metadata.name)
+        self.assertEqual(header.difficulty.cs, beatmap.difficulty.cs)
+        self.assertEqual(header.difficulty.od, beatmap.difficulty.od)
+        self.assertEqual(len(header.timing_points), 0)
+        self.assertEqual(len(header.hitobjects), 0)
+        self.assertIsNone(header.hitobject_data)
+
+        # Hitobjects read into an array
+        sections = [ BeatmapIO.Section.SECTION_HITOBJECTS ]
+        columnar = BeatmapIO.read_beatmap(filepath, sections)
+
+        self.assertEqual(len(columnar.hitobjects), 0)
+        self.assertEqual(columnar.hitobject_data.shape, (len(beatmap.hitobjects), Beatmap.NUM_COLS))
+
+        for hitobject, data in zip(beatmap.hitobjects, columnar.hitobject_data):
+            self.assertEqual(data[Beatmap.IDX_TIME], hitobject.time)
+            self.assertEqual(data[Beatmap.IDX_X], hitobject.pos.x)
+            self.assertEqual(data[Beatmap.IDX_Y], hitobject.pos.y)
+            self.assertEqual(data[Beatmap.IDX_TYPE], hitobject.hitobject_type)
+
+            if hitobject.is_hitobject_type(Hitobject.CIRCLE):
+                self.assertEqual(data[Beatmap.IDX_END_TIME], hitobject.time)
+            else:
+                self.assertEqual(data[Beatmap.IDX_END_TIME], hitobject.end_time)
+
+            if hitobject.is_hitobject_type(Hitobject.SLIDER):
+                self.assertEqual(data[Beatmap.IDX_REPEAT], hitobject.repeat)
+                self.assertEqual(data[Beatmap.IDX_PIXEL_LENGTH], hitobject.pixel_length)
+
+        # Hitobjects made like open_beatmap does
+        full = BeatmapIO.read_beatmap(filepath, make_hitobjects=True)
+        self.assertEqual([ hitobject.time for hitobject in full.hitobjects ], [ hitobject.time for hitobject in beatmap.hitobjects ])
@@ -0,0 +1,96 @@
+import unittest
+import tempfile
+import shutil
+import hashlib
+import numpy as np
+
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.beatmap.beatmap_cache import BeatmapCache
+from osu.local.hitobject.hitobject import Hitobject
+from analysis.osu.std.map_data import StdMapData
+
+
+class TestBeatmapCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.parser_version = BeatmapCache.PARSER_VERSION
+        BeatmapCache.cache_dir = self.cache_dir
+
+
+    def tearDown(self):
+        BeatmapCache.cache_dir = None
+        BeatmapCache.PARSER_VERSION = self.parser_version
+        shutil.rmtree(self.cache_dir)
+
+
+    def test_md5(self):
+        filepath = 'unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'
+        with open(filepath, 'rb') as beatmap_file:
+            md5 = hashlib.md5(beatmap_file.read()).hexdigest()
+
+        self.assertEqual(BeatmapIO.get_md5(filepath), md5)
+        self.assertEqual(BeatmapIO.open_beatmap(filepath).metadata.beatmap_md5, md5)
+        self.assertEqual(BeatmapIO.open_beatmap(filepath).metadata.beatmap_md5, md5)
+
+
+    def test_std_round_trip(self):
+        filepath = 'unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'
+
+        parsed = BeatmapIO.open_beatmap(filepath)
+        self.assertIsNotNone(BeatmapCache.load_beatmap(BeatmapIO.get_md5(filepath)))
+
+        cached = BeatmapIO.open_beatmap(filepath)
+        self.assertEqual(cached.metadata.title, parsed.metadata.title)
+        self.assertEqual(cached.difficulty.cs, parsed.difficulty.cs)
+        self.assertEqual(len(cached.timing_points), len(parsed.timing_points))
+        self.assertEqual(len(cached.hitobjects), len(parsed.hitobjects))
+
+        for parsed_hitobject, cached_hitobject in zip(parsed.hitobjects, cached.hitobjects):
+            self.assertEqual(cached_hitobject.hitobject_type, parsed_hitobject.hitobject_type)
+            self.assertEqual(cached_hitobject.time, parsed_hitobject.time)
+            self.assertEqual(cached_hitobject.pos.x, parsed_hitobject.pos.x)
+            self.assertEqual(cached_hitobject.pos.y, parsed_hitobject.pos.y)
+
+            if parsed_hitobject.is_hitobject_type(Hitobject.SLIDER):
+                self.assertEqual(cached_hitobject.get_aimpoint_times(), parsed_hitobject.get_aimpoint_times())
+
+        parsed_map_data = StdMapData.get_map_data(parsed.hitobjects)
+        cached_map_data = StdMapData.get_map_data(cached.hitobjects)
+        np.testing.assert_array_equal(cached_map_data.values, parsed_map_data.values)
+
+
+    def test_mania_round_trip(self):
+        filepath = 'unit_tests/maps/mania/playable/Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu'
+
+        parsed = BeatmapIO.open_beatmap(filepath)
+        cached = BeatmapIO.open_beatmap(filepath)
+
+        self.assertEqual(len(cached.hitobjects), len(parsed.hitobjects))
+        for parsed_column, cached_column in zip(parsed.hitobjects, cached.hitobjects):
+            self.assertEqual([ note.time for note in cached_column ], [ note.time for note in parsed_column ])
+            self.assertEqual([ note.get_end_time() for note in cached_column ], [ note.get_end_time() for note in parsed_column ])
+
+
+    def test_version_invalidation(self):
+        filepath = 'unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'
+        md5 = BeatmapIO.get_md5(filepath)
+
+        BeatmapIO.open_beatmap(filepath)
+        self.assertIsNotNone(BeatmapCache.load_beatmap(md5))
+
+        BeatmapCache.PARSER_VERSION += 1
+        self.assertIsNone(BeatmapCache.load_beatmap(md5))
+
+
+    def test_cached_map_data(self):
+        filepath = 'unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'
+        beatmap  = BeatmapIO.open_beatmap(filepath)
+
+        map_data = StdMapData.get_map_data(beatmap.hitobjects)
+        np.testing.assert_array_equal(StdMapData.get_cached_map_data(beatmap).values, map_data.values)
+
+        # Second time around the map array comes from disk
+        cached_array = BeatmapCache.get_array(beatmap, 'std_map_array', lambda: self.fail('map array was not cached'))
+        self.assertIsInstance(cached_array, np.memmap)
+        np.testing.assert_array_equal(StdMapData.get_cached_map_data(beatmap).values, map_data.values)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import unittest
+import tempfile
+
+from osu.local.beatmap.beatmap import Beatmap
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.beatmap.beatmap_library import BeatmapLibrary
+
+
+class TestBeatmapLibrary(unittest.TestCase):
+
+    MAPS = [
+        'unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu',
+        'unit_tests/maps/osu/test/abraker - unknown (abraker) [250ms].osu',
+        'unit_tests/maps/mania/playable/Camellia - GHOST (qqqant) [Collab PHANTASM [MX]].osu',
+    ]
+
+    def setUp(self):
+        self.tmp_dir    = tempfile.mkdtemp()
+        self.songs_path = os.path.join(self.tmp_dir, 'Songs')
+
+        for i, filepath in enumerate(TestBeatmapLibrary.MAPS):
+            os.makedirs(os.path.join(self.songs_path, str(i)))
+            shutil.copy(filepath, os.path.join(self.songs_path, str(i)))
+
+        self.library = BeatmapLibrary(self.songs_path, os.path.join(self.tmp_dir, 'library.db'))
+
+
+    def tearDown(self):
+        self.library.close()
+        shutil.rmtree(self.tmp_dir)
+
+
+    def test_index(self):
+        self.assertEqual(self.library.update(num_workers=2), (3, 0))
+
+        for filepath in TestBeatmapLibrary.MAPS:
+            md5   = BeatmapIO.get_md5(filepath)
+            entry = self.library.get_beatmap(md5)
+            self.assertEqual(os.path.basename(entry['path']), os.path.basename(filepath))
+            self.assertEqual(os.path.basename(self.library.get_path(md5)), os.path.basename(filepath))
+
+        md5     = BeatmapIO.get_md5(TestBeatmapLibrary.MAPS[0])
+        entry   = self.library.get_beatmap(md5)
+        beatmap = BeatmapIO.open_beatmap(TestBeatmapLibrary.MAPS[0])
+
+        self.assertEqual(entry['gamemode'], Beatmap.GAMEMODE_OSU)
+        self.assertEqual(entry['title'], beatmap.metadata.title)
+        self.assertEqual(entry['cs'], beatmap.difficulty.cs)
+        self.assertEqual(entry['od'], beatmap.difficulty.od)
+        self.assertEqual(entry['bpm_max'], beatmap.bpm_max)
+        self.assertEqual(entry['num_circles'] + entry['num_sliders'] + entry['num_spinners'], len(beatmap.hitobjects))
+        self.assertEqual(entry['length'], beatmap.hitobjects[-1].get_end_time() - beatmap.hitobjects[0].time)
+
+        entry = self.library.get_beatmap(BeatmapIO.get_md5(TestBeatmapLibrary.MAPS[2]))
+        self.assertEqual(entry['gamemode'], Beatmap.GAMEMODE_MANIA)
+        self.assertEqual(entry['num_circles'] + entry['num_holds'], 3004)
+
+        self.assertEqual(len(self.library.query('gamemode = ?', (Beatmap.GAMEMODE_OSU, ))), 2)
+        self.assertEqual(self.library.get_paths([ md5, 'not a md5' ])[1], None)
+        self.assertEqual(self.library.open_beatmap(md5).metadata.title, beatmap.metadata.title)
+        self.assertIsNone(self.library.get_beatmap('not a md5'))
+
+
+    def test_incremental_update(self):
+        self.assertEqual(self.library.update(num_workers=1), (3, 0))
+        self.assertEqual(self.library.update(num_workers=1), (0, 0))
+
+        # Change one map and remove another
+        filepath = os.path.join(self.songs_path, '0', os.path.basename(TestBeatmapLibrary.MAPS[0]))
+        with open(filepath, 'a', encoding='utf-8') as beatmap_file:
+            beatmap_file.write('\n')
+
+        os.remove(os.path.join(self.songs_path, '1', os.path.basename(TestBeatmapLibrary.MAPS[1])))
+
+        self.assertEqual(self.library.update(num_workers=1), (1, 1))
+        self.assertEqual(len(self.library.query()), 2)
+
+        self.assertIsNone(self.library.get_beatmap(BeatmapIO.get_md5(TestBeatmapLibrary.MAPS[0])))
+        self.assertIsNotNone(self.library.get_beatmap(BeatmapIO.get_md5(filepath)))
@@ -1,7 +1,10 @@
 import unittest
+import numpy as np
+import pandas as pd
 
 from osu.local.beatmap.beatmapIO import BeatmapIO
 from osu.local.replay.replayIO import ReplayIO
+from osu.local.replay.replay_frames import ReplayFrames
 from analysis.osu.mania.action_data import ManiaActionData
 
 
@@ -192,4 +195,51 @@ class TestManiaActionData(unittest.TestCase):
         action_data = ManiaActionData.get_map_data(beatmap.hitobjects)
 
         # TODO: test functionality
-        ManiaActionData.idx_next_action(action_data, 0, ManiaActionData.PRESS)
\ No newline at end of file
+        ManiaActionData.idx_next_action(action_data, 0, ManiaActionData.PRESS)
+
+    def test_fill_holds_states(self):
+        F, P, H, R = ManiaActionData.FREE, ManiaActionData.PRESS, ManiaActionData.HOLD, ManiaActionData.RELEASE
+
+        action_data = pd.DataFrame(np.asarray([
+            [ P, F ],
+            [ F, P ],
+            [ R, F ],
+            [ F, R ],
+        ], dtype=np.float64))
+
+        ManiaActionData.fill_holds(action_data)
+        np.testing.assert_array_equal(action_data.values, [
+            [ P, F ],
+            [ H, P ],
+            [ R, H ],
+            [ F, R ],
+        ])
+
+        with self.assertRaises(ValueError):
+            ManiaActionData.fill_holds(pd.DataFrame(np.asarray([ [ P ], [ P ], [ R ] ], dtype=np.float64)))
+
+        with self.assertRaises(ValueError):
+            ManiaActionData.fill_holds(pd.DataFrame(np.asarray([ [ R ], [ P ], [ R ] ], dtype=np.float64)))
+
+
+    def test_get_replay_data_states(self):
+        F, P, H, R = ManiaActionData.FREE, ManiaActionData.PRESS, ManiaActionData.HOLD, ManiaActionData.RELEASE
+
+        # Keys are bit flags in the x position
+        replay_t    = np.asarray([ 0, 10, 20, 30, 30, 40, 50 ])
+        replay_keys = np.asarray([ 0, 1,  1,  3,  2,  2,  0  ])
+        frames = ReplayFrames(np.diff(replay_t, prepend=0), replay_keys, np.zeros(len(replay_t)), np.zeros(len(replay_t)))
+
+        replay_data = ManiaActionData.get_replay_data(frames, 2)
+        self.assertEqual(list(replay_data.index), [ 10, 30, 50 ])
+
+        # Later frame at the same time replaces the earlier one
+        np.testing.assert_array_equal(replay_data.values, [
+            [ P, F ],
+            [ R, H ],
+            [ F, R ],
+        ])
+
+        # Same result from a list of replay events
+        replay_data_list = ManiaActionData.get_replay_data(list(frames), 2)
+        pd.testing.assert_frame_equal(replay_data_list, replay_data)
@@ -1,7 +1,9 @@
 import unittest
+import numpy as np
 
 from osu.local.beatmap.beatmapIO import BeatmapIO
 from analysis.osu.mania.action_data import ManiaActionData
+from analysis.osu.mania.map_data import ManiaMapData
 from analysis.osu.mania.map_metrics import ManiaMapMetrics
 
 
@@ -26,6 +28,49 @@ class TestManiaMetricData(unittest.TestCase):
         press_rate = ManiaMapMetrics.calc_press_rate(action_data)
 
 
+    def test_calc_press_rate_windows(self):
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/mania/playable/DJ Genericname - Dear You (Taiwan-NAK) [S.Star\'s 4K HD+].osu')
+        action_data = ManiaActionData.get_map_data(beatmap.hitobjects)
+
+        times, press_rate = ManiaMapMetrics.calc_press_rate(action_data, window_ms=[ 250, 1000 ])
+        self.assertEqual(press_rate.shape, (len(action_data), 2))
+
+        # Same as counting presses in each window one by one
+        for i, window_ms in enumerate([ 250, 1000 ]):
+            num_presses = [ (action_data.loc[timing - window_ms : timing] == ManiaActionData.PRESS).to_numpy().sum() for timing in times[::50] ]
+            np.testing.assert_array_equal(press_rate[::50, i], 1000*np.asarray(num_presses)/window_ms)
+
+        times, max_press_rate = ManiaMapMetrics.calc_max_press_rate_per_col(action_data, window_ms=1000)
+        num_presses = [ (action_data.loc[timing - 1000 : timing] == ManiaActionData.PRESS).to_numpy().sum(axis=0).max() for timing in times[::50] ]
+        np.testing.assert_array_equal(max_press_rate[::50], 1000*np.asarray(num_presses)/1000)
+
+
+    def test_calc_window_counts(self):
+        event_times = np.asarray([ 0, 100, 100, 250, 400 ])
+        weights     = np.asarray([ [ 1, 0 ], [ 0, 1 ], [ 1, 1 ], [ 0, 1 ], [ 1, 0 ] ])
+
+        # Events at both ends of the window are counted
+        counts = ManiaMapMetrics.calc_window_counts(event_times, [ 100, 250, 500 ], 150)
+        np.testing.assert_array_equal(counts, [ 3, 3, 1 ])
+
+        counts = ManiaMapMetrics.calc_window_counts(event_times, [ 100, 250, 500 ], [ 0, 150 ], weights)
+        self.assertEqual(counts.shape, (3, 2, 2))
+        np.testing.assert_array_equal(counts[:, :, 0], [ [ 1, 2 ], [ 0, 1 ], [ 0, 0 ] ])
+        np.testing.assert_array_equal(counts[:, :, 1], [ [ 2, 2 ], [ 1, 3 ], [ 1, 0 ] ])
+
+
+    def test_calc_avg_nps(self):
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/mania/test/chords_250ms.osu')
+        hitobject_data = ManiaMapData.get_hitobject_data(beatmap.hitobjects)
+
+        # Notes every 250 ms in every column; a 1000 ms window holds 5 of them
+        self.assertEqual(ManiaMapMetrics.calc_avg_nps_col(hitobject_data, 2000, 1000, 0), 5)
+        self.assertEqual(ManiaMapMetrics.calc_avg_nps(hitobject_data, 2000, 1000), 5)
+
+        avg_nps = ManiaMapMetrics.calc_avg_nps(hitobject_data, [ 1000, 2000, 3000 ], [ 500, 1000 ])
+        np.testing.assert_array_equal(avg_nps, [ [ 6, 5 ], [ 6, 5 ], [ 6, 5 ] ])
+
+
     def test_calc_note_intervals(self):
         beatmap = BeatmapIO.open_beatmap('unit_tests\\maps\\mania\\test\\chords_250ms.osu')
         action_data = ManiaActionData.get_map_data(beatmap.hitobjects)
@@ -1,4 +1,6 @@
 import unittest
+import numpy as np
+import pandas as pd
 
 from osu.local.beatmap.beatmapIO import BeatmapIO
 from osu.local.replay.replayIO import ReplayIO
@@ -32,6 +34,43 @@ class TestManiaScoreData(unittest.TestCase):
         self.assertTrue(all((score_data['replay_t'] - score_data['map_t']).values == 0))
 
 
+    def test_get_score_data_columns(self):
+        map_data = pd.DataFrame([
+            [ ManiaActionData.PRESS,   ManiaActionData.FREE    ],
+            [ ManiaActionData.RELEASE, ManiaActionData.PRESS   ],
+            [ ManiaActionData.FREE,    ManiaActionData.RELEASE ],
+            [ ManiaActionData.PRESS,   ManiaActionData.FREE    ],
+            [ ManiaActionData.RELEASE, ManiaActionData.FREE    ],
+            [ ManiaActionData.PRESS,   ManiaActionData.FREE    ],
+            [ ManiaActionData.RELEASE, ManiaActionData.FREE    ],
+        ], index=pd.Index([ 1000, 1001, 1500, 2000, 2001, 3000, 3001 ], name='time'), dtype=float)
+
+        replay_data = pd.DataFrame([
+            [ ManiaActionData.PRESS,   ManiaActionData.FREE    ],
+            [ ManiaActionData.RELEASE, ManiaActionData.PRESS   ],
+            [ ManiaActionData.FREE,    ManiaActionData.RELEASE ],
+            [ ManiaActionData.PRESS,   ManiaActionData.FREE    ],
+            [ ManiaActionData.RELEASE, ManiaActionData.FREE    ],
+            [ ManiaActionData.FREE,    ManiaActionData.PRESS   ],
+        ], index=pd.Index([ 1010, 1050, 1450, 2500, 2550, 3300 ], name='time'))
+
+        score_data = ManiaScoreData.get_score_data(map_data, replay_data)
+
+        # Notes that are never hit are missed at the first replay timing past their miss window, which
+        # can be from another column. The way early press at 2500 ms is ignored
+        np.testing.assert_array_equal(score_data.loc[0].values, [
+            [ 1010, 1000, ManiaScoreData.TYPE_HITP, 0 ],
+            [ 2500, 2000, ManiaScoreData.TYPE_MISS, 2 ],
+            [ 3300, 3000, ManiaScoreData.TYPE_MISS, 4 ],
+        ])
+        np.testing.assert_array_equal(score_data.loc[1].values, [
+            [ 1050, 1001, ManiaScoreData.TYPE_HITP, 0 ],
+        ])
+
+        # Scoring columns in separate processes gives the same result
+        pd.testing.assert_frame_equal(ManiaScoreData.get_score_data(map_data, replay_data, num_workers=2), score_data)
+
+
     def test_get_custom_score_data(self):
         # TODO: custom scoring parameters
         pass
@@ -126,8 +165,12 @@ class TestManiaScoreData(unittest.TestCase):
 
 
     def test_model_offset_prob(self):
-        # TODO
-        pass
+        # ~68%, ~95%, and ~99.7% of hits are within 1, 2, and 3 stdevs of the mean
+        probs = ManiaScoreData.model_offset_prob(0, 10, [ 10, 20, 30 ])
+        np.testing.assert_almost_equal(probs, [ 0.6827, 0.9545, 0.9973 ], decimal=4)
+
+        prob = ManiaScoreData.model_offset_prob(0, 10, 10)
+        self.assertEqual(prob, probs[0])
 
 
     def test_odds_some_tap_within(self):
@@ -141,15 +184,64 @@ class TestManiaScoreData(unittest.TestCase):
 
 
     def test_model_ideal_acc(self):
-        # TODO
-        pass
+        # Hits all within the MAX window
+        acc = ManiaScoreData.model_ideal_acc(0, 0.1, 100)
+        self.assertAlmostEqual(acc, 1.0)
+
+        # Accuracy goes down as the hits spread out
+        accs = ManiaScoreData.model_ideal_acc(0, [ 5, 20, 50 ], 100)
+        self.assertEqual(accs.shape, (3, ))
+        self.assertTrue(all(np.diff(accs) < 0))
+
+        for stdev, acc in zip([ 5, 20, 50 ], accs):
+            self.assertAlmostEqual(ManiaScoreData.model_ideal_acc(0, stdev, 100), acc)
 
 
     def test_model_num_hits(self):
-        # TODO
-        pass
+        num_hits = ManiaScoreData.model_num_hits(0, 0.1, 100)
+        np.testing.assert_almost_equal(num_hits, [ 100, 0, 0, 0, 0, 0 ])
+
+        num_hits = ManiaScoreData.model_num_hits([ 0, 10 ], [ 20, 40 ], 100)
+        self.assertEqual(len(num_hits), 6)
+        np.testing.assert_almost_equal(np.sum(num_hits, axis=0), [ 100, 100 ])
+
+
+    def test_model_stdev_from_acc(self):
+        target_acc = np.linspace(0.5, 0.999, 100)
+
+        stdevs = ManiaScoreData.model_stdev_from_acc(5, 1000, target_acc)
+        np.testing.assert_almost_equal(ManiaScoreData.model_ideal_acc(5, stdevs, 1000), target_acc)
+
+        # Accuracy is unreachable
+        stdev = ManiaScoreData.model_stdev_from_acc(5, 1000, 1.5)
+        self.assertTrue(np.isnan(stdev))
+
+        stdevs = ManiaScoreData.model_stdev_from_acc(5, 1000, [ -0.5, 0.9 ], max_stdev=10)
+        self.assertTrue(np.isnan(stdevs[0]))
+        self.assertTrue(np.isnan(stdevs[1]))
+
+        # Mean outside of the 300 window; a small spread puts every hit in the 200 window and widening it first
+        # raises accuracy. Only accuracies below the one of the smallest spread are fit
+        self.assertAlmostEqual(ManiaScoreData.model_ideal_acc(50, 1e-3, 1000), 2/3)
+        self.assertTrue(np.isnan(ManiaScoreData.model_stdev_from_acc(50, 1000, 0.9)))
+
+        stdevs = ManiaScoreData.model_stdev_from_acc(50, 1000, [ 0.5, 0.6 ])
+        np.testing.assert_almost_equal(ManiaScoreData.model_ideal_acc(50, stdevs, 1000), [ 0.5, 0.6 ])
 
 
     def test_odds_acc(self):
-        # TODO
-        pass
\ No newline at end of file
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/mania/playable/DJ Genericname - Dear You (Taiwan-NAK) [S.Star\'s 4K HD+].osu')
+        replay = ReplayIO.open_replay('unit_tests/replays/mania/abraker - DJ Genericname - Dear You [S.Star\'s 4K HD+] (2017-11-25) OsuMania.osr')
+
+        map_data = ManiaActionData.get_map_data(beatmap.hitobjects)
+        replay_data = ManiaActionData.get_replay_data(replay.play_data, beatmap.difficulty.cs)
+        score_data = ManiaScoreData.get_score_data(map_data, replay_data)
+
+        # Getting a higher accuracy is less likely
+        target_acc = np.linspace(0.99, 1.0, 11)
+        odds = ManiaScoreData.odds_acc(score_data, target_acc)
+
+        self.assertEqual(odds.shape, target_acc.shape)
+        self.assertTrue(all(np.diff(odds) < 0))
+        self.assertTrue(all((0 <= odds) & (odds <= 1)))
+        self.assertAlmostEqual(ManiaScoreData.odds_acc(score_data, target_acc[5]), odds[5])
\ No newline at end of file
@@ -1,6 +1,10 @@
 import unittest
+import numpy as np
+
+from osrparse.replay import ReplayEvent
 
 from osu.local.replay.replayIO import ReplayIO
+from osu.local.replay.replay_frames import ReplayFrames
 
 
 class TestReplay(unittest.TestCase):
@@ -22,4 +26,53 @@ class TestReplay(unittest.TestCase):
         self.load_replay('unit_tests\\replays\\osu\\so bad - Nakamura Meiko - Aka no Ha [Extra] (2020-03-01) std Osu.osr')
         self.load_replay('unit_tests\\replays\\osu\\so bad - Nakamura Meiko - Aka no Ha [Extra] (2020-03-01) std ripple.osr')
         self.load_replay('unit_tests\\replays\\mania\\osu!topus! - DJ Genericname - Dear You [S.Star\'s 4K HD+] (2019-05-29) OsuMania.osr')
-        self.load_replay('unit_tests\\replays\\osu\\Toy - Within Temptation - The Unforgiving [Marathon] (2018-02-06) Osu.osr')
\ No newline at end of file
+        self.load_replay('unit_tests\\replays\\osu\\Toy - Within Temptation - The Unforgiving [Marathon] (2018-02-06) Osu.osr')
+
+    def test_replay_frames(self):
+        replay = ReplayIO.open_replay('unit_tests/replays/osu/abraker - Mutsuhiko Izumi - Red Goose [ERT Basic] (2019-08-24) Osu.osr')
+        frames = replay.play_data
+
+        self.assertIsInstance(frames, ReplayFrames)
+        self.assertEqual(len(frames.t), len(frames))
+        self.assertTrue(np.array_equal(frames.t, np.cumsum(frames.dt)))
+        self.assertTrue(np.array_equal(replay.get_event_times(), frames.t))
+        self.assertFalse(np.any(frames.dt == -12345))
+
+        # Frames act as a list of ReplayEvent
+        events = list(frames)
+        self.assertIsInstance(events[0], ReplayEvent)
+        self.assertEqual(len(events), len(frames))
+        self.assertEqual(frames[-1].t, frames.t[-1])
+        self.assertEqual(frames[10:20][0].t, frames[10].t)
+        self.assertEqual(type(frames[10].x), float)
+        self.assertEqual(type(frames[10].keys_pressed), int)
+        
+        with self.assertRaises(IndexError):
+            frames[len(frames)]
+
+        # Changes to events go to the columns
+        t = frames.t[5]
+        frames[5].t += 100
+        self.assertEqual(frames.t[5], t + 100)
+
+
+    def test_lazy_loading(self):
+        filepath = 'unit_tests/replays/mania/osu!topus! - DJ Genericname - Dear You [S.Star\'s 4K HD+] (2019-05-29) OsuMania.osr'
+        replay   = ReplayIO.open_replay(filepath)
+        lazy     = ReplayIO.open_replay(filepath, lazy=True)
+
+        self.assertTrue(replay.is_loaded())
+        self.assertFalse(lazy.is_loaded())
+
+        # Header is available without decoding the frames
+        self.assertEqual(lazy.player_name, replay.player_name)
+        self.assertEqual(lazy.score, replay.score)
+        self.assertEqual(lazy.get_mods_name(), replay.get_mods_name())
+        self.assertTrue(lazy.is_md5_match(replay.beatmap_hash))
+        self.assertFalse(lazy.is_loaded())
+
+        # Frames get decoded on first access
+        self.assertEqual(lazy.mania_keys, replay.mania_keys)
+        self.assertTrue(lazy.is_loaded())
+        self.assertTrue(np.array_equal(lazy.get_event_times(), replay.get_event_times()))
+        self.assertTrue(np.array_equal(lazy.play_data.keys, replay.play_data.keys))
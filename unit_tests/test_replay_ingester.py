@@ -0,0 +1,175 @@
+import os
+import shutil
+import unittest
+import hashlib
+import tempfile
+import threading
+import numpy as np
+
+from osu.local.beatmap.beatmap import Beatmap
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.replay.replayIO import ReplayIO
+
+from osu.local.beatmap.beatmap_library import BeatmapLibrary
+
+from analysis.osu.replay_ingester import ReplayIngester
+from analysis.osu.std.map_data import StdMapData
+from analysis.osu.std.replay_data import StdReplayData
+from analysis.osu.std.score_data import StdScoreData
+
+
+class TestReplayIngester(unittest.TestCase):
+
+    STD_MAP    = 'unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu'
+    STD_REPLAY = 'unit_tests/replays/osu/abraker - Mutsuhiko Izumi - Red Goose [ERT Basic] (2019-08-24) Osu.osr'
+
+    MANIA_MAP    = "unit_tests/maps/mania/playable/DJ Genericname - Dear You (Taiwan-NAK) [S.Star's 4K HD+].osu"
+    MANIA_REPLAY = "unit_tests/replays/mania/abraker - DJ Genericname - Dear You [S.Star's 4K HD+] (2020-04-25) OsuMania.osr"
+
+    class Library():
+        """
+        Resolves beatmap hashes like BeatmapLibrary does. The test replays were played on
+        older versions of the test maps, so their hashes are mapped by hand.
+        """
+        def __init__(self):
+            self.paths = {}
+            self.num_updates = 0
+
+        def get_path(self, md5):
+            return self.paths.get(md5)
+
+        def update(self):
+            self.num_updates += 1
+
+
+    def setUp(self):
+        self.store_dir = tempfile.mkdtemp()
+        self.library   = TestReplayIngester.Library()
+        self.ingester  = ReplayIngester(self.library, self.store_dir)
+
+        self.std_replay   = ReplayIO.open_replay(TestReplayIngester.STD_REPLAY)
+        self.mania_replay = ReplayIO.open_replay(TestReplayIngester.MANIA_REPLAY)
+
+        self.library.paths[self.std_replay.beatmap_hash]   = TestReplayIngester.STD_MAP
+        self.library.paths[self.mania_replay.beatmap_hash] = TestReplayIngester.MANIA_MAP
+
+
+    def tearDown(self):
+        shutil.rmtree(self.store_dir)
+
+
+    def test_ingest(self):
+        self.assertEqual(self.ingester.ingest(TestReplayIngester.STD_REPLAY), ReplayIngester.STATUS_SCORED)
+        self.assertEqual(self.ingester.ingest(TestReplayIngester.MANIA_REPLAY), ReplayIngester.STATUS_SCORED)
+
+        # Never scored twice
+        self.assertEqual(self.ingester.ingest(TestReplayIngester.STD_REPLAY), ReplayIngester.STATUS_EXISTS)
+        self.assertEqual(len(self.ingester.get_replays('abraker')), 2)
+        self.assertEqual(self.ingester.get_players(), [ 'abraker' ])
+
+        beatmap     = BeatmapIO.open_beatmap(TestReplayIngester.STD_MAP)
+        replay_data = StdReplayData.get_replay_data(self.std_replay.play_data)
+        score_data  = StdScoreData.get_score_data(replay_data, StdMapData.get_map_data(beatmap.hitobjects), beatmap.difficulty.ar, beatmap.difficulty.cs)
+
+        stored = self.ingester.get_score_data('abraker', Beatmap.GAMEMODE_OSU)
+        self.assertEqual(len(stored), len(score_data))
+        np.testing.assert_array_equal(stored[score_data.columns].values, score_data.values)
+
+        stored = self.ingester.get_score_data('abraker', Beatmap.GAMEMODE_OSU, self.mania_replay.beatmap_hash)
+        self.assertEqual(len(stored), 0)
+
+        stored = self.ingester.get_score_data('abraker', Beatmap.GAMEMODE_MANIA, self.mania_replay.beatmap_hash)
+        self.assertGreater(len(stored), 0)
+        self.assertEqual(set(stored['column']), { 0, 1, 2, 3 })
+
+
+    def test_debounce(self):
+        self.ingester.add_replay(TestReplayIngester.STD_REPLAY, now=0)
+        self.ingester.add_replay('not a replay.txt', now=0)
+
+        self.assertEqual(self.ingester.process_pending(now=ReplayIngester.debounce/2), [])
+
+        # Event for the same file restarts the wait
+        self.ingester.add_replay(TestReplayIngester.STD_REPLAY, now=ReplayIngester.debounce/2)
+        self.assertEqual(self.ingester.process_pending(now=ReplayIngester.debounce), [])
+
+        results = self.ingester.process_pending(now=2*ReplayIngester.debounce)
+        self.assertEqual(results, [ (TestReplayIngester.STD_REPLAY, ReplayIngester.STATUS_SCORED) ])
+        self.assertEqual(self.ingester.process_pending(now=10*ReplayIngester.debounce), [])
+
+
+    def test_unmatched(self):
+        del self.library.paths[self.std_replay.beatmap_hash]
+
+        self.assertEqual(self.ingester.ingest(TestReplayIngester.STD_REPLAY), ReplayIngester.STATUS_UNMATCHED)
+        self.assertEqual(self.library.num_updates, 1)
+        self.assertEqual(len(self.ingester.get_score_data('abraker', Beatmap.GAMEMODE_OSU)), 0)
+
+        # Map shows up later
+        self.library.paths[self.std_replay.beatmap_hash] = TestReplayIngester.STD_MAP
+
+        results = self.ingester.retry_unmatched()
+        self.assertEqual(results, [ (TestReplayIngester.STD_REPLAY, ReplayIngester.STATUS_SCORED) ])
+        self.assertGreater(len(self.ingester.get_score_data('abraker', Beatmap.GAMEMODE_OSU)), 0)
+        self.assertEqual(self.ingester.retry_unmatched(), [])
+
+
+    def test_ingest_thread(self):
+        songs_dir = os.path.join(self.store_dir, 'Songs')
+        os.makedirs(songs_dir)
+        shutil.copy(TestReplayIngester.STD_MAP, songs_dir)
+
+        # Point a copy of the replay at the map as it is in the library
+        with open(TestReplayIngester.STD_MAP, 'rb') as map_file:
+            map_hash = hashlib.md5(map_file.read()).hexdigest()
+
+        with open(TestReplayIngester.STD_REPLAY, 'rb') as replay_file:
+            replay_data = replay_file.read().replace(self.std_replay.beatmap_hash.encode(), map_hash.encode())
+
+        replay_path = os.path.join(self.store_dir, 'replay.osr')
+        with open(replay_path, 'wb') as replay_file:
+            replay_file.write(replay_data)
+
+        # Library is made on this thread and used from the ingesting one, like with ``ReplayIngester.watch``
+        library  = BeatmapLibrary(songs_dir, os.path.join(self.store_dir, 'library.db'))
+        ingester = ReplayIngester(library, os.path.join(self.store_dir, 'players'))
+        ingester.add_replay(replay_path, now=0)
+        ingester.add_replay(TestReplayIngester.STD_REPLAY, now=0)
+
+        results = []
+        thread = threading.Thread(target=lambda: results.extend(ingester.process_pending(now=ReplayIngester.debounce)))
+        thread.start()
+        thread.join()
+        library.close()
+
+        self.assertEqual(sorted(results), sorted([
+            (replay_path, ReplayIngester.STATUS_SCORED),
+            (TestReplayIngester.STD_REPLAY, ReplayIngester.STATUS_UNMATCHED)
+        ]))
+        self.assertEqual(ingester.pending, {})
+        self.assertGreater(len(ingester.get_score_data('abraker', Beatmap.GAMEMODE_OSU)), 0)
+
+
+    def test_ingest_failed(self):
+        get_path = self.library.get_path
+
+        def unavailable(md5):
+            raise IOError('Library is unavailable')
+
+        self.ingester.add_replay(TestReplayIngester.STD_REPLAY, now=0)
+        self.ingester.add_replay(TestReplayIngester.MANIA_REPLAY, now=0)
+
+        # Replays that fail stay queued up and don't keep the others from being ingested
+        self.library.get_path = lambda md5: unavailable(md5) if md5 == self.std_replay.beatmap_hash else get_path(md5)
+        with self.assertRaises(IOError):
+            self.ingester.process_pending(now=ReplayIngester.debounce)
+
+        self.assertEqual(list(self.ingester.pending), [ TestReplayIngester.STD_REPLAY ])
+        self.assertEqual(len(self.ingester.get_replays('abraker')), 1)
+
+        self.library.get_path = get_path
+        self.assertEqual(self.ingester.process_pending(now=1.5*ReplayIngester.debounce), [])
+
+        results = self.ingester.process_pending(now=2*ReplayIngester.debounce)
+        self.assertEqual(results, [ (TestReplayIngester.STD_REPLAY, ReplayIngester.STATUS_SCORED) ])
+        self.assertEqual(self.ingester.pending, {})
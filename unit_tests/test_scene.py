@@ -0,0 +1,335 @@
+import unittest
+import numpy as np
+
+from PyQt5.QtCore import *
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+
+from misc.callback import callback
+
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.replay.replayIO import ReplayIO
+from osu.local.hitobject.std.std import StdSettings
+
+from analysis.osu.std.replay_data import StdReplayData
+from analysis.osu.std.std_layers import StdLayers
+
+from gui.objects.scene import Scene
+from gui.objects.display import Display
+from gui.objects.layer.layer import Layer
+from gui.objects.layer.layers.std_data_2d_layer import StdData2DLayer
+from gui.objects.layer.layers.std.hitobject_outline_layer import HitobjectOutlineLayer
+from gui.objects.layer.layers.std.hitobject_aimpoint_layer import HitobjectAimpointLayer
+
+
+
+class DummyLayer(Layer):
+
+    def __init__(self, name, rect):
+        Layer.__init__(self, name)
+
+        self.rect   = rect
+        self.shown  = 0
+        self.paints = 0
+
+
+    def get_view(self):
+        return self.shown
+
+
+    def get_content_rect(self):
+        return self.rect
+
+
+    def paint(self, painter, option, widget):
+        self.paints += 1
+
+
+
+class CountingLayer(StdData2DLayer):
+
+    def __init__(self, *args):
+        StdData2DLayer.__init__(self, *args)
+        self.paints = 0
+
+
+    def paint(self, painter, option, widget):
+        self.paints += 1
+        StdData2DLayer.paint(self, painter, option, widget)
+
+
+
+class RecordingPainter():
+    """
+    Stands in for QPainter and keeps the area of each shape drawn, pen width included
+    """
+    def __init__(self):
+        self.shapes = []
+        self.pen_width = 1
+
+    def setPen(self, pen):
+        self.pen_width = max(pen.width(), 1) if isinstance(pen, QPen) else 1
+
+    def setBrush(self, brush):
+        pass
+
+    def drawEllipse(self, x, y, w, h):
+        self.__add(QRectF(x, y, w, h))
+
+    def drawLine(self, *args):
+        line = args[0] if len(args) == 1 else QLineF(*args)
+        self.__add(QRectF(line.p1(), line.p2()).normalized())
+
+    def __add(self, rect):
+        pad = self.pen_width/2
+        self.shapes.append(rect.adjusted(-pad, -pad, pad, pad))
+
+
+class Area():
+
+    def __init__(self, width, height):
+        self.area = (width, height)
+
+    def width(self):  return self.area[0]
+    def height(self): return self.area[1]
+
+
+
+class PaintRecorder(QObject):
+
+    def __init__(self):
+        QObject.__init__(self)
+        self.rects = []
+
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.rects.append(event.rect())
+        return False
+
+
+
+class TestScene(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance()
+        if cls.app is None:
+            cls.app = QApplication([])
+
+        cls.display = Display()
+        cls.display.resize(400, 400)
+        cls.display.show()
+
+        cls.paints = PaintRecorder()
+        cls.display.viewport().installEventFilter(cls.paints)
+
+
+    @classmethod
+    def tearDown(cls):
+        pass
+
+
+    def render(self, scene):
+        if QGraphicsView.scene(self.display) is not scene:
+            self.display.setScene(scene)
+        self.paints.rects.clear()
+
+        # Let the scheduled render and the resulting repaint go through
+        for i in range(3):
+            while scene.render_timer.isActive():
+                self.app.processEvents(QEventLoop.AllEvents, Scene.frame_interval)
+            self.app.processEvents()
+
+        return self.paints.rects
+
+
+    def test_coalesce_changes(self):
+        scene = Scene()
+        layer = DummyLayer('Layer', QRectF(10, 10, 20, 20))
+        scene.add_layer(layer)
+        self.render(scene)
+
+        renders = []
+        scene.render_timer.timeout.connect(lambda: renders.append(True))
+
+        for i in range(100):
+            layer.layer_changed()
+
+        self.render(scene)
+        self.assertEqual(len(renders), 1)
+
+
+    def test_changed_area(self):
+        scene = Scene()
+        layer_a = DummyLayer('Layer A', QRectF(10, 10, 20, 20))
+        layer_b = DummyLayer('Layer B', QRectF(100, 100, 20, 20))
+        scene.add_layer(layer_a)
+        scene.add_layer(layer_b)
+        self.render(scene)
+
+        # Content moves from (10, 10, 20, 20) to (40, 10, 20, 20); only the area between is repainted
+        layer_a.rect = QRectF(40, 10, 20, 20)
+        layer_a.layer_changed()
+        layer_a.paints, layer_b.paints = 0, 0
+
+        paints = self.render(scene)
+        self.assertEqual(layer_a.boundingRect(), QRectF(40, 10, 20, 20))
+        self.assertTrue(all(QRect(10, 10, 50, 20).contains(rect) or rect.contains(QRect(10, 10, 50, 20)) for rect in paints))
+        self.assertTrue(all(not rect.intersects(QRect(100, 100, 20, 20)) for rect in paints))
+        self.assertGreater(layer_a.paints, 0)
+        self.assertEqual(layer_b.paints, 0)
+
+
+    def test_unknown_area(self):
+        scene = Scene()
+        layer_a = DummyLayer('Layer A', QRectF(10, 10, 20, 20))
+        layer_b = DummyLayer('Layer B', None)
+        scene.add_layer(layer_a)
+        scene.add_layer(layer_b)
+        self.render(scene)
+
+        # Layer B can't tell where it paints, so nothing can be left out
+        layer_a.rect = QRectF(40, 10, 20, 20)
+        layer_a.layer_changed()
+        layer_a.paints, layer_b.paints = 0, 0
+
+        paints = self.render(scene)
+        self.assertIn(self.display.viewport().rect(), paints)
+        self.assertGreater(layer_b.paints, 0)
+
+
+    def test_view_changed(self):
+        scene = Scene()
+        layer = DummyLayer('Layer', QRectF(10, 10, 20, 20))
+        scene.add_layer(layer)
+        self.render(scene)
+
+        layer.view_changed()
+        self.render(scene)
+
+        # Nothing new is shown
+        layer.view_changed()
+        self.assertFalse(scene.render_timer.isActive())
+
+        layer.shown += 1
+        layer.view_changed()
+        self.assertTrue(scene.render_timer.isActive())
+        self.assertIn(layer, scene.dirty_layers)
+        self.render(scene)
+
+
+    def test_get_points_rect(self):
+        rect = Layer.get_points_rect([ [ 10, 20 ], [ 50, 30 ] ], 2, 0.5, 5)
+        self.assertEqual(rect, QRectF(9, 6.5, 102, 12))
+
+        rect = Layer.get_points_rect([ [ 10, 20 ], [ 50, 30 ] ], 1, 1, [ 10, 0 ])
+        self.assertEqual(rect, QRectF(-1, 9, 52, 22))
+
+        rect = Layer.get_points_rect(np.empty((0, 2)), 1, 1, 5)
+        self.assertTrue(rect.isEmpty())
+
+
+    def test_real_layers(self):
+        @callback
+        def time_driver(time):
+            time_driver.emit(time)
+
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/osu/playable/LeaF - I (Maddy) [Terror].osu')
+        replay  = ReplayIO.open_replay('unit_tests/replays/osu/LeaF - I (Maddy) [Terror] replay_0.osr')
+        replay_data = StdReplayData.get_replay_data(replay.play_data)
+
+        # Hitobjects make their colors from an opacity of 1.0, which some PyQt versions don't take as an int
+        for hitobject in beatmap.hitobjects:
+            hitobject.opacity = 1
+
+        layers = [
+            HitobjectOutlineLayer(beatmap, time_driver),
+            HitobjectAimpointLayer(beatmap, time_driver),
+            StdData2DLayer('Cursor', replay_data, StdLayers.StdReplayCursorLayer, time_driver),
+            StdData2DLayer('Scatter', replay_data, StdLayers.StdReplayScatterLayer, time_driver),
+            StdData2DLayer('Hold', replay_data, StdLayers.StdReplayHoldLayer, time_driver),
+        ]
+
+        # Cursor shapes are sized in screen px, so they don't scale with the playfield
+        cursor_radius = StdSettings.cursor_radius
+        StdSettings.cursor_radius = 10
+
+        num_shapes, num_same_views = 0, 0
+
+        try:
+            for width, height in [ (600, 450), (300, 200) ]:
+                area  = Area(width, height)
+                views = [ None ]*len(layers)
+                paints = [ None ]*len(layers)
+
+                for layer in layers:
+                    layer.area_resize_event(width, height)
+
+                # Ticks close together show the same thing on some layers
+                for time in (np.arange(2000, 60000, 1999)[:, None] + [ 0, 1, 5 ]).flatten().tolist():
+                    time_driver(time)
+
+                    for i, layer in enumerate(layers):
+                        painter = RecordingPainter()
+                        layer.paint(painter, None, area)
+
+                        # Everything painted is within the content rect
+                        rect = layer.get_content_rect()
+                        num_shapes += len(painter.shapes)
+                        for shape in painter.shapes:
+                            self.assertTrue(rect.contains(shape), f'{layer.__class__.__name__} {layer.name} at {time} ms: {shape} not in {rect}')
+
+                        # Nothing different gets painted while the view stays the same
+                        view = layer.get_view()
+                        if view is not None and view == views[i]:
+                            num_same_views += 1
+                            self.assertEqual(painter.shapes, paints[i], f'{layer.__class__.__name__} {layer.name} at {time} ms')
+
+                        views[i], paints[i] = view, painter.shapes
+        finally:
+            StdSettings.cursor_radius = cursor_radius
+
+        self.assertGreater(num_shapes, 0)
+        self.assertGreater(num_same_views, 0)
+
+
+    def test_display_resize(self):
+        @callback
+        def time_driver(time):
+            time_driver.emit(time)
+
+        # Cursor moving around the bottom right of the playfield
+        times = np.arange(0, 1000, 10)
+        replay_data = StdReplayData.get_replay_data_from_arrays(times, 450 + times/100, 350 + times/100, np.zeros(len(times)))
+
+        scene = Scene()
+        layer = CountingLayer('Cursor', replay_data, StdLayers.StdReplayCursorLayer, time_driver)
+        scene.add_layer(layer)
+
+        try:
+            self.display.resize(800, 600)
+            self.render(scene)
+
+            time_driver(100)
+            self.render(scene)
+            self.assertGreater(layer.paints, 0)
+
+            # Content at the old scale would be out of view now
+            self.display.resize(300, 200)
+            self.app.processEvents()
+            self.render(scene)
+
+            viewport = self.display.viewport()
+            self.assertAlmostEqual(layer.ratio_x, viewport.width()/512)
+
+            layer.paints = 0
+            for time in range(200, 700, 100):
+                time_driver(time)
+                self.render(scene)
+
+                self.assertTrue(QRectF(viewport.rect()).contains(layer.boundingRect()))
+
+            self.assertGreaterEqual(layer.paints, 5)
+        finally:
+            self.display.resize(400, 400)
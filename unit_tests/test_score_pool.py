@@ -0,0 +1,53 @@
+import unittest
+import glob
+import numpy as np
+
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.replay.replayIO import ReplayIO
+
+from analysis.osu.std.map_data import StdMapData
+from analysis.osu.std.replay_data import StdReplayData
+from analysis.osu.std.score_data import StdScoreData
+from analysis.osu.mania.action_data import ManiaActionData
+from analysis.osu.mania.score_data import ManiaScoreData
+from analysis.osu.score_pool import ScorePool
+
+
+
+class TestScorePool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.std_beatmap   = BeatmapIO.open_beatmap('unit_tests/maps/osu/test/score_test.osu')
+        cls.mania_beatmap = BeatmapIO.open_beatmap('unit_tests/maps/mania/playable/DJ Genericname - Dear You (Taiwan-NAK) [S.Star\'s 4K HD+].osu')
+
+
+    def tearDown(self):
+        StdScoreData.engine = StdScoreData.ENGINE_FRAME
+
+
+    def test_score_std(self):
+        StdScoreData.engine = StdScoreData.ENGINE_ARRAY
+
+        replay_filepaths = sorted(glob.glob('unit_tests/replays/osu/*score_test*.osr'))[:4]
+        map_data = StdMapData.get_map_data(self.std_beatmap.hitobjects)
+
+        results = list(ScorePool.score_std(replay_filepaths, map_data, self.std_beatmap.difficulty.ar, workers=2))
+        self.assertEqual([ filepath for filepath, _ in results ], replay_filepaths)
+
+        for replay_filepath, score_data in results:
+            replay_data = StdReplayData.get_replay_data(ReplayIO.open_replay(replay_filepath).play_data)
+            expected    = StdScoreData.get_score_data(replay_data, map_data, self.std_beatmap.difficulty.ar)
+            self.assertTrue(np.array_equal(score_data.values, expected.values, equal_nan=True))
+
+
+    def test_score_dir(self):
+        results = list(ScorePool.score_dir('unit_tests/replays/mania', self.mania_beatmap, workers=2))
+        self.assertEqual(len(results), 3)
+
+        map_data = ManiaActionData.get_map_data(self.mania_beatmap.hitobjects)
+
+        for replay_filepath, score_data in results:
+            replay_data = ManiaActionData.get_replay_data(ReplayIO.open_replay(replay_filepath).play_data, int(self.mania_beatmap.difficulty.cs))
+            expected    = ManiaScoreData.get_score_data(map_data, replay_data)
+            self.assertTrue(np.array_equal(score_data.values, expected.values, equal_nan=True))
@@ -0,0 +1,130 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from analysis.osu.std.map_data import StdMapData
+
+
+
+class TestStdMapArray(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.beatmap   = BeatmapIO.open_beatmap('unit_tests/maps/osu/playable/Nakamura Meiko - Aka no Ha (Lily Bread) [Extra].osu')
+        cls.map_data  = StdMapData.get_map_data(cls.beatmap.hitobjects)
+        cls.map_array = StdMapData.get_map_array(cls.beatmap.hitobjects)
+
+        start_time, end_time = StdMapData.all_times(cls.map_array)[[0, -1]]
+        cls.times = np.linspace(start_time - 1000, end_time + 1000, 200)
+
+
+    def test_get_map_array(self):
+        self.assertEqual(self.map_array.shape, (len(self.map_data), 6))
+        self.assertTrue(np.array_equal(self.map_array[:, :StdMapData.IDX_HITOBJECT], self.map_data.values))
+        self.assertTrue(np.array_equal(StdMapData.hitobject_idxs(self.map_array), StdMapData.hitobject_idxs(self.map_data)))
+
+        map_data = StdMapData.array_to_map_data(self.map_array)
+        self.assertTrue(map_data.equals(self.map_data))
+
+
+    def test_get_hitobject_offsets(self):
+        offsets = StdMapData.get_hitobject_offsets(self.map_array)
+        self.assertEqual(len(offsets), len(self.map_data.index.unique(level=0)) + 1)
+        self.assertEqual(offsets[-1], len(self.map_array))
+
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            self.assertEqual(self.map_array[start, StdMapData.IDX_TYPE], StdMapData.TYPE_PRESS)
+            self.assertEqual(self.map_array[end - 1, StdMapData.IDX_TYPE], StdMapData.TYPE_RELEASE)
+            self.assertEqual(len(np.unique(self.map_array[start:end, StdMapData.IDX_HITOBJECT])), 1)
+
+        self.assertTrue(np.array_equal(StdMapData.get_hitobject_offsets(np.empty((0, 6))), [ 0 ]))
+
+
+    def test_accessors(self):
+        self.assertEqual(StdMapData.get_num_hitobjects(self.map_array), StdMapData.get_num_hitobjects(self.map_data))
+        self.assertTrue(np.array_equal(StdMapData.get_presses(self.map_array)[:, :StdMapData.IDX_HITOBJECT], StdMapData.get_presses(self.map_data).values))
+        self.assertTrue(np.array_equal(StdMapData.get_releases(self.map_array)[:, :StdMapData.IDX_HITOBJECT], StdMapData.get_releases(self.map_data).values))
+        self.assertTrue(np.array_equal(StdMapData.get_objects(self.map_array), StdMapData.get_objects(self.map_data)))
+        self.assertTrue(np.array_equal(StdMapData.start_times(self.map_array), StdMapData.start_times(self.map_data)))
+        self.assertTrue(np.array_equal(StdMapData.end_times(self.map_array), StdMapData.end_times(self.map_data)))
+        self.assertTrue(np.array_equal(StdMapData.start_positions(self.map_array), StdMapData.start_positions(self.map_data)))
+        self.assertTrue(np.array_equal(StdMapData.end_positions(self.map_array), StdMapData.end_positions(self.map_data)))
+        self.assertTrue(np.array_equal(StdMapData.all_positions(self.map_array), StdMapData.all_positions(self.map_data)))
+
+        for idx in [ -1, 0, 10, StdMapData.get_num_hitobjects(self.map_data) - 1 ]:
+            self.assertEqual(StdMapData.get_next_hitobject_idx(self.map_array, idx), StdMapData.get_next_hitobject_idx(self.map_data, idx))
+
+
+    def test_time_accessors(self):
+        for time in self.times:
+            for func in [ StdMapData.get_scorepoint_before, StdMapData.get_scorepoint_after, StdMapData.get_note_before, StdMapData.get_note_after ]:
+                array_result = func(self.map_array, time)
+                frame_result = func(self.map_data, time)
+
+                if frame_result is None:
+                    self.assertIsNone(array_result)
+                    continue
+
+                self.assertTrue(np.array_equal(np.atleast_2d(array_result)[:, :StdMapData.IDX_HITOBJECT], np.atleast_2d(frame_result.values)))
+
+            array_result = StdMapData.time_slice(self.map_array, time - 500, time + 500)
+            frame_result = StdMapData.time_slice(self.map_data, time - 500, time + 500)
+            self.assertTrue(np.array_equal(array_result[:, :StdMapData.IDX_HITOBJECT], frame_result.values))
+
+            array_result = StdMapData.get_visible_at(self.map_array, time, 800)
+            frame_result = StdMapData.get_visible_at(self.map_data, time, 800)
+            self.assertTrue(np.array_equal(array_result[:, :StdMapData.IDX_HITOBJECT], frame_result.values))
+
+
+    def test_time_index(self):
+        # Second slider starts before the first one ends
+        overlap_array = np.asarray([
+            [ 100, 0, 0, StdMapData.TYPE_PRESS,   StdMapData.TYPE_SLIDER, 0 ],
+            [ 300, 0, 0, StdMapData.TYPE_HOLD,    StdMapData.TYPE_SLIDER, 0 ],
+            [ 500, 0, 0, StdMapData.TYPE_RELEASE, StdMapData.TYPE_SLIDER, 0 ],
+            [ 200, 1, 1, StdMapData.TYPE_PRESS,   StdMapData.TYPE_SLIDER, 1 ],
+            [ 400, 1, 1, StdMapData.TYPE_RELEASE, StdMapData.TYPE_SLIDER, 1 ],
+            [ 600, 2, 2, StdMapData.TYPE_PRESS,   StdMapData.TYPE_CIRCLE, 2 ],
+            [ 601, 2, 2, StdMapData.TYPE_RELEASE, StdMapData.TYPE_CIRCLE, 2 ],
+        ], dtype=np.float64)
+
+        for map_data, times in [
+            (self.map_data, self.times),
+            (self.map_array, self.times),
+            (overlap_array, np.arange(0, 700, 50)),
+            (StdMapData.array_to_map_data(overlap_array), np.arange(0, 700, 50))
+        ]:
+            time_index = StdMapData.get_time_index(map_data)
+            is_array = isinstance(map_data, np.ndarray)
+
+            for time in times:
+                for func in [ StdMapData.get_scorepoint_before, StdMapData.get_scorepoint_after, StdMapData.get_note_before, StdMapData.get_note_after ]:
+                    expected = func(map_data, time)
+                    result   = func(map_data, time, time_index)
+
+                    if expected is None:
+                        self.assertIsNone(result)
+                        continue
+
+                    self.assertTrue(np.array_equal(np.asarray(result), np.asarray(expected)))
+                    if is_array:
+                        continue
+
+                    if isinstance(expected, pd.Series):
+                        self.assertEqual(result.name, expected.name)
+                    else:
+                        self.assertTrue(result.index.equals(expected.index))
+
+                for exclusive in [ True, False ]:
+                    expected = StdMapData.time_slice(map_data, time - 100, time + 100, exclusive)
+                    result   = StdMapData.time_slice(map_data, time - 100, time + 100, exclusive, time_index)
+                    self.assertTrue(np.array_equal(np.asarray(result), np.asarray(expected)))
+
+                expected = StdMapData.get_visible_at(map_data, time, 150)
+                result   = StdMapData.get_visible_at(map_data, time, 150, time_index)
+                self.assertTrue(np.array_equal(np.asarray(result), np.asarray(expected)))
+
+        # Consecutive rows come back as views
+        time_slice = StdMapData.time_slice(self.map_array, self.times[50], self.times[60], time_index=StdMapData.get_time_index(self.map_array))
+        self.assertTrue(np.shares_memory(time_slice, self.map_array))
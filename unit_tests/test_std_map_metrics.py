@@ -1,4 +1,6 @@
 import unittest
+import math
+import numpy as np
 
 from osu.local.beatmap.beatmapIO import BeatmapIO
 
@@ -73,4 +75,26 @@ class TestStdMapMetrics(unittest.TestCase):
 
 
     def test_calc_lin_int(self):
-        lin_int = StdMapMetrics.calc_lin_int(self.map_data)
\ No newline at end of file
+        lin_int = StdMapMetrics.calc_lin_int(self.map_data)
+
+
+    def test_calc_rhythmic_complexity(self):
+        beatmap  = BeatmapIO.open_beatmap('unit_tests/maps/osu/playable/Black Hole - Pluto (7odoa) [Difficult].osu')
+        map_data = StdMapData.get_map_data(beatmap.hitobjects)
+
+        times, complexity = StdMapMetrics.calc_rhythmic_complexity(map_data)
+        _, intervals = StdMapMetrics.calc_tapping_intervals(map_data)
+
+        # Harmonics summed up one note at a time
+        harmonic_sum = 0
+        for i in range(len(intervals)):
+            self.assertAlmostEqual(complexity[i], harmonic_sum*600.0/intervals[i])
+            if i + 1 < len(intervals):
+                harmonic_sum += math.exp(-0.005*intervals[i + 1])*(5.0 - 5.0*math.cos(2*math.pi/intervals[i]*intervals[i + 1]))
+
+        # Factors can be swept in one call
+        _, complexities = StdMapMetrics.calc_rhythmic_complexity(map_data, speed_factor=[ 600.0, 300.0 ], decay_factor=[ [ 0.005 ], [ 0.01 ] ])
+        self.assertEqual(complexities.shape, (len(intervals), 2, 2))
+        np.testing.assert_allclose(complexities[:, 0, 0], complexity)
+        np.testing.assert_allclose(complexities[:, 0, 1], complexity/2)
+        np.testing.assert_allclose(complexities[:, 1, 0], StdMapMetrics.calc_rhythmic_complexity(map_data, decay_factor=0.01)[1])
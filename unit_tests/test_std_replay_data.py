@@ -1,4 +1,6 @@
 import unittest
+import numpy as np
+import pandas as pd
 
 from osu.local.replay.replayIO import ReplayIO
 from analysis.osu.std.replay_data import StdReplayData
@@ -28,6 +30,62 @@ class TestStdReplayData(unittest.TestCase):
         replay_data = StdReplayData.get_replay_data(replay.play_data)
 
 
+    def test_get_replay_data_from_arrays(self):
+        FREE    = StdReplayData.FREE
+        PRESS   = StdReplayData.PRESS
+        HOLD    = StdReplayData.HOLD
+        RELEASE = StdReplayData.RELEASE
+
+        # k1 pressed and released at the same time, then m1 + smoke pressed
+        # out of order at a time that got taken by the bumped release
+        replay_t    = [ 0, -1, 100, 100, 50, 101, 102 ]
+        replay_keys = [ 0,  0,   4,   0,  0,  17,   1 ]
+
+        replay_data = StdReplayData.get_replay_data_from_arrays(replay_t, np.arange(7), np.arange(7), replay_keys)
+
+        self.assertEqual(list(replay_data['time']),  [ -1, 0, 50, 100, 101, 102, 103 ])
+        self.assertEqual(list(replay_data['x']),     [  1, 0,  4,   2,   3,   5,   6 ])
+        self.assertEqual(list(replay_data['k1']),    [ FREE, FREE, FREE, PRESS, RELEASE, FREE, FREE ])
+        self.assertEqual(list(replay_data['m1']),    [ FREE, FREE, FREE, FREE, FREE, PRESS, HOLD ])
+        self.assertEqual(list(replay_data['smoke']), [ FREE, FREE, FREE, FREE, FREE, PRESS, RELEASE ])
+
+        replay = ReplayIO.open_replay('unit_tests/replays/osu/LeaF - I (Maddy) [Terror] replay_0.osr')
+        replay_data = StdReplayData.get_replay_data(replay.play_data)
+
+        self.assertEqual(list(replay_data.columns), [ 'time', 'x', 'y', 'm1', 'm2', 'k1', 'k2', 'smoke' ])
+        self.assertEqual(len(replay_data), len(replay.play_data))
+        self.assertTrue(np.all(np.diff(replay_data['time'].values) > 0))
+
+
+    def test_get_reduced_replay_data(self):
+        FREE    = StdReplayData.FREE
+        PRESS   = StdReplayData.PRESS
+        HOLD    = StdReplayData.HOLD
+        RELEASE = StdReplayData.RELEASE
+
+        # k1 held, k2 pressed while k1 is held, both released, then k1 and k2 pressed one frame after another
+        replay_data = pd.DataFrame([
+            [   0, 0, 0, FREE, FREE, FREE,    FREE,    FREE ],
+            [ 100, 1, 1, FREE, FREE, PRESS,   FREE,    FREE ],
+            [ 110, 2, 2, FREE, FREE, HOLD,    FREE,    FREE ],
+            [ 120, 3, 3, FREE, FREE, HOLD,    PRESS,   FREE ],
+            [ 130, 4, 4, FREE, FREE, RELEASE, HOLD,    FREE ],
+            [ 140, 5, 5, FREE, FREE, FREE,    RELEASE, FREE ],
+            [ 150, 6, 6, FREE, FREE, PRESS,   FREE,    FREE ],
+            [ 160, 7, 7, FREE, FREE, HOLD,    PRESS,   FREE ],
+            [ 170, 8, 8, FREE, FREE, RELEASE, RELEASE, FREE ],
+            [ 180, 9, 9, FREE, FREE, FREE,    FREE,    FREE ],
+        ], columns=[ 'time', 'x', 'y', 'm1', 'm2', 'k1', 'k2', 'smoke' ])
+
+        reduced_data = StdReplayData.get_reduced_replay_data(replay_data, press_block=False, release_block=False)
+        self.assertEqual(list(reduced_data['time']), [ 0, 100, 110, 119, 120, 130, 140, 150, 160, 170, 180 ])
+        self.assertEqual(list(reduced_data['k']), [ FREE, PRESS, HOLD, RELEASE, PRESS, RELEASE, FREE, PRESS, HOLD, RELEASE, FREE ])
+
+        reduced_data = StdReplayData.get_reduced_replay_data(replay_data, press_block=True, release_block=True)
+        self.assertEqual(list(reduced_data['time']), [ 0, 100, 110, 120, 130, 140, 150, 160, 170, 180 ])
+        self.assertEqual(list(reduced_data['k']), [ FREE, PRESS, HOLD, HOLD, HOLD, RELEASE, PRESS, HOLD, RELEASE, FREE ])
+
+
     def test_press_times(self):
         replay = ReplayIO.open_replay('unit_tests/replays/osu/osu! - perfect_test [score_test] (2019-06-07) Osu.osr')
         replay_data = StdReplayData.get_replay_data(replay.play_data)
@@ -174,3 +232,45 @@ class TestStdReplayData(unittest.TestCase):
         # hold -> one hold, one press (blocking)
         key_state = StdReplayData._StdReplayData__get_key_state(HOLD, [ PRESS, HOLD, FREE, FREE ], press_block=True, release_block=False)
         self.assertEqual(key_state, HOLD)
+
+
+    def test_get_resampled_data(self):
+        replay_data_list = [
+            # k1 held from 10 ms to 20 ms
+            StdReplayData.get_replay_data_from_arrays([ 0, 10, 20, 30 ], [ 0, 10, 20, 30 ], [ 0, 0, 0, 0 ], [ 0, 4, 0, 0 ]),
+            StdReplayData.get_replay_data_from_arrays([ 5, 25 ], [ 100, 200 ], [ 50, 50 ], [ 1, 1 ]),
+        ]
+
+        times, resampled_data = StdReplayData.get_resampled_data(replay_data_list, dt=5)
+        np.testing.assert_equal(times, [ 0, 5, 10, 15, 20, 25, 30 ])
+        self.assertEqual(resampled_data.shape, (2, 7, 3))
+        self.assertEqual(resampled_data.dtype, np.float32)
+
+        np.testing.assert_equal(resampled_data[0, :, StdReplayData.IDX_X], [ 0, 5, 10, 15, 20, 25, 30 ])
+        np.testing.assert_equal(resampled_data[0, :, StdReplayData.IDX_Y], [ 0, 0, 0, 0, 0, 0, 0 ])
+        np.testing.assert_equal(resampled_data[0, :, StdReplayData.IDX_K], [ 0, 0, 1, 1, 0, 0, 0 ])
+
+        # Timesteps outside of the replay's frames are nan
+        np.testing.assert_equal(resampled_data[1, :, StdReplayData.IDX_X], [ np.nan, 100, 125, 150, 175, 200, np.nan ])
+        np.testing.assert_equal(resampled_data[1, :, StdReplayData.IDX_K], [ np.nan, 1, 1, 1, 1, 1, np.nan ])
+
+        times, resampled_data = StdReplayData.get_resampled_data(replay_data_list, dt=4, start_time=10, end_time=20)
+        np.testing.assert_equal(times, [ 10, 14, 18 ])
+        np.testing.assert_almost_equal(resampled_data[1, :, StdReplayData.IDX_X], [ 125, 145, 165 ])
+
+
+    def test_get_resampled_data_empty(self):
+        replay_data_list = [
+            StdReplayData.get_replay_data_from_arrays([ 0, 10 ], [ 0, 10 ], [ 0, 0 ], [ 0, 0 ]),
+            StdReplayData.get_replay_data_from_arrays([], [], [], []),
+            StdReplayData.get_replay_data_from_arrays([ 10, 20 ], [ 100, 200 ], [ 50, 50 ], [ 1, 1 ]),
+        ]
+
+        # Replays stay at the index they were given at; the empty one doesn't affect the times
+        times, resampled_data = StdReplayData.get_resampled_data(replay_data_list, dt=10)
+        np.testing.assert_equal(times, [ 0, 10, 20 ])
+        self.assertEqual(resampled_data.shape, (3, 3, 3))
+
+        np.testing.assert_equal(resampled_data[0, :, StdReplayData.IDX_X], [ 0, 10, np.nan ])
+        self.assertTrue(np.all(np.isnan(resampled_data[1])))
+        np.testing.assert_equal(resampled_data[2, :, StdReplayData.IDX_X], [ np.nan, 100, 200 ])
\ No newline at end of file
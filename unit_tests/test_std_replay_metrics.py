@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from osu.local.replay.replayIO import ReplayIO
+from analysis.osu.std.replay_data import StdReplayData
+from analysis.osu.std.replay_metrics import StdReplayMetrics
+
+
+
+class TestStdReplayMetrics(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pass
+
+
+    @classmethod
+    def tearDown(cls):
+        pass
+
+
+    def test_avg_cursor_pos(self):
+        replay_data_list = [
+            StdReplayData.get_replay_data_from_arrays([ 0, 10, 20, 30, 40 ], [ 0, 10, 20, 30, 40 ], [ 0, 0, 0, 0, 0 ], [ 0, 0, 0, 0, 0 ]),
+            StdReplayData.get_replay_data_from_arrays([ 5, 15, 25, 100 ], [ 100, 100, 100, 100 ], [ 50, 60, 70, 80 ], [ 0, 0, 0, 0 ]),
+        ]
+
+        data = StdReplayMetrics.avg_cursor_pos(replay_data_list, bucket_width=16, window=16)
+        np.testing.assert_equal(data[:, 0], np.arange(16, 100, 16))
+
+        # 0 <= t <= 16: (0, 0), (5, 100, 50), (10, 10, 0), (15, 100, 60)
+        np.testing.assert_almost_equal(data[0, 1:], [ 52.5, 27.5, np.var([ 0, 100, 10, 100 ]), np.var([ 0, 50, 0, 60 ]) ])
+
+        # 32 <= t <= 48: (40, 40, 0)
+        np.testing.assert_almost_equal(data[2, 1:], [ 40, 0, 0, 0 ])
+
+        # No frames within 48 <= t <= 64
+        self.assertTrue(all(np.isnan(data[3, 1:])))
+
+
+    def test_avg_cursor_pos_window(self):
+        replay = ReplayIO.open_replay('unit_tests/replays/osu/LeaF - I (Maddy) [Terror] replay_0.osr')
+        replay_data = StdReplayData.get_replay_data(replay.play_data)
+
+        frames = replay_data.values[:, :3].astype(np.float64)
+        data = StdReplayMetrics.avg_cursor_pos([ replay_data, frames ], bucket_width=50, window=100)
+
+        for t, avg_x, avg_y, var_x, var_y in data[::200]:
+            select = (t - 100 <= frames[:, 0]) & (frames[:, 0] <= t)
+            if not any(select):
+                self.assertTrue(np.isnan(avg_x))
+                continue
+
+            self.assertAlmostEqual(avg_x, np.mean(frames[select, 1]))
+            self.assertAlmostEqual(avg_y, np.mean(frames[select, 2]))
+            self.assertAlmostEqual(var_x, np.var(frames[select, 1]), places=4)
+            self.assertAlmostEqual(var_y, np.var(frames[select, 2]), places=4)
+
+
+    def test_avg_cursor_pos_empty(self):
+        data = StdReplayMetrics.avg_cursor_pos([])
+        self.assertEqual(data.shape, (0, 5))
+
+
+    def test_resampled_cursor_derivatives(self):
+        # Cursor x moves as t^3, cursor y stays still
+        replay_t = np.arange(0, 101)
+        replay_data_list = [
+            StdReplayData.get_replay_data_from_arrays(replay_t, (replay_t/10)**3, np.zeros(len(replay_t)), np.zeros(len(replay_t))),
+            StdReplayData.get_replay_data_from_arrays(replay_t, 2*(replay_t/10)**3, np.zeros(len(replay_t)), np.zeros(len(replay_t))),
+        ]
+
+        times, resampled_data = StdReplayData.get_resampled_data(replay_data_list, dt=10)
+
+        vel_times, vel = StdReplayMetrics.resampled_cursor_vel(times, resampled_data)
+        np.testing.assert_equal(vel_times, times[1:])
+        self.assertEqual(vel.shape, (2, len(times) - 1, 2))
+        np.testing.assert_almost_equal(vel[0, :, 0], np.diff(np.arange(11)**3)/10, decimal=5)
+        np.testing.assert_almost_equal(vel[1], 2*vel[0], decimal=5)
+        np.testing.assert_equal(vel[:, :, 1], 0)
+
+        accel_times, accel = StdReplayMetrics.resampled_cursor_accel(times, resampled_data)
+        np.testing.assert_equal(accel_times, times[2:])
+        np.testing.assert_almost_equal(accel[0, :, 0], np.diff(np.arange(11)**3, n=2)/100, decimal=5)
+
+        # Third difference of t^3 is constant
+        jerk_times, jerk = StdReplayMetrics.resampled_cursor_jerk(times, resampled_data)
+        np.testing.assert_equal(jerk_times, times[3:])
+        np.testing.assert_almost_equal(jerk[0, :, 0], np.full(len(times) - 3, 6/1000), decimal=5)
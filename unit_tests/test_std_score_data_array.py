@@ -0,0 +1,122 @@
+import unittest
+import glob
+import numpy as np
+
+from osu.local.beatmap.beatmapIO import BeatmapIO
+from osu.local.replay.replayIO import ReplayIO
+
+from analysis.osu.std.map_data import StdMapData
+from analysis.osu.std.replay_data import StdReplayData
+from analysis.osu.std.score_data import StdScoreData
+
+
+
+class TestStdScoreDataArray(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.beatmap  = BeatmapIO.open_beatmap('unit_tests/maps/osu/test/score_test.osu')
+        cls.map_data = StdMapData.get_map_data(cls.beatmap.hitobjects)
+
+        replay_filepaths = sorted(glob.glob('unit_tests/replays/osu/score_test/*.osr'))
+        cls.replay_data  = [ StdReplayData.get_replay_data(ReplayIO.open_replay(filepath).play_data) for filepath in replay_filepaths ]
+
+        cls.settings = {
+            setting : getattr(StdScoreData, setting) for setting in [
+                'engine', 'blank_miss', 'hold_range_window', 'hold_range_miss', 'recoverable_release',
+                'release_range', 'release_miss', 'release_window', 'recoverable_missaim'
+            ]
+        }
+
+
+    def tearDown(self):
+        for setting, value in self.settings.items():
+            setattr(StdScoreData, setting, value)
+
+
+    def compare_engines(self):
+        num_compared = 0
+
+        for replay_data in self.replay_data:
+            StdScoreData.engine = StdScoreData.ENGINE_FRAME
+            frame_score_data = StdScoreData.get_score_data(replay_data, self.map_data, self.beatmap.difficulty.ar).values.astype(np.float64)
+
+            # The frame processor can come back to aimpoints of a slider that was already missed
+            # if they are still visible. The array processor judges each hitobject only once.
+            missed = set()
+            revisited = False
+            for score in frame_score_data:
+                revisited |= score[StdScoreData.IDX_MAP_IDX] in missed
+                if score[StdScoreData.IDX_TYPE] == StdScoreData.TYPE_MISS:
+                    missed.add(score[StdScoreData.IDX_MAP_IDX])
+            if revisited:
+                continue
+
+            StdScoreData.engine = StdScoreData.ENGINE_ARRAY
+            array_score_data = StdScoreData.get_score_data(replay_data, self.map_data, self.beatmap.difficulty.ar).values
+
+            self.assertEqual(frame_score_data.shape, array_score_data.shape)
+            self.assertTrue(np.allclose(frame_score_data, array_score_data, equal_nan=True))
+            num_compared += 1
+
+        self.assertGreater(num_compared, 0)
+
+
+    def test_map_arrays(self):
+        aimpoints, bounds = StdScoreData.get_map_arrays(self.map_data)
+
+        self.assertEqual(len(aimpoints), len(self.map_data))
+        self.assertEqual(len(bounds), len(self.map_data.index.unique(level=0)))
+
+        for hitobject_idx, (start, end) in enumerate(bounds):
+            self.assertTrue(all(aimpoints[start:end, 5] == self.map_data.index.unique(level=0)[hitobject_idx]))
+            self.assertEqual(aimpoints[start, 3], StdMapData.TYPE_PRESS)
+
+
+    def test_default_settings(self):
+        self.compare_engines()
+
+
+    def test_blank_miss(self):
+        StdScoreData.blank_miss = True
+        self.compare_engines()
+
+
+    def test_hold_range(self):
+        StdScoreData.hold_range_window = True
+        self.compare_engines()
+
+        StdScoreData.hold_range_miss = True
+        self.compare_engines()
+
+
+    def test_unrecoverable(self):
+        StdScoreData.recoverable_release = False
+        StdScoreData.recoverable_missaim = False
+        self.compare_engines()
+
+
+    def test_release_settings(self):
+        StdScoreData.release_range = True
+        StdScoreData.release_miss  = False
+        self.compare_engines()
+
+        StdScoreData.release_window = False
+        self.compare_engines()
+
+
+    def test_batch(self):
+        score_data = StdScoreData.get_score_data_batch(self.replay_data, self.map_data, self.beatmap.difficulty.ar)
+        self.assertEqual(list(score_data.columns), StdScoreData.COLUMNS)
+        self.assertEqual(list(score_data.index.names), [ 'replay_id', 'map_idx' ])
+
+        for replay_id, replay_data in enumerate(self.replay_data):
+            single_score_data = StdScoreData.get_score_data_array(replay_data, self.map_data, self.beatmap.difficulty.ar).values
+            self.assertTrue(np.array_equal(score_data.loc[replay_id].values, single_score_data, equal_nan=True))
+
+        replay_ids = [ f'replay_{i}' for i in range(len(self.replay_data)) ]
+        score_data = StdScoreData.get_score_data_batch(self.replay_data, self.map_data, self.beatmap.difficulty.ar, replay_ids=replay_ids)
+        self.assertEqual(list(score_data.index.unique(level=0)), replay_ids)
+
+        with self.assertRaises(ValueError):
+            StdScoreData.get_score_data_batch(self.replay_data, self.map_data, replay_ids=replay_ids[1:])
@@ -1,4 +1,8 @@
+import os
 import unittest
+import tempfile
+import numpy as np
+import pandas as pd
 
 from osu.local.beatmap.beatmapIO import BeatmapIO
 from osu.local.replay.replayIO import ReplayIO
@@ -23,8 +27,48 @@ class TestStdScoreMetrics(unittest.TestCase):
 
 
     def test_get_per_hitobject_score_data(self):
-        # TODO
-        pass
+        # Player a presses hitobject 0 twice and misses hitobject 1; player b never gets to hitobject 2
+        score_data_a = pd.DataFrame([
+            [ 1010, 1000, 0, 0, 0, 0, StdScoreData.TYPE_HITP,  1, 0 ],
+            [ 1050, 1000, 0, 0, 0, 0, StdScoreData.TYPE_MISS,  1, 0 ],
+            [ 1200, np.nan, 0, 0, np.nan, np.nan, StdScoreData.TYPE_EMPTY, 1, np.nan ],
+            [ 1700, 1500, 0, 0, 0, 0, StdScoreData.TYPE_MISS,  0, 1 ],
+            [ 2030, 2000, 0, 0, 0, 0, StdScoreData.TYPE_HITP,  1, 2 ],
+        ], columns=StdScoreData.COLUMNS)
+
+        score_data_b = pd.DataFrame([
+            [  980, 1000, 0, 0, 0, 0, StdScoreData.TYPE_HITP,  1, 0 ],
+            [ 1520, 1500, 0, 0, 0, 0, StdScoreData.TYPE_HITP,  1, 1 ],
+        ], columns=StdScoreData.COLUMNS)
+
+        per_hitobject_score_data = StdScoreMetrics.get_per_hitobject_score_data([ score_data_a, score_data_b ])
+        self.assertEqual(per_hitobject_score_data.shape, (3, 2, len(StdScoreData.COLUMNS)))
+        self.assertEqual(per_hitobject_score_data.dtype, np.float32)
+
+        np.testing.assert_array_equal(per_hitobject_score_data[0, 0], score_data_a.values[0])
+        np.testing.assert_array_equal(per_hitobject_score_data[1, 0], score_data_a.values[3])
+        self.assertTrue(np.all(np.isnan(per_hitobject_score_data[2, 1])))
+
+        np.testing.assert_array_equal(StdScoreMetrics.get_hitobject_hit_offsets(per_hitobject_score_data), [ [ 10, -20 ], [ np.nan, 20 ], [ 30, np.nan ] ])
+
+        # Players that didn't hit count as not being within the offset
+        times, percents = StdScoreMetrics.percent_players_taps_all(per_hitobject_score_data, 25)
+        np.testing.assert_array_equal(times, [ 1000, 1500, 2000 ])
+        np.testing.assert_array_equal(percents, [ 1.0, 0.5, 0.0 ])
+
+        # Same from batch score data, and when memory-mapped
+        score_data_batch = pd.concat([ score_data_a, score_data_b ], keys=[ 3, 8 ], names=[ 'replay_id', None ])
+        np.testing.assert_array_equal(StdScoreMetrics.get_per_hitobject_score_data(score_data_batch), per_hitobject_score_data)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, 'score_data.npy')
+            memmap = StdScoreMetrics.get_per_hitobject_score_data([ score_data_a, score_data_b ], num_hitobjects=4, filepath=filepath)
+
+            np.testing.assert_array_equal(memmap[:3], per_hitobject_score_data)
+            self.assertTrue(np.all(np.isnan(memmap[3])))
+            del memmap
+
+            np.testing.assert_array_equal(np.load(filepath)[:3], per_hitobject_score_data)
 
 
     def test_get_percent_below_offset_one(self):
@@ -43,5 +87,112 @@ class TestStdScoreMetrics(unittest.TestCase):
 
 
     def test_solve_for_hit_offset_all(self):
-        # TODO
-        pass
\ No newline at end of file
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu')
+        replay  = ReplayIO.open_replay('unit_tests/replays/osu/abraker - Mutsuhiko Izumi - Red Goose [ERT Basic] (2019-08-24) Osu.osr')
+
+        map_data    = StdMapData.get_map_data(beatmap.hitobjects)
+        replay_data = StdReplayData.get_replay_data(replay.play_data)
+        score_data  = StdScoreData.get_score_data_batch([ replay_data, replay_data ], map_data, beatmap.difficulty.ar, beatmap.difficulty.cs)
+
+        # Offsets read from score data as scored match the ones solved from the hit offset matrix
+        per_hitobject_score_data = StdScoreMetrics.get_per_hitobject_score_data(score_data)
+        times, hit_offsets = StdScoreMetrics.get_hit_offsets(score_data, num_hitobjects=len(per_hitobject_score_data))
+
+        solved_times, offsets = StdScoreMetrics.solve_for_hit_offset_all(per_hitobject_score_data, [ 0.5, 0.95 ])
+        np.testing.assert_array_equal(solved_times, times)
+        np.testing.assert_array_almost_equal(offsets, StdScoreMetrics.solve_for_hit_offsets(hit_offsets, [ 0.5, 0.95 ]), decimal=3)
+        self.assertTrue(np.all(offsets[np.isfinite(offsets)] < 200))
+
+        percent_times, percents = StdScoreMetrics.percent_players_taps_all(per_hitobject_score_data, 50)
+        np.testing.assert_array_equal(percent_times, times)
+        np.testing.assert_array_equal(percents, np.count_nonzero(abs(hit_offsets) < 50, axis=1)/2)
+
+
+    def test_get_hit_offsets(self):
+        score_data = pd.DataFrame([
+            [ 1010, 1000, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_HITP, 1, 0 ],
+            [ 1600, 1500, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_MISS, 1, 1 ],
+            [  990, 1000, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_HITP, 1, 0 ],
+            [ 1480, 1500, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_HITP, 1, 1 ],
+            [ 1700, 1500, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_AIMH, 2, 1 ],
+        ], columns=StdScoreData.COLUMNS, index=pd.MultiIndex.from_arrays([ [ 5, 5, 7, 7, 7 ], [ 0, 1, 0, 1, 1 ] ], names=[ 'replay_id', 'map_idx' ]))
+
+        times, hit_offsets = StdScoreMetrics.get_hit_offsets(score_data, num_hitobjects=3)
+        np.testing.assert_array_equal(times, [ 1000, 1500, np.nan ])
+        np.testing.assert_array_equal(hit_offsets, [ [ 10, -10 ], [ np.nan, -20 ], [ np.nan, np.nan ] ])
+
+        # Slider's hold and release rows come after its press
+        score_data = pd.DataFrame([
+            [ 1010, 1000, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_HITP, 1, 0 ],
+            [ 1030, 1000, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_HITP, 1, 0 ],
+            [ 1700, 1700, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_AIMH, 2, 0 ],
+            [ 2100, 2100, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_HITR, 3, 0 ],
+            [ 2500, 2500, np.nan, np.nan, np.nan, np.nan, StdScoreData.TYPE_MISS, 0, 1 ],
+        ], columns=StdScoreData.COLUMNS, index=pd.MultiIndex.from_arrays([ [ 5, 7, 7, 7, 7 ], [ 0, 0, 0, 0, 1 ] ], names=[ 'replay_id', 'map_idx' ]))
+
+        times, hit_offsets = StdScoreMetrics.get_hit_offsets(score_data)
+        np.testing.assert_array_equal(times, [ 1000, 2500 ])
+        np.testing.assert_array_equal(hit_offsets, [ [ 10, 30 ], [ np.nan, np.nan ] ])
+
+        # Only presses that didn't land on any hitobject
+        score_data = pd.DataFrame([
+            [ 1200, np.nan, 0, 0, np.nan, np.nan, StdScoreData.TYPE_EMPTY, 1, np.nan ],
+            [ 1300, np.nan, 0, 0, np.nan, np.nan, StdScoreData.TYPE_EMPTY, 1, np.nan ],
+        ], columns=StdScoreData.COLUMNS, index=pd.MultiIndex.from_arrays([ [ 5, 5 ], [ np.nan, np.nan ] ], names=[ 'replay_id', 'map_idx' ]))
+
+        times, hit_offsets = StdScoreMetrics.get_hit_offsets(score_data)
+        self.assertEqual(times.shape, (0, ))
+        self.assertEqual(hit_offsets.shape, (0, 1))
+
+        # Hitobject times are their start times on a real map
+        beatmap = BeatmapIO.open_beatmap('unit_tests/maps/osu/playable/Mutsuhiko Izumi - Red Goose (nold_1702) [ERT Basic].osu')
+        replay  = ReplayIO.open_replay('unit_tests/replays/osu/abraker - Mutsuhiko Izumi - Red Goose [ERT Basic] (2019-08-24) Osu.osr')
+
+        map_data   = StdMapData.get_map_data(beatmap.hitobjects)
+        score_data = StdScoreData.get_score_data_batch([ StdReplayData.get_replay_data(replay.play_data) ], map_data, beatmap.difficulty.ar, beatmap.difficulty.cs)
+
+        is_press = map_data.values[:, StdMapData.IDX_TYPE] == StdMapData.TYPE_PRESS
+        start_times = np.full(StdMapData.get_num_hitobjects(map_data), np.nan)
+        start_times[StdMapData.hitobject_idxs(map_data)[is_press].astype(np.int64)] = StdMapData.start_times(map_data)
+
+        times, hit_offsets = StdScoreMetrics.get_hit_offsets(score_data, num_hitobjects=len(start_times))
+        np.testing.assert_array_equal(times, start_times)
+
+
+    def test_solve_for_hit_offsets(self):
+        hit_offsets = np.asarray([
+            [ -4,  3,  1, -2 ],
+            [ 10, 30, np.nan, -20 ],
+        ])
+
+        offsets = StdScoreMetrics.solve_for_hit_offsets(hit_offsets, [ 0, 0.25, 0.5, 0.75, 1.0 ])
+        np.testing.assert_array_equal(offsets, [ [ 0, 1, 2, 3, 4 ], [ 0, 10, 20, 30, np.inf ] ])
+
+        # Score data rows with the offsets; the player that didn't hit misses instead. Positions are
+        # made far off from the offsets, so reading offsets from any other column would show
+        rows, replay_ids = [], []
+        for hitobject_idx, map_t in enumerate([ 1000, 2000 ]):
+            for player, offset in enumerate(hit_offsets[hitobject_idx]):
+                hit_type = StdScoreData.TYPE_MISS if np.isnan(offset) else StdScoreData.TYPE_HITP
+                replay_t = map_t + (200 if np.isnan(offset) else offset)
+
+                rows.append([ replay_t, map_t, 500, 500, 100, 100, hit_type, StdReplayData.PRESS, hitobject_idx ])
+                replay_ids.append(player)
+
+        score_data = pd.DataFrame(rows, columns=StdScoreData.COLUMNS, index=pd.MultiIndex.from_arrays([ replay_ids, [ row[-1] for row in rows ] ], names=[ 'replay_id', 'map_idx' ]))
+        per_hitobject_score_data = StdScoreMetrics.get_per_hitobject_score_data(score_data)
+
+        times, solved = StdScoreMetrics.solve_for_hit_offset_all(per_hitobject_score_data, [ 0.25, 0.5, 0.75 ])
+        np.testing.assert_array_equal(times, [ 1000, 2000 ])
+        np.testing.assert_array_equal(solved, offsets[:, 1:4])
+
+        times, percents = StdScoreMetrics.percent_players_taps_all(per_hitobject_score_data, 15)
+        np.testing.assert_array_equal(percents, [ 1.0, 0.25 ])
+
+        # Same as looking for where the percent of players within the offset reaches the target
+
+        for hitobject_idx in range(len(hit_offsets)):
+            for target_percent in [ 0.25, 0.5, 0.75 ]:
+                offset = StdScoreMetrics.solve_for_hit_offset_one(per_hitobject_score_data, hitobject_idx, target_percent)
+                self.assertGreaterEqual(StdScoreMetrics.get_percent_below_offset_one(per_hitobject_score_data, hitobject_idx, offset + 0.5), target_percent)
+                self.assertLess(StdScoreMetrics.get_percent_below_offset_one(per_hitobject_score_data, hitobject_idx, offset), target_percent)